@@ -22,7 +22,7 @@ class Boom(QWidget):
     """
     def __init__(self):
         """ Initalize the class. """
-        super(Boom).__init__()
+        super().__init__()
         self._init_win()
 
     def _init_win(self):
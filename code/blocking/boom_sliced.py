@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: boom_sliced.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: An "OH NOES!!!" Program that has real work to do. boom_fixed.py
+          gets away with a QTimer because sleep() was never real work.
+          Here "Boom~" runs a big job that has to touch widgets (filling
+          a list with hundreds of thousands of rows), so it can't move
+          to a worker thread either. It runs as a generator on the
+          CooperativeScheduler in 4 ms slices, so "Add one" stays instant
+          the whole time.
+
+ Usage:   boom_sliced.py
+          boom_sliced.py --bench
+"""
+import sys
+import time
+import signal
+import hashlib
+import argparse
+from statistics import median
+from PyQt5.QtCore import (Qt, QTimer)
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout,
+                             QHBoxLayout, QLabel, QPushButton,
+                             QListWidget, QProgressBar)
+from cooperative import CooperativeScheduler
+
+class Boom(QWidget):
+    """
+    This class provides a simple UI to show how to do big jobs on the
+    UI thread without blocking it.
+    """
+    # Rows the "Boom~" job adds to the list.
+    ROWS = 300000
+
+    def __init__(self, rows=ROWS):
+        """ Initalize the class. """
+        super().__init__()
+        self.rows = rows
+        self.scheduler = CooperativeScheduler(parent=self)
+        self.scheduler.task_finished.connect(self._cb_job_finished)
+        self.task = None
+        self._init_win()
+
+    def _init_win(self):
+        """ Initialize the window. """
+        # Set the size and title bar.
+        self.setWindowTitle('Boom')
+        self.setGeometry(300, 300, 300, 600)
+
+        # Add the VBox as the main layout
+        self.vbox = QVBoxLayout()
+        self.setLayout(self.vbox)
+
+        # Add a label for the counter.
+        self.lbl_counter = QLabel("0")
+        self.lbl_counter.setStyleSheet("QLabel{font-size: 100pt;}")
+        self.lbl_counter.setAlignment(Qt.AlignCenter)
+        self.vbox.addWidget(self.lbl_counter)
+
+        # The job's output, progress and stats.
+        self.lst_rows = QListWidget()
+        self.lst_rows.setUniformItemSizes(True)
+        self.lst_rows.setLayoutMode(QListWidget.Batched)
+        self.vbox.addWidget(self.lst_rows, 1)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, self.rows)
+        self.vbox.addWidget(self.progress)
+        self.lbl_stats = QLabel("")
+        self.lbl_stats.setWordWrap(True)
+        self.vbox.addWidget(self.lbl_stats)
+
+        # Add a button to go boom, and one to stop it.
+        hbox = QHBoxLayout()
+        self.btn_boom = QPushButton("Boom~")
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setEnabled(False)
+        hbox.addWidget(self.btn_boom)
+        hbox.addWidget(self.btn_cancel)
+        self.vbox.addLayout(hbox)
+
+        # Add increment button
+        self.btn_inc = QPushButton("Add one")
+        self.vbox.addWidget(self.btn_inc)
+
+        # Connect the button clicks to the callback functions.
+        self.btn_boom.clicked.connect(self._cb_clicked_boom)
+        self.btn_cancel.clicked.connect(self._cb_clicked_cancel)
+        self.btn_inc.clicked.connect(self._cb_clicked_inc)
+
+        # Finally show the window.
+        self.show()
+
+    def job(self):
+        """
+        The big job: hash a row, add it to the list, repeat. Each yield
+        is a point where the scheduler may hand control back to the
+        event loop. Returns the number of rows added.
+        """
+        self.lst_rows.clear()
+        digest = b"boom"
+        for row in range(self.rows):
+            digest = hashlib.sha256(digest).digest()
+            self.lst_rows.addItem(f"Row {row:06d}: {digest[:8].hex()}")
+            if row % 1000 == 0:
+                self.progress.setValue(row)
+            yield
+        self.progress.setValue(self.rows)
+        return self.rows
+
+    def _cb_clicked_boom(self):
+        """ Start the job on the scheduler instead of running it here. """
+        if self.task is not None and self.task.is_active():
+            return
+        self.btn_boom.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.lbl_stats.setText("Working...")
+        self.task = self.scheduler.submit(self.job, name="boom")
+
+    def _cb_clicked_cancel(self):
+        """ Stop the job where it is. """
+        if self.task is not None:
+            self.task.cancel()
+
+    def _cb_job_finished(self, task):
+        """ The job is done (or cancelled). Report its stats. """
+        stats = task.stats()
+        if task.state == "done":
+            self.lbl_counter.setText(str(int(self.lbl_counter.text()) + 10))
+        elif task.state == "failed":
+            stats["state"] = f"failed: {task.error}"
+        self.lbl_stats.setText(
+            "{state}: {steps:,} rows in {slices:,} slices ({overruns} over budget), "
+            "{busy_ms:.0f} ms of work over {wall_ms:.0f} ms".format(**stats))
+        self.btn_boom.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+
+    def _cb_clicked_inc(self):
+        """ Add one to the label """
+        self.lbl_counter.setText(str(int(self.lbl_counter.text()) + 1))
+
+def bench(app, rows):
+    """
+    Run the job blocking (all at once, like boom.py) and sliced, while
+    a probe timer asks for the event loop every 10 ms. How late the
+    probe runs is how long a click on "Add one" would have waited.
+    """
+    print(f" [*] {rows:,} rows, probing the event loop every 10 ms")
+    print(f"     {'mode':10s} {'job ms':>8s} {'max wait ms':>12s} {'p95 wait ms':>12s} "
+          f"{'median ms':>10s} {'slices':>7s} {'overruns':>9s}")
+    for mode in ("blocking", "sliced"):
+        gui = Boom(rows)
+        app.processEvents()
+        waits = []
+        last = [time.perf_counter()]
+
+        def probe():
+            now = time.perf_counter()
+            waits.append((now - last[0]) * 1000 - 10)
+            last[0] = now
+
+        timer = QTimer()
+        timer.timeout.connect(probe)
+        timer.start(10)
+        start = time.perf_counter()
+        if mode == "blocking":
+            def run_blocking():
+                for _ in gui.job():
+                    pass
+                app.quit()
+            QTimer.singleShot(0, run_blocking)
+        else:
+            gui.scheduler.task_finished.connect(lambda _task: app.quit())
+            QTimer.singleShot(0, gui.btn_boom.click)
+        app.exec_()
+        elapsed = (time.perf_counter() - start) * 1000
+        timer.stop()
+        # The last probe is the one that waited for a blocking job.
+        probe()
+
+        waits.sort()
+        stats = gui.scheduler.stats()
+        print(f"     {mode:10s} {elapsed:8.0f} {waits[-1]:12.1f} "
+              f"{waits[int(len(waits) * 0.95)]:12.1f} {median(waits):10.1f} "
+              f"{stats['slices']:7d} {stats['overruns']:9d}")
+        gui.close()
+        gui.deleteLater()
+        app.processEvents()
+    return 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Boom, with the work done in slices.")
+    parser.add_argument("--rows", type=int, default=Boom.ROWS,
+                        help="rows the job adds (default: %(default)s)")
+    parser.add_argument("--bench", action="store_true",
+                        help="compare the job blocking vs sliced")
+    args = parser.parse_args()
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Standard QT boilerplate to launch our UI
+    app = QApplication(sys.argv)
+
+    if args.bench:
+        return bench(app, args.rows)
+
+    # pylint: disable=unused-variable
+    # Reason: Disable the unused-variable violations. The
+    #         'gui' variable is required to start the UI instance.
+    gui = Boom(args.rows)
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
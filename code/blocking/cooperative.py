@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: cooperative.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A time-sliced cooperative scheduler for work that has to run on
+          the GUI thread (it touches widgets, so it can't go to a worker
+          thread). A task is a generator that yields between small steps
+          of work. A zero-interval QTimer runs steps until the slice's
+          time budget (4 ms by default) is used up, then hands control
+          back to the event loop so input and painting are handled
+          before the next slice.
+
+          Tasks have priorities (higher runs first, equal priorities take
+          turns), can be cancelled at any step, and keep stats on their
+          slices, steps and budget overruns.
+"""
+import heapq
+import itertools
+import time
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import (QObject, QTimer, pyqtSignal)
+
+class Task:
+    """
+    A handle for a submitted generator. The scheduler updates the stats
+    as the task runs; 'state' is one of pending, running, done,
+    cancelled or failed.
+    """
+    def __init__(self, scheduler, gen, priority, name):
+        """ Initalize the class. """
+        self.scheduler = scheduler
+        self.gen = gen
+        self.priority = priority
+        self.name = name
+        self.state = "pending"
+        self.result = None
+        self.error = None
+        self.slices = 0
+        self.steps = 0
+        self.overruns = 0
+        self.busy_ns = 0
+        self.max_step_ns = 0
+        self.submitted = time.perf_counter_ns()
+        self.finished = None
+        self.cancel_requested = False
+
+    def cancel(self):
+        """ Cancel the task. It won't run another step. """
+        self.scheduler.cancel(self)
+
+    def is_active(self):
+        """ True until the task is done, cancelled or failed. """
+        return self.state in ("pending", "running")
+
+    def stats(self):
+        """ Return the task's stats as a dict. """
+        end = self.finished or time.perf_counter_ns()
+        return {"name": self.name,
+                "priority": self.priority,
+                "state": self.state,
+                "slices": self.slices,
+                "steps": self.steps,
+                "overruns": self.overruns,
+                "busy_ms": self.busy_ns / 1e6,
+                "wall_ms": (end - self.submitted) / 1e6,
+                "max_step_ms": self.max_step_ns / 1e6}
+
+class CooperativeScheduler(QObject):
+    """
+    Runs generator tasks in time-boxed slices on the GUI thread. Each
+    slice runs the highest priority task until the budget is spent or
+    the task finishes (then the next task gets the rest of the slice).
+    A task that spent its slice goes to the back of its priority level.
+    """
+    # Emitted with the Task when it's done, cancelled or has failed.
+    task_finished = pyqtSignal(object)
+
+    # Default time budget per slice, in milliseconds.
+    BUDGET_MS = 4.0
+
+    # A slice always runs a little past its budget (the step that
+    # crosses the deadline finishes). Only a slice that runs past it by
+    # more than this fraction of the budget counts as an overrun.
+    OVERRUN_SLACK = 0.25
+
+    def __init__(self, budget_ms=BUDGET_MS, parent=None):
+        """ Initalize the class. """
+        super().__init__(parent)
+        self.budget_ns = int(budget_ms * 1e6)
+        self.overrun_ns = int(self.budget_ns * (1 + self.OVERRUN_SLACK))
+        # Heap of (-priority, sequence, task). The sequence keeps equal
+        # priorities in FIFO order.
+        self._queue = []
+        self._seq = itertools.count()
+        self.slices = 0
+        self.overruns = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._run_slice)
+
+    def submit(self, gen, priority=0, name=None):
+        """
+        Queue a generator (or a function returning one) to run. Returns
+        the Task handle.
+        """
+        if callable(gen):
+            gen = gen()
+        task = Task(self, gen, priority, name or getattr(gen, "__name__", "task"))
+        heapq.heappush(self._queue, (-priority, next(self._seq), task))
+        if not self.timer.isActive():
+            self.timer.start()
+        return task
+
+    def cancel(self, task):
+        """ Cancel a task. Its generator is closed (runs any finally:). """
+        if not task.is_active():
+            return
+        if task.state == "running":
+            # Cancelled from inside its own step. The generator can't be
+            # closed while it's executing, so the slice does it after.
+            task.cancel_requested = True
+            return
+        task.gen.close()
+        self._finish(task, "cancelled")
+        # The queue entry is dropped when it reaches the front.
+
+    def pending(self):
+        """ Return the active tasks, highest priority first. """
+        return [task for _, _, task in sorted(self._queue) if task.is_active()]
+
+    def _finish(self, task, state, result=None, error=None):
+        """ Record a task's end and tell anyone listening. """
+        task.state = state
+        task.result = result
+        task.error = error
+        task.finished = time.perf_counter_ns()
+        self.task_finished.emit(task)
+
+    def _run_slice(self):
+        """ Run steps until the slice's budget is spent. """
+        start = time.perf_counter_ns()
+        deadline = start + self.budget_ns
+        self.slices += 1
+        now = start
+        while self._queue and now < deadline:
+            task = heapq.heappop(self._queue)[2]
+            if not task.is_active():
+                continue
+
+            task.state = "running"
+            task.slices += 1
+            while True:
+                step_start = now
+                try:
+                    next(task.gen)
+                except StopIteration as stop:
+                    self._finish(task, "done", result=stop.value)
+                # pylint: disable=broad-except
+                # Reason: A failing task is reported on its handle, it
+                #         mustn't take the scheduler (or other tasks) down.
+                except Exception as err:
+                    self._finish(task, "failed", error=err)
+                now = time.perf_counter_ns()
+                task.steps += 1
+                task.busy_ns += now - step_start
+                task.max_step_ns = max(task.max_step_ns, now - step_start)
+
+                if task.cancel_requested and task.is_active():
+                    task.gen.close()
+                    self._finish(task, "cancelled")
+                if not task.is_active() or now >= deadline:
+                    break
+                if self._queue and self._queue[0][0] < -task.priority:
+                    # Something more important was submitted, let it in.
+                    break
+
+            if now - start > self.overrun_ns:
+                task.overruns += 1
+                self.overruns += 1
+            if task.is_active():
+                # Back of the line for this priority level.
+                task.state = "pending"
+                heapq.heappush(self._queue, (-task.priority, next(self._seq), task))
+
+        if not self._queue:
+            self.timer.stop()
+
+    def stats(self):
+        """ Return the scheduler's totals as a dict. """
+        return {"budget_ms": self.budget_ns / 1e6,
+                "slices": self.slices,
+                "overruns": self.overruns,
+                "pending": len(self.pending())}
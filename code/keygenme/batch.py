@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: batch.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: Bulk key generation/checking straight from a memory-mapped
+          submissions file. Each line is a challenge, optionally followed
+          by a space and the key that was submitted for it:
+
+              0cbc6611f5540bd0809a388dc95a615b JUKT8-3SD8Z-FZ5TJ-C5AAB-A0441
+
+          Records are found with mmap.find() and decoded directly from
+          the buffer into ints for the key schedule, never going through
+          str. When NumPy is installed and every line is the same width
+          the whole file is processed in blocks of rows viewed in place
+          with numpy.frombuffer().
+
+          Each output line is "challenge key status", where status is
+          OK (submitted key matches), NO (it doesn't), -- (no key was
+          submitted) or ER (not a valid challenge).
+
+ Usage:   batch.py submissions.txt -o results.txt
+          batch.py --bench 2G
+"""
+import os
+import sys
+import mmap
+import time
+import argparse
+from keyschedule import (DEFAULT_MONTH, get_engine, get_raw_engine,
+                         get_vector_engine, months, numpy)
+
+HEX_DIGITS = b"0123456789abcdefABCDEF"
+MASK32 = 0xFFFFFFFF
+
+# Rows handled per NumPy block. Keeps memory flat on huge files.
+BLOCK_ROWS = 1 << 20
+
+# Output lines are buffered and written this many at a time.
+WRITE_BATCH = 65536
+
+def _status(key, submitted):
+    """ Return the status code for a generated vs submitted key. """
+    if not submitted:
+        return b"--"
+    return b"OK" if submitted.upper() == key else b"NO"
+
+def process_lines(buf, start, end, raw_engine, key_len, out):
+    """
+    Process the records in buf[start:end] one line at a time. This
+    handles any layout (ragged lines, CRLF, blank lines). Returns the
+    number of records processed.
+    """
+    find = buf.find
+    bad_key = b"?" * key_len
+    lines = []
+    count = 0
+    pos = start
+    while pos < end:
+        eol = find(b"\n", pos, end)
+        if eol == -1:
+            eol = end
+        line = buf[pos:eol].strip()
+        pos = eol + 1
+        if not line:
+            continue
+
+        chall = line[:32]
+        key = None
+        if len(chall) == 32 and not chall.translate(None, HEX_DIGITS):
+            # One int for the whole challenge, then split it into the
+            # four 32 bit num parts with shifts.
+            val = int(chall, 16)
+            try:
+                key = raw_engine(val >> 96, (val >> 64) & MASK32,
+                                 (val >> 32) & MASK32, val & MASK32,
+                                 chall.upper())
+            except ZeroDivisionError:
+                key = None
+
+        if key is None:
+            lines.append(b"%-32s %s ER\n" % (chall, bad_key))
+        else:
+            lines.append(b"%s %s %s\n" % (chall, key, _status(key, line[32:].strip())))
+        count += 1
+
+        if len(lines) >= WRITE_BATCH:
+            out.write(b"".join(lines))
+            lines = []
+
+    out.write(b"".join(lines))
+    return count
+
+class _VectorTables:
+    """ Lookup tables for the NumPy path, built once. """
+    def __init__(self):
+        """ Build the tables. """
+        # Hex digit value for every byte, 0xFF for non-hex.
+        self.hex = numpy.full(256, 0xFF, numpy.uint8)
+        for char in HEX_DIGITS:
+            self.hex[char] = int(chr(char), 16)
+        # Upper-case every byte (only a-f matter here).
+        self.upper = numpy.arange(256, dtype=numpy.uint8)
+        self.upper[ord("a"):ord("z") + 1] -= 32
+
+def process_block(buf, offset, rows, width, vec_engine, key_len, tables, out):
+    """
+    Process 'rows' fixed-width lines starting at buf[offset] as one
+    NumPy block. Returns False (writing nothing) if the block doesn't
+    have the expected layout.
+    """
+    arr = numpy.frombuffer(buf, numpy.uint8, count=rows * width,
+                           offset=offset).reshape(rows, width)
+    has_key = width > 33
+    if (arr[:, -1] != 10).any() or (has_key and (arr[:, 32] != 32).any()):
+        return False
+
+    digits = tables.hex[arr[:, :32]]
+    invalid = (digits == 0xFF).any(axis=1)
+    # Pair the nibbles into bytes, then read each group of 4 bytes as
+    # a big-endian 32 bit num part.
+    packed = numpy.ascontiguousarray((digits[:, 0::2] << 4) | digits[:, 1::2])
+    nums = packed.view(">u4").astype(numpy.uint64)
+    upper = tables.upper[arr[:, :32]]
+
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        keys, bad = vec_engine(nums[:, 0], nums[:, 1], nums[:, 2], nums[:, 3], upper)
+    if bad is not None:
+        invalid |= bad
+    keys[invalid] = ord("?")
+
+    result = numpy.empty((rows, 32 + 1 + key_len + 3 + 1), numpy.uint8)
+    result[:, :32] = arr[:, :32]
+    result[:, 32] = 32
+    result[:, 33:33 + key_len] = keys
+    result[:, 33 + key_len] = 32
+    status = result[:, 34 + key_len:36 + key_len]
+    if has_key:
+        submitted = tables.upper[arr[:, 33:33 + key_len]]
+        match = (submitted == keys).all(axis=1)
+        status[match] = numpy.frombuffer(b"OK", numpy.uint8)
+        status[~match] = numpy.frombuffer(b"NO", numpy.uint8)
+    else:
+        status[:] = numpy.frombuffer(b"--", numpy.uint8)
+    status[invalid] = numpy.frombuffer(b"ER", numpy.uint8)
+    result[:, -1] = 10
+    out.write(result.tobytes())
+    return True
+
+def process_file(path, out, month=None, use_numpy=True, limit=None):
+    """
+    Generate/check keys for every record in a submissions file and
+    write the results to 'out' (a binary file object). 'limit' stops
+    after roughly that many bytes of input. Returns (records, bytes).
+    """
+    engine = get_engine(month)
+    key_len = len(engine("1" * 32))
+    raw_engine = get_raw_engine(month)
+    vec_engine = get_vector_engine(month) if use_numpy else None
+
+    with open(path, "rb") as fd_in:
+        if os.fstat(fd_in.fileno()).st_size == 0:
+            return 0, 0
+        buf = mmap.mmap(fd_in.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(buf) if limit is None else min(len(buf), limit)
+
+        # Fixed width? The first line tells us the width to expect.
+        width = buf.find(b"\n") + 1
+        vector = (vec_engine is not None and width in (33, 34 + key_len)
+                  and len(buf) % width == 0)
+
+        records = 0
+        if vector:
+            size -= size % width
+            tables = _VectorTables()
+            offset = 0
+            while offset < size:
+                rows = min(BLOCK_ROWS, (size - offset) // width)
+                if process_block(buf, offset, rows, width, vec_engine,
+                                 key_len, tables, out):
+                    records += rows
+                else:
+                    records += process_lines(buf, offset, offset + rows * width,
+                                             raw_engine, key_len, out)
+                offset += rows * width
+        else:
+            if size < len(buf):
+                # Don't stop part way through a line.
+                eol = buf.find(b"\n", size)
+                size = len(buf) if eol == -1 else eol + 1
+            records = process_lines(buf, 0, size, raw_engine, key_len, out)
+        buf.close()
+    return records, size
+
+def make_sample(path, size, month=None):
+    """
+    Write a fixed-width sample submissions file of about 'size' bytes.
+    Every other record has its correct key, the rest a wrong one.
+    """
+    engine = get_engine(month)
+    key_len = len(engine("1" * 32))
+    width = 34 + key_len
+    count = size // width
+    with open(path, "wb") as fd_out:
+        done = 0
+        while done < count:
+            todo = min(BLOCK_ROWS // 4, count - done)
+            raw = os.urandom(16 * todo).hex()
+            lines = []
+            for idx in range(todo):
+                chall = raw[idx * 32:idx * 32 + 32]
+                try:
+                    key = engine(chall) if (done + idx) % 2 else "X" * key_len
+                except ZeroDivisionError:
+                    key = "X" * key_len
+                lines.append(f"{chall} {key}\n")
+            fd_out.write("".join(lines).encode("ascii"))
+            done += todo
+    return count
+
+def _parse_size(text):
+    """ Parse a size like 512M or 2G into bytes. """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if text[-1].upper() in units:
+        return int(float(text[:-1]) * units[text[-1].upper()])
+    return int(text)
+
+def bench(size, path, sample_mb, month=None):
+    """
+    Compare the old str based path (read lines, KeyGen per line), the
+    mmap line parser and the NumPy block parser on a sample file.
+    The slower paths only run over the first 'sample_mb' of the file
+    and are projected to the full size.
+    """
+    # pylint: disable=import-outside-toplevel
+    # Reason: Only the benchmark needs the KeyGen class.
+    from keygen import KeyGen
+
+    if not os.path.exists(path) or os.path.getsize(path) < size * 0.99:
+        print(f" [*] Writing {size / (1 << 30):.2f} GB sample to {path}...")
+        make_sample(path, size, month)
+    size = os.path.getsize(path)
+    sample = min(size, sample_mb << 20)
+
+    results = {}
+    with open(os.devnull, "wb") as out:
+        # Today: Python str per line, KeyGen does validation + split +
+        # int(part, 16) on every challenge.
+        start = time.perf_counter()
+        done = 0
+        with open(path, "r") as fd_in:
+            for line in fd_in:
+                chall = line[:32]
+                try:
+                    key = KeyGen(chall, month).final_key
+                except (ValueError, ZeroDivisionError):
+                    key = "?"
+                out.write(f"{chall} {key}\n".encode("ascii"))
+                done += len(line)
+                if done >= sample:
+                    break
+        results["str + KeyGen"] = (done, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, done = process_file(path, out, month, use_numpy=False, limit=sample)
+        results["mmap lines"] = (done, time.perf_counter() - start)
+
+        if numpy is not None:
+            start = time.perf_counter()
+            _, done = process_file(path, out, month, use_numpy=True)
+            results["mmap + numpy"] = (done, time.perf_counter() - start)
+
+    print(f" [*] File: {path} ({size / (1 << 30):.2f} GB)")
+    for name, (done, elapsed) in results.items():
+        rate = done / elapsed
+        print(f"     {name:14s} {rate / (1 << 20):9.1f} MB/s  "
+              f"full file: {size / rate:9.1f} s"
+              f"{'' if done >= size else '  (projected)'}")
+    return 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Bulk key generation from a submissions file.")
+    parser.add_argument("submissions", nargs="?", help="submissions file to process")
+    parser.add_argument("-o", "--output", help="results file (default: stdout)")
+    parser.add_argument("-m", "--month", choices=months(), default=DEFAULT_MONTH,
+                        help="challenge month (default: %(default)s)")
+    parser.add_argument("--no-numpy", action="store_true",
+                        help="always use the line parser")
+    parser.add_argument("--bench", metavar="SIZE",
+                        help="benchmark on a generated file of SIZE (e.g. 2G)")
+    parser.add_argument("--bench-file", default="submissions_bench.txt",
+                        help="where to write the benchmark file")
+    parser.add_argument("--sample-mb", type=int, default=64,
+                        help="MB the slow paths run over in --bench (default: 64)")
+    args = parser.parse_args()
+
+    if args.bench:
+        return bench(_parse_size(args.bench), args.bench_file, args.sample_mb, args.month)
+    if not args.submissions:
+        parser.error("a submissions file is required")
+
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output, "wb") as out:
+            records, size = process_file(args.submissions, out, args.month,
+                                         not args.no_numpy)
+    else:
+        records, size = process_file(args.submissions, sys.stdout.buffer,
+                                     args.month, not args.no_numpy)
+    elapsed = time.perf_counter() - start
+    print(f" [*] {records:,} records ({size / (1 << 20):.1f} MB) in {elapsed:.2f} s",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
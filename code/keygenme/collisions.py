@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: collisions.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: Key collision and key space analysis for a month's key
+          schedule. Copied challenge characters and the mod 36 lookups
+          mean distinct challenges can share a key; this measures how
+          often that happens on billions of sampled (seeded random) or
+          enumerated (consecutive) challenges.
+
+          The run is split into work chunks of challenges. Each chunk
+          is generated and keyed with the NumPy engine, every key is
+          packed into a few uint64 words, and the (key, challenge index)
+          records are spilled to disk grouped into hash partitions. Then
+          each partition is read back from every chunk, sorted, and
+          scanned for runs of equal keys. Nothing ever holds more than
+          one chunk or one partition in memory. Both phases run over a
+          process pool and record what's done in the work directory, so
+          an interrupted run picks up where it stopped when it's run
+          again with the same arguments. The spill takes 24 bytes per
+          challenge and is kept (rerunning just reprints the report),
+          delete the work directory when done.
+
+          Every chunk also reports the entropy of each key chunk (the
+          dash separated groups) and of every key character, as collision
+          entropy (it can be measured with far fewer keys than there are
+          possible values). A key chunk below the sum of its characters'
+          entropies has characters that depend on each other.
+
+ Usage:   collisions.py -w /tmp/kc --sample 1e9 --seed 1 -j 8
+          collisions.py -w /tmp/kc2 --enumerate 1e8 --start 0cbc6611f5540bd0809a388dc95a615b
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from keyschedule import (DEFAULT_MONTH, INDEX, SCHEDULES, get_engine,
+                         get_vector_engine, months, numpy)
+
+# Challenges per work chunk.
+CHUNK_ROWS = 1 << 22
+
+# Largest partition to sort in memory, in bytes. Sets how many hash
+# partitions the records are spilled into.
+PARTITION_BYTES = 256 << 20
+
+# Colliding keys kept per partition as examples.
+EXAMPLES = 5
+
+MASK32 = 0xFFFFFFFF
+MASK64 = (1 << 64) - 1
+
+def key_layout(month):
+    """
+    Return the key's layout for a month as (radix per key character,
+    key character columns per key chunk, key column of each key
+    character). Copied challenge characters are hex (radix 16), looked
+    up ones are radix 36. Dashes aren't key characters.
+    """
+    radix = []
+    chunks = []
+    columns = []
+    col = 0
+    for chunk in SCHEDULES[month]["chunks"]:
+        if chunks:
+            # The dash between chunks.
+            col += 1
+        terms = list(chunk["terms"])
+        if chunk.get("reverse"):
+            terms.reverse()
+        chunks.append(list(range(len(radix), len(radix) + len(terms))))
+        for term in terms:
+            is_chr = isinstance(term, tuple) and term and term[0] == "chr"
+            radix.append(16 if is_chr else len(INDEX))
+            columns.append(col)
+            col += 1
+    return radix, chunks, columns
+
+def pack_words(radix):
+    """
+    Group key characters into words: as many consecutive characters as
+    fit in a uint64 as a mixed radix number. Returns a list of lists of
+    character numbers.
+    """
+    words = [[]]
+    size = 1
+    for char, base in enumerate(radix):
+        if size * base > 1 << 64:
+            words.append([])
+            size = 1
+        words[-1].append(char)
+        size *= base
+    return words
+
+class Job:
+    """ The parameters of a run, saved in (and checked against) the work directory. """
+    def __init__(self, mode, count, seed=0, start=0, month=None,
+                 chunk_rows=CHUNK_ROWS, partitions=None):
+        """ Initalize the class. """
+        self.mode = mode
+        self.count = count
+        self.seed = seed
+        self.start = start
+        self.month = month or DEFAULT_MONTH
+        self.chunk_rows = chunk_rows
+        self.radix, self.key_chunks, self.columns = key_layout(self.month)
+        self.words = pack_words(self.radix)
+        self.dtype = numpy.dtype([(f"w{idx}", "<u8") for idx in range(len(self.words))]
+                                 + [("idx", "<u8")])
+        if partitions is None:
+            partitions = 1
+            while count * self.dtype.itemsize / partitions > PARTITION_BYTES:
+                partitions *= 2
+        self.partitions = partitions
+
+    @property
+    def chunks(self):
+        """ Number of work chunks. """
+        return (self.count + self.chunk_rows - 1) // self.chunk_rows
+
+    def params(self):
+        """ Return the parameters as a dict for the work directory. """
+        return {"mode": self.mode, "count": self.count, "seed": self.seed,
+                "start": f"{self.start:032x}", "month": self.month,
+                "chunk_rows": self.chunk_rows, "partitions": self.partitions}
+
+    @classmethod
+    def from_params(cls, params):
+        """ Rebuild a Job from params(). """
+        return cls(params["mode"], params["count"], params["seed"],
+                   int(params["start"], 16), params["month"],
+                   params["chunk_rows"], params["partitions"])
+
+    def challenges(self, chunk):
+        """
+        Return the four num parts (uint64 arrays) of a work chunk's
+        challenges and the index of its first challenge.
+        """
+        first = chunk * self.chunk_rows
+        rows = min(self.chunk_rows, self.count - first)
+        if self.mode == "sample":
+            # One counter-based stream per chunk, like dice_sim.py, so
+            # chunks can be made in any order on any worker.
+            seq = numpy.random.SeedSequence(self.seed, spawn_key=(chunk,))
+            gen = numpy.random.Generator(numpy.random.Philox(seq))
+            nums = gen.integers(0, 1 << 32, size=(4, rows), dtype=numpy.uint64)
+            return list(nums), first
+
+        # Enumerate: start + index as a 128 bit number, carrying from
+        # the low 64 bits into the high ones.
+        base = (self.start + first) & ((1 << 128) - 1)
+        base_lo = numpy.uint64(base & MASK64)
+        low = base_lo + numpy.arange(rows, dtype=numpy.uint64)
+        high = numpy.full(rows, base >> 64, dtype=numpy.uint64) + (low < base_lo)
+        mask = numpy.uint64(MASK32)
+        shift = numpy.uint64(32)
+        return [high >> shift, high & mask, low >> shift, low & mask], first
+
+    def challenge_text(self, idx):
+        """ Return the challenge string for a challenge index. """
+        chunk, row = divmod(idx, self.chunk_rows)
+        nums, _ = self.challenges(chunk)
+        return "".join(f"{int(num[row]):08x}" for num in nums)
+
+# Two upper-case hex characters for every byte value, as one uint16
+# each so the lookup is a single numpy.take().
+HEX_PAIRS = numpy.frombuffer(b"".join(b"%02X" % byte for byte in range(256)),
+                             numpy.uint16) if numpy is not None else None
+
+def _hex_upper(nums):
+    """ Return the upper-cased hex challenges as an (N, 32) uint8 array. """
+    packed = numpy.empty((len(nums[0]), 4), ">u4")
+    for part, num in enumerate(nums):
+        packed[:, part] = num
+    return numpy.take(HEX_PAIRS, packed.view(numpy.uint8)).view(numpy.uint8)
+
+def _digit_tables():
+    """ Return the (radix 36, radix 16) key character to digit tables. """
+    tables = []
+    for alphabet in (INDEX.encode("ascii"), b"0123456789ABCDEF"):
+        table = numpy.zeros(256, numpy.uint8)
+        table[numpy.frombuffer(alphabet, numpy.uint8)] = numpy.arange(len(alphabet))
+        tables.append(table)
+    return tables
+
+def _mixed_radix(digits, radix, chars):
+    """ Combine some key characters' digits into one uint64 per key. """
+    value = digits[chars[0]].astype(numpy.uint64)
+    for char in chars[1:]:
+        value *= numpy.uint64(radix[char])
+        value += digits[char]
+    return value
+
+def collision_entropy(counts):
+    """
+    Collision (Renyi order 2) entropy in bits from a histogram, using
+    the unbiased estimate of the chance two draws match. Unlike the
+    Shannon estimate this stays accurate with far fewer samples than
+    possible values, as long as some of them coincide. Returns None if
+    none do.
+    """
+    counts = counts.astype(numpy.float64)
+    total = counts.sum()
+    matches = (counts * (counts - 1)).sum()
+    if matches == 0:
+        return None
+    return max(0.0, -math.log2(matches / (total * (total - 1))))
+
+def map_chunk(workdir, params, chunk):
+    """
+    Pool worker: generate and key one work chunk, spill its records
+    grouped by partition and save its stats. The stats file is written
+    last, it marks the chunk as done.
+    """
+    job = Job.from_params(params)
+    nums, first = job.challenges(chunk)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        keys, bad = get_vector_engine(job.month)(*nums, _hex_upper(nums))
+    index = numpy.arange(first, first + len(nums[0]), dtype=numpy.uint64)
+    if bad is not None:
+        keys = keys[~bad]
+        index = index[~bad]
+
+    # Key characters as digits in their radix.
+    by36, by16 = _digit_tables()
+    columns = numpy.ascontiguousarray(keys.T)
+    digits = [numpy.take(by16 if base == 16 else by36, columns[col])
+              for base, col in zip(job.radix, job.columns)]
+
+    records = numpy.empty(len(index), job.dtype)
+    for word, chars in enumerate(job.words):
+        records[f"w{word}"] = _mixed_radix(digits, job.radix, chars)
+    records["idx"] = index
+
+    # Fibonacci hash of the first word picks the partition.
+    bits = job.partitions.bit_length() - 1
+    part = numpy.zeros(len(index), numpy.uint16)
+    if bits:
+        part = ((records["w0"] * numpy.uint64(0x9E3779B97F4A7C15))
+                >> numpy.uint64(64 - bits)).astype(numpy.uint16)
+    # A stable sort of 16 bit ints is a radix sort.
+    order = numpy.argsort(part, kind="stable")
+    counts = numpy.bincount(part, minlength=job.partitions)
+    path = os.path.join(workdir, "spill", f"chunk{chunk:07d}.bin")
+    records[order].tofile(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+    stats = {"chunk": chunk, "rows": len(nums[0]), "keys": len(index),
+             "offsets": [0] + numpy.cumsum(counts).tolist(),
+             "char_counts": [numpy.bincount(digits[char], minlength=base).tolist()
+                             for char, base in enumerate(job.radix)],
+             "chunk_entropy": []}
+    for chars in job.key_chunks:
+        value = _mixed_radix(digits, job.radix, chars)
+        if math.prod(job.radix[char] for char in chars) <= 1 << 32:
+            # Sorting uint32 is quicker.
+            value = value.astype(numpy.uint32)
+        _, counts = numpy.unique(value, return_counts=True)
+        stats["chunk_entropy"].append(collision_entropy(counts))
+    path = os.path.join(workdir, "stats", f"chunk{chunk:07d}.json")
+    with open(path + ".tmp", "w") as fd_out:
+        json.dump(stats, fd_out)
+    os.replace(path + ".tmp", path)
+    return chunk
+
+def reduce_partition(workdir, params, part):
+    """
+    Pool worker: read one partition from every chunk's spill, sort it
+    and count the runs of equal keys. The result file marks it as done.
+    """
+    job = Job.from_params(params)
+    pieces = []
+    for chunk in range(job.chunks):
+        with open(os.path.join(workdir, "stats", f"chunk{chunk:07d}.json"), "r") as fd_in:
+            offsets = json.load(fd_in)["offsets"]
+        count = offsets[part + 1] - offsets[part]
+        if count:
+            pieces.append(numpy.fromfile(
+                os.path.join(workdir, "spill", f"chunk{chunk:07d}.bin"), job.dtype,
+                count=count, offset=offsets[part] * job.dtype.itemsize))
+    records = numpy.concatenate(pieces) if pieces else numpy.empty(0, job.dtype)
+
+    # Sort on the first word only, then sort just the rows that tie on
+    # it by every word. Ties are rare unless the keys really collide.
+    order = numpy.argsort(records["w0"])
+    first = records["w0"][order]
+    tie = first[1:] == first[:-1]
+    in_tie = numpy.zeros(len(records), bool)
+    in_tie[:-1] |= tie
+    in_tie[1:] |= tie
+    ties = records[order[in_tie]]
+    words = [ties[f"w{word}"] for word in range(len(job.words))]
+    order = numpy.lexsort(words[::-1])
+    same = numpy.ones(max(len(ties) - 1, 0), bool)
+    for word in words:
+        ordered = word[order]
+        same &= ordered[1:] == ordered[:-1]
+
+    # Runs of equal keys: a run starts wherever 'same' goes from False
+    # to True and its length is the number of Trues plus one.
+    edges = numpy.diff(numpy.concatenate(([0], same.astype(numpy.int8), [0])))
+    starts = numpy.flatnonzero(edges == 1)
+    sizes = numpy.flatnonzero(edges == -1) - starts + 1
+    result = {"part": part, "keys": len(records),
+              "colliding_keys": len(sizes),
+              "challenges": int(sizes.sum()),
+              "pairs": int((sizes * (sizes - 1) // 2).sum()),
+              "sizes": {str(size): int(num) for size, num in
+                        zip(*numpy.unique(sizes, return_counts=True))},
+              "examples": [[int(idx) for idx in ties["idx"][order[start:start + size]]]
+                           for start, size in zip(starts[:EXAMPLES], sizes[:EXAMPLES])]}
+    path = os.path.join(workdir, "reduce", f"part{part:05d}.json")
+    with open(path + ".tmp", "w") as fd_out:
+        json.dump(result, fd_out)
+    os.replace(path + ".tmp", path)
+    return part
+
+def _run_pool(func, workdir, params, todo, workers, label):
+    """ Run the unfinished units of a phase over a pool with progress. """
+    if not todo:
+        return
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, workdir, params, unit) for unit in todo]
+        for done, future in enumerate(futures, 1):
+            future.result()
+            rate = done / (time.perf_counter() - start)
+            print(f"\r [*] {label}: {done}/{len(todo)} "
+                  f"({(len(todo) - done) / rate:.0f} s left)   ", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+def run(workdir, job, workers=None):
+    """
+    Run (or resume) an analysis in 'workdir'. Returns the merged stats
+    and reduce results.
+    """
+    for sub in ("spill", "stats", "reduce"):
+        os.makedirs(os.path.join(workdir, sub), exist_ok=True)
+    meta = os.path.join(workdir, "job.json")
+    if os.path.exists(meta):
+        with open(meta, "r") as fd_in:
+            saved = json.load(fd_in)
+        if saved != job.params():
+            raise ValueError(f"{workdir} holds a different run: {saved}")
+    else:
+        with open(meta, "w") as fd_out:
+            json.dump(job.params(), fd_out)
+    params = job.params()
+
+    todo = [chunk for chunk in range(job.chunks) if not os.path.exists(
+        os.path.join(workdir, "stats", f"chunk{chunk:07d}.json"))]
+    if len(todo) < job.chunks:
+        print(f" [*] Resuming: {job.chunks - len(todo)} of {job.chunks} chunks already done",
+              file=sys.stderr)
+    _run_pool(map_chunk, workdir, params, todo, workers, "Keying and spilling chunks")
+
+    todo = [part for part in range(job.partitions) if not os.path.exists(
+        os.path.join(workdir, "reduce", f"part{part:05d}.json"))]
+    _run_pool(reduce_partition, workdir, params, todo, workers, "Sorting partitions")
+
+    stats = []
+    for chunk in range(job.chunks):
+        with open(os.path.join(workdir, "stats", f"chunk{chunk:07d}.json"), "r") as fd_in:
+            stats.append(json.load(fd_in))
+    results = []
+    for part in range(job.partitions):
+        with open(os.path.join(workdir, "reduce", f"part{part:05d}.json"), "r") as fd_in:
+            results.append(json.load(fd_in))
+    return stats, results
+
+def report(job, stats, results, workdir):
+    """ Print the collision counts and the entropy report. """
+    keys = sum(each["keys"] for each in stats)
+    rows = sum(each["rows"] for each in stats)
+    space = math.prod(job.radix)
+    pairs = sum(each["pairs"] for each in results)
+    expected = keys * (keys - 1) / 2 / space
+    print(f" [*] {job.mode} of {rows:,} challenges ({job.month}), "
+          f"{rows - keys:,} invalid (divide by zero)")
+    print(f" [*] Key space if every key character were independent: "
+          f"2^{math.log2(space):.1f}")
+    print(f" [*] Keys shared by 2+ challenges: "
+          f"{sum(each['colliding_keys'] for each in results):,} "
+          f"(covering {sum(each['challenges'] for each in results):,} challenges)")
+    print(f" [*] Colliding pairs: {pairs:,} (ideal key space: {expected:.3g} expected)")
+    if pairs:
+        print(f" [*] Effective key space: 2^{math.log2(keys * (keys - 1) / 2 / pairs):.1f}")
+        sizes = {}
+        for each in results:
+            for size, num in each["sizes"].items():
+                sizes[int(size)] = sizes.get(int(size), 0) + num
+        print("     " + ", ".join(f"{num:,} keys x {size}" for size, num in sorted(sizes.items())))
+        examples = [group for each in results for group in each["examples"]][:EXAMPLES]
+        engine = get_engine(job.month)
+        for group in examples:
+            challenges = [job.challenge_text(idx) for idx in group[:3]]
+            more = f" (+{len(group) - 3} more)" if len(group) > 3 else ""
+            print(f"     {engine(challenges[0])}: {', '.join(challenges)}{more}")
+
+    # Per character entropy over the whole run, and per key chunk
+    # entropy measured within each work chunk.
+    chars = [collision_entropy(numpy.sum([each["char_counts"][char] for each in stats],
+                                         axis=0))
+             for char in range(len(job.radix))]
+    print(f"\n Collision entropy (bits) {'ideal':>7s} {'chars sum':>10s} "
+          f"{'measured min':>13s} {'mean':>7s} {'max':>7s}")
+    for idx, key_chars in enumerate(job.key_chunks):
+        measured = [each["chunk_entropy"][idx] for each in stats
+                    if each["chunk_entropy"][idx] is not None]
+        line = (f"     key chunk {idx + 1:<10d} "
+                f"{sum(math.log2(job.radix[char]) for char in key_chars):7.2f} "
+                f"{sum(chars[char] for char in key_chars):10.2f} ")
+        if measured:
+            line += (f"{min(measured):13.2f} {sum(measured) / len(measured):7.2f} "
+                     f"{max(measured):7.2f}")
+        else:
+            line += f"{'(chunks too small to measure)':>29s}"
+        print(line)
+    print("     Key characters: " + " ".join(f"{bits:.2f}" for bits in chars))
+
+    path = os.path.join(workdir, "entropy.tsv")
+    with open(path, "w") as fd_out:
+        fd_out.write("chunk\tkeys\t" + "\t".join(
+            f"key_chunk{idx + 1}" for idx in range(len(job.key_chunks))) + "\n")
+        for each in stats:
+            fd_out.write(f"{each['chunk']}\t{each['keys']}\t" + "\t".join(
+                "" if bits is None else f"{bits:.4f}" for bits in each["chunk_entropy"]) + "\n")
+    print(f" [*] Per work chunk entropy written to {path}")
+
+def _parse_count(text):
+    """ Parse a count like 1e9 or 1000000. """
+    return int(float(text))
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(
+        description="Key collision and key space analysis. Run it again with the "
+        "same arguments to resume an interrupted run.")
+    parser.add_argument("-w", "--workdir", required=True,
+                        help="where spill files and progress are kept")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--sample", type=_parse_count, metavar="COUNT",
+                       help="analyse COUNT seeded random challenges, e.g. 1e9")
+    group.add_argument("--enumerate", type=_parse_count, metavar="COUNT",
+                       help="analyse COUNT consecutive challenges from --start")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --sample")
+    parser.add_argument("--start", default="0" * 32,
+                        help="first challenge for --enumerate (32 hex characters)")
+    parser.add_argument("-m", "--month", choices=months(), default=DEFAULT_MONTH,
+                        help="challenge month (default: %(default)s)")
+    parser.add_argument("--chunk", type=_parse_count, default=CHUNK_ROWS,
+                        help="challenges per work chunk (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, help="pool size (default: CPUs)")
+    args = parser.parse_args()
+
+    if numpy is None:
+        print(" [!] NumPy is required for the collision analysis.")
+        return 1
+    try:
+        start = int(args.start, 16)
+    except ValueError:
+        parser.error("--start must be a hex challenge")
+    if args.sample is not None:
+        job = Job("sample", args.sample, seed=args.seed, month=args.month,
+                  chunk_rows=args.chunk)
+    else:
+        job = Job("enumerate", args.enumerate, start=start, month=args.month,
+                  chunk_rows=args.chunk)
+
+    began = time.perf_counter()
+    try:
+        stats, results = run(args.workdir, job, args.workers)
+    except ValueError as err:
+        print(f" [!] {err}")
+        return 1
+    report(job, stats, results, args.workdir)
+    elapsed = time.perf_counter() - began
+    print(f" [*] {elapsed:.1f} s ({job.count / elapsed / 1e6:.2f} M challenges/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,684 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: inbox.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A watched drop directory for continuous submission checking.
+          Submission files use the same format as batch.py (a challenge,
+          optionally followed by the submitted key, one per line). Files
+          dropped into (or appended to in) the inbox are read from the
+          offset where the last read stopped, keys are generated and
+          checked on a worker thread, and the results are appended to an
+          output file and streamed to the UI (see KeyGenUI --inbox).
+
+          All watching and file I/O live on the worker thread. On Linux
+          the inbox is watched with inotify, which (unlike
+          QFileSystemWatcher) reports which file each change was to, so
+          a burst of thousands of files costs nothing per file beyond
+          reading it and the only watch is the directory's. Elsewhere
+          QFileSystemWatcher is used: new files are found by listing
+          the names once per burst (no stat() calls) and appends come in
+          through a watch on every file. Past MAX_WATCHES watches the
+          remaining files are polled for growth every POLL_MS instead.
+
+          A last line without a newline waits until the file is known to
+          be complete: it was renamed into the inbox, or it hasn't
+          changed for SETTLE_MS.
+
+          Read offsets are kept in <output>.state, a journal of one
+          [file name, offset] JSON line per change (offset null when the
+          file went away). Each burst only appends the files it touched,
+          and the journal is rewritten with just the live files once
+          it's mostly stale lines.
+
+ Usage:   inbox.py --bench 5000
+          inbox.py --check
+"""
+import io
+import os
+import sys
+import json
+import time
+import ctypes
+import shutil
+import signal
+import struct
+import argparse
+import tempfile
+import multiprocessing
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import (Qt, QObject, QThread, QTimer, QMetaObject,
+                          QFileSystemWatcher, QSocketNotifier, pyqtSignal,
+                          pyqtSlot)
+from batch import process_lines
+from keyschedule import (DEFAULT_MONTH, get_engine, get_raw_engine,
+                         random_challenge)
+
+# How long to let a burst of changes settle before processing it.
+DEBOUNCE_MS = 50
+
+# How long a file has to go unchanged before a last line without a
+# newline is taken as finished.
+SETTLE_MS = 2000
+
+# Largest piece of a file read at once.
+READ_CHUNK = 4 << 20
+
+# Most files QFileSystemWatcher watches at once. Files past this are
+# polled for appends every POLL_MS instead.
+MAX_WATCHES = 1024
+POLL_MS = 2000
+
+# Stale state journal lines allowed (beyond one per live file) before
+# it's compacted.
+STATE_SLACK = 1024
+
+# Result lines per signal sent to the UI, so a big burst arrives as
+# many small updates instead of one huge one.
+EMIT_LINES = 2000
+
+# inotify(7) event bits.
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_ISDIR = 0x40000000
+
+class Inotify:
+    """
+    A Linux inotify watch on one directory. Every event comes with the
+    name of the file it was for.
+    """
+    EVENT = struct.Struct("iIII")
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+    def __init__(self, path):
+        """ Start watching 'path'. Raises OSError if inotify isn't available. """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux only")
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), path)
+
+    def read(self):
+        """ Return every pending event as (mask, file name). """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            pos = 0
+            while pos < len(data):
+                _wd, mask, _cookie, size = self.EVENT.unpack_from(data, pos)
+                pos += self.EVENT.size
+                events.append((mask, os.fsdecode(data[pos:pos + size].rstrip(b"\0"))))
+                pos += size
+
+    def close(self):
+        """ Stop watching. """
+        os.close(self.fd)
+
+class InboxWorker(QObject):
+    """
+    Watches the inbox and processes submissions. Lives on its own
+    thread; start() has to be called on that thread.
+    """
+    # Result lines (text) and the running status totals (dict).
+    results = pyqtSignal(str, object)
+    error = pyqtSignal(str)
+
+    def __init__(self, inbox, output, month=None, inotify=True):
+        """
+        Initalize the class. Set 'inotify' to False to use the
+        QFileSystemWatcher fallback even where inotify is available.
+        """
+        super().__init__()
+        self.use_inotify = inotify
+        self.inbox = os.path.abspath(inbox)
+        self.output = os.path.abspath(output)
+        self.state_path = self.output + ".state"
+        self.month = month or DEFAULT_MONTH
+        self.raw_engine = get_raw_engine(self.month)
+        self.key_len = len(get_engine(self.month)("1" * 32))
+        # Format: "file name": bytes read so far
+        self.offsets = {}
+        # Offsets changed since the state was last saved (None for files
+        # that went away), and lines in the state journal.
+        self._changed = {}
+        self._state_lines = 0
+        self._state = None
+        self.totals = {"files": 0, "lines": 0, "OK": 0, "NO": 0, "--": 0, "ER": 0}
+        # Files to read, files renamed in since their last read, and
+        # files waiting on a half written last line.
+        self._dirty = set()
+        self._renamed = set()
+        self._waiting = set()
+        # Files QFileSystemWatcher is watching.
+        self._watched = set()
+        self._scan_needed = True
+        self._out = None
+        self.inotify = None
+        self.notifier = None
+        self.watcher = None
+        self.timer = None
+        self.settle_timer = None
+        self.poll_timer = None
+
+    @pyqtSlot()
+    def start(self):
+        """ Start watching. Runs on the worker thread. """
+        try:
+            self.inotify = Inotify(self.inbox) if self.use_inotify else None
+        except OSError:
+            self.inotify = None
+        if self.inotify is not None:
+            self.notifier = QSocketNotifier(self.inotify.fd, QSocketNotifier.Read, self)
+            self.notifier.activated.connect(self._cb_events)
+        else:
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.directoryChanged.connect(self._cb_dir_changed)
+            self.watcher.fileChanged.connect(self._cb_file_changed)
+            if not self.watcher.addPath(self.inbox):
+                self.error.emit(f"Can't watch {self.inbox}")
+                return
+            self.poll_timer = QTimer(self)
+            self.poll_timer.setInterval(POLL_MS)
+            self.poll_timer.timeout.connect(self._cb_poll)
+            self.poll_timer.start()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self._process)
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SETTLE_MS)
+        self.settle_timer.timeout.connect(self._cb_settled)
+
+        self._out = open(self.output, "ab")
+        self._load_state()
+        # Pick up whatever arrived while we weren't running.
+        self._dirty.update(self.offsets)
+        self.timer.start()
+
+    @pyqtSlot()
+    def stop(self):
+        """ Stop watching and close the output. Runs on the worker thread. """
+        if self.timer is not None:
+            self.timer.stop()
+            self.settle_timer.stop()
+        if self.poll_timer is not None:
+            self.poll_timer.stop()
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier.deleteLater()
+            self.notifier = None
+            self.inotify.close()
+            self.inotify = None
+        if self.watcher is not None:
+            self.watcher.deleteLater()
+            self.watcher = None
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+
+    def _cb_events(self):
+        """ inotify has events. Note which files they were for. """
+        for mask, name in self.inotify.read():
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, find out what's there the slow way.
+                self._scan_needed = True
+                self._dirty.update(self.offsets)
+            elif mask & IN_ISDIR or not name or name.startswith("."):
+                continue
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._forget(name)
+            else:
+                if mask & IN_MOVED_TO:
+                    # A new file, even if it replaced one.
+                    self._forget(name)
+                    self._renamed.add(name)
+                if name not in self.offsets:
+                    self._add(name)
+                self._dirty.add(name)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _cb_dir_changed(self, _path):
+        """ Something was added or removed. Scan once the burst settles. """
+        self._scan_needed = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _cb_file_changed(self, path):
+        """ A watched file was appended to (or replaced). """
+        name = os.path.basename(path)
+        # A replaced file drops out of the watch. Either way _watch()
+        # decides again once it's been read.
+        self._unwatch(name)
+        self._dirty.add(name)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _cb_settled(self):
+        """ Check the files waiting on a last line again. """
+        self._dirty.update(self._waiting)
+        self._waiting = set()
+        self._process()
+
+    def _cb_poll(self):
+        """
+        Find appends to the files QFileSystemWatcher couldn't watch,
+        and watch them if watches have been freed up.
+        """
+        for name in list(self.offsets):
+            if name in self._watched:
+                continue
+            self._watch(name)
+            if name in self._watched:
+                continue
+            try:
+                size = os.stat(os.path.join(self.inbox, name)).st_size
+            except OSError:
+                continue
+            if size != self.offsets[name]:
+                self._dirty.add(name)
+        if self._dirty and not self.timer.isActive():
+            self.timer.start()
+
+    def _load_state(self):
+        """ Read the offsets journal and open it for appending. """
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r") as fd_in:
+                for line in fd_in:
+                    if line.startswith("{"):
+                        # Older single JSON object state file.
+                        self.offsets.update(json.loads(line))
+                        self._changed.update(self.offsets)
+                        continue
+                    try:
+                        name, offset = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash, the file gets
+                        # read again from the previous offset.
+                        continue
+                    if offset is None:
+                        self.offsets.pop(name, None)
+                    else:
+                        self.offsets[name] = offset
+                    self._state_lines += 1
+        self._state = open(self.state_path, "a")
+
+    def _save_state(self):
+        """
+        Append the offsets changed since the last save to the journal,
+        or rewrite it with only the live files once it's mostly stale.
+        """
+        if self._state_lines + len(self._changed) > 2 * len(self.offsets) + STATE_SLACK:
+            self._state.close()
+            with open(self.state_path + ".tmp", "w") as fd_out:
+                for name, offset in self.offsets.items():
+                    fd_out.write(json.dumps([name, offset]) + "\n")
+            os.replace(self.state_path + ".tmp", self.state_path)
+            self._state = open(self.state_path, "a")
+            self._state_lines = len(self.offsets)
+        elif self._changed:
+            self._state.write("".join(json.dumps([name, offset]) + "\n"
+                                      for name, offset in self._changed.items()))
+            self._state.flush()
+            self._state_lines += len(self._changed)
+        self._changed = {}
+
+    def _add(self, name):
+        """ Start tracking a new file. """
+        self.offsets[name] = 0
+        self._changed[name] = 0
+        self.totals["files"] += 1
+
+    def _forget(self, name):
+        """ Stop tracking a file that went away. """
+        if self.offsets.pop(name, None) is not None:
+            self._changed[name] = None
+        self._dirty.discard(name)
+        self._renamed.discard(name)
+        self._waiting.discard(name)
+        self._unwatch(name)
+
+    def _watch(self, name):
+        """ Watch a file for appends (QFileSystemWatcher only). """
+        if (self.watcher is not None and name not in self._watched
+                and len(self._watched) < MAX_WATCHES):
+            if self.watcher.addPath(os.path.join(self.inbox, name)):
+                self._watched.add(name)
+
+    def _unwatch(self, name):
+        """ Stop watching a file (QFileSystemWatcher only). """
+        if name in self._watched:
+            self._watched.discard(name)
+            self.watcher.removePath(os.path.join(self.inbox, name))
+
+    def _scan(self):
+        """ Find new and removed files by name. """
+        self._scan_needed = False
+        names = set()
+        with os.scandir(self.inbox) as entries:
+            for entry in entries:
+                # is_file() comes from the directory listing itself on
+                # Linux, so this doesn't stat every file.
+                if not entry.name.startswith(".") and entry.is_file():
+                    names.add(entry.name)
+
+        for name in set(self.offsets) - names:
+            self._forget(name)
+        new = names - set(self.offsets)
+        for name in new:
+            self._add(name)
+        self._dirty.update(new)
+
+    def _read(self, name, out):
+        """
+        Process the lines added to a file since the last read. A last
+        line without a newline is only processed once the file is
+        complete (renamed in, or unchanged for SETTLE_MS). Returns True
+        if the whole file has been processed.
+        """
+        path = os.path.join(self.inbox, name)
+        try:
+            fd_in = open(path, "rb")
+        except OSError:
+            return True
+        prefix = name.encode("utf-8", "replace") + b" "
+        with fd_in:
+            offset = self.offsets.get(name, 0)
+            stat = os.fstat(fd_in.fileno())
+            size = stat.st_size
+            complete = (name in self._renamed
+                        or time.time() - stat.st_mtime >= SETTLE_MS / 1000)
+            if size < offset:
+                # Truncated or replaced, start over.
+                offset = 0
+            fd_in.seek(offset)
+            while offset < size:
+                data = fd_in.read(min(READ_CHUNK, size - offset))
+                if not data:
+                    break
+                if complete and offset + len(data) >= size:
+                    end = len(data)
+                else:
+                    end = data.rfind(b"\n") + 1
+                if end == 0:
+                    # Only a partial line so far.
+                    if len(data) < READ_CHUNK:
+                        break
+                    # A 4 MB line isn't a submission, skip it.
+                    end = len(data)
+                buf = io.BytesIO()
+                process_lines(data, 0, end, self.raw_engine, self.key_len, buf)
+                for line in buf.getvalue().splitlines(True):
+                    out.append(prefix + line)
+                    self.totals[line[-3:-1].decode("ascii")] += 1
+                offset += end
+                fd_in.seek(offset)
+        if self.offsets.get(name) != offset:
+            self.offsets[name] = offset
+            self._changed[name] = offset
+        self._renamed.discard(name)
+        return offset >= size
+
+    def _process(self):
+        """ Handle everything that changed in the last burst. """
+        if self._scan_needed:
+            self._scan()
+        dirty, self._dirty = self._dirty, set()
+        out = []
+        for name in sorted(dirty):
+            if name not in self.offsets:
+                continue
+            if self._read(name, out):
+                self._waiting.discard(name)
+            else:
+                self._waiting.add(name)
+            self._watch(name)
+            if len(out) >= EMIT_LINES:
+                self._emit(out)
+                out = []
+        self._emit(out)
+        if self._waiting and not self.settle_timer.isActive():
+            self.settle_timer.start()
+        self._save_state()
+
+    def _emit(self, lines):
+        """ Write result lines to the output and send them to the UI. """
+        if not lines:
+            return
+        data = b"".join(lines)
+        self._out.write(data)
+        self._out.flush()
+        self.totals["lines"] += len(lines)
+        self.results.emit(data.decode("utf-8", "replace"), dict(self.totals))
+
+class Inbox(QObject):
+    """ Owns the worker and its thread. """
+    def __init__(self, inbox, output, month=None, parent=None, inotify=True):
+        """ Initalize the class and start watching. """
+        super().__init__(parent)
+        output = os.path.abspath(output)
+        if os.path.dirname(output) == os.path.abspath(inbox):
+            raise ValueError("the output file can't be inside the inbox")
+        self.worker = InboxWorker(inbox, output, month, inotify)
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.start)
+        self.results = self.worker.results
+        self.error = self.worker.error
+        self.thread.start()
+
+    def stop(self):
+        """ Stop the worker and wait for its thread to finish. """
+        if self.thread.isRunning():
+            # Runs on the worker thread, and waits for it to finish.
+            QMetaObject.invokeMethod(self.worker, "stop", Qt.BlockingQueuedConnection)
+            self.thread.quit()
+            self.thread.wait()
+
+def _drop_files(inbox, count, lines, month):
+    """ Write 'count' submission files into the inbox as fast as possible. """
+    engine = get_engine(month)
+    for idx in range(count):
+        rows = []
+        for _ in range(lines):
+            chall = random_challenge()
+            try:
+                rows.append(f"{chall} {engine(chall)}\n")
+            except ZeroDivisionError:
+                rows.append(f"{chall}\n")
+        tmp = os.path.join(inbox, f".sub{idx:06d}.tmp")
+        with open(tmp, "w") as fd_out:
+            fd_out.write("".join(rows))
+        # Renamed in so the watcher never sees a half written file.
+        os.replace(tmp, os.path.join(inbox, f"sub{idx:06d}.txt"))
+
+def bench(count, lines, month):
+    """
+    Drop 'count' files at once into an inbox watched by a KeyGenUI and
+    measure how long until every line is checked, and the longest the
+    GUI thread went without running its event loop (past the probe's
+    5 ms interval).
+    """
+    # pylint: disable=import-outside-toplevel
+    # Reason: Only the benchmark needs the UI.
+    from PyQt5.QtWidgets import QApplication
+    from keygen import KeyGenUI
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    workdir = tempfile.mkdtemp(prefix="inbox_bench_")
+    inbox = os.path.join(workdir, "inbox")
+    os.mkdir(inbox)
+    output = os.path.join(workdir, "results.txt")
+    gui = KeyGenUI(month, inbox=inbox, output=output)
+
+    stalls = [0.0]
+    last = [time.perf_counter()]
+
+    def probe():
+        now = time.perf_counter()
+        stalls[0] = max(stalls[0], (now - last[0]) * 1000 - 5)
+        last[0] = now
+
+    expected = count * lines
+    done = [None]
+
+    def on_results(_text, totals):
+        if totals["lines"] >= expected and done[0] is None:
+            done[0] = time.perf_counter()
+            app.quit()
+    gui.inbox.results.connect(on_results)
+
+    timer = QTimer()
+    timer.timeout.connect(probe)
+    timer.start(5)
+    start = [0.0]
+
+    # The files come from another process, like real submissions.
+    writer = multiprocessing.Process(target=_drop_files, args=(inbox, count, lines, month))
+
+    def drop():
+        start[0] = time.perf_counter()
+        writer.start()
+    QTimer.singleShot(100, drop)
+    QTimer.singleShot(300000, app.quit)
+    app.exec_()
+    timer.stop()
+    writer.join()
+
+    with open(output, "rb") as fd_in:
+        written = sum(1 for _ in fd_in)
+    gui.close()
+    shutil.rmtree(workdir)
+    if done[0] is None:
+        print(f" [!] Timed out with {written:,} of {expected:,} lines done.")
+        return 1
+    elapsed = done[0] - start[0]
+    print(f" [*] {count:,} files x {lines} lines dropped at once")
+    print(f" [*] All {written:,} lines checked {elapsed:.2f} s after the drop started "
+          f"({written / elapsed:,.0f} lines/s)")
+    print(f" [*] Longest GUI thread stall: {stalls[0]:.1f} ms")
+    return 0
+
+def _wait_for(app, done, timeout):
+    """ Run the event loop until done() is True or 'timeout' seconds pass. """
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return done()
+
+def check(month):
+    """
+    Check the inbox end to end, with inotify and with the
+    QFileSystemWatcher fallback: a new file, an append to a file that
+    was already read to the end, a renamed in file without a final
+    newline, and an append made while stopped. Every challenge has to
+    come out exactly once, and a file deleted while stopped has to be
+    gone from the saved state. Returns the exit code.
+    """
+    # pylint: disable=import-outside-toplevel,no-name-in-module
+    # Reason: Only the check needs an application.
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    failed = 0
+    for use_inotify in (True, False):
+        workdir = tempfile.mkdtemp(prefix="inbox_check_")
+        inbox = os.path.join(workdir, "inbox")
+        os.mkdir(inbox)
+        output = os.path.join(workdir, "results.txt")
+        sub = os.path.join(inbox, "sub.txt")
+        chall = [random_challenge() for _ in range(6)]
+        got = []
+
+        def start():
+            box = Inbox(inbox, output, month, inotify=use_inotify)
+            box.results.connect(lambda text, _totals: got.extend(text.splitlines()))
+            return box
+
+        def append(path, text):
+            with open(path, "a") as fd_out:
+                fd_out.write(text)
+
+        def drop_renamed():
+            tmp = os.path.join(inbox, ".ren.tmp")
+            append(tmp, chall[4])
+            os.replace(tmp, os.path.join(inbox, "ren.txt"))
+
+        box = start()
+        steps = (("new file", lambda: append(sub, "".join(c + "\n" for c in chall[:3])), 3),
+                 ("append to a file read to the end", lambda: append(sub, chall[3] + "\n"), 4),
+                 ("renamed in without a final newline", drop_renamed, 5))
+        results = []
+        for name, action, want in steps:
+            action()
+            results.append((name, want))
+            _wait_for(app, lambda want=want: len(got) >= want, 10)
+            results[-1] += (sorted(line.split()[1] for line in got) == sorted(chall[:want]),)
+        box.stop()
+        append(sub, chall[5] + "\n")
+        os.remove(os.path.join(inbox, "ren.txt"))
+        box = start()
+        _wait_for(app, lambda: len(got) >= 6, 10)
+        # Give duplicates a chance to show up.
+        _wait_for(app, lambda: False, 0.5)
+        results.append(("append while stopped", 6,
+                        sorted(line.split()[1] for line in got) == sorted(chall)))
+        box.stop()
+        offsets = InboxWorker(inbox, output)
+        offsets._load_state()  # pylint: disable=protected-access
+        offsets._state.close()  # pylint: disable=protected-access
+        results.append(("deleted file dropped from the state", 0,
+                        list(offsets.offsets) == ["sub.txt"]))
+        shutil.rmtree(workdir)
+
+        mode = "inotify" if use_inotify else "QFileSystemWatcher"
+        for name, _want, passed in results:
+            print(f" [{'*' if passed else '!'}] {mode:18s} {name}: "
+                  f"{'ok' if passed else 'FAILED'}")
+            failed += not passed
+    return 1 if failed else 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Inbox ingest benchmark. "
+                                     "Use 'keygen.py --inbox DIR' to run the inbox.")
+    parser.add_argument("--bench", type=int, default=5000, metavar="FILES",
+                        help="files to drop at once (default: %(default)s)")
+    parser.add_argument("--lines", type=int, default=10,
+                        help="submissions per file (default: %(default)s)")
+    parser.add_argument("-m", "--month", default=DEFAULT_MONTH,
+                        help="challenge month (default: %(default)s)")
+    parser.add_argument("--check", action="store_true",
+                        help="check new files, appends and restarts in both watch modes")
+    args = parser.parse_args()
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if args.check:
+        return check(args.month)
+    return bench(args.bench, args.lines, args.month)
+
+if __name__ == "__main__":
+    sys.exit(main())
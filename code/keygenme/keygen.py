@@ -15,12 +15,87 @@
 import sys
 import string
 import signal
+import argparse
+from collections import deque
+from time import perf_counter_ns
 # pylint: disable=no-name-in-module
 # Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
 #         They do exist.
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import (QApplication, QWidget,
                              QHBoxLayout, QVBoxLayout,
-                             QLineEdit, QPushButton)
+                             QLineEdit, QPushButton,
+                             QLabel, QPlainTextEdit)
+from keyschedule import (DEFAULT_MONTH, SCHEDULES, get_engine, months)
+
+class PhaseProfiler:
+    """
+    Aggregates per-phase timings from KeyGen instances. Timings are
+    keyed by call stack, e.g. ("KeyGen", "gen_key", "engine 2021-03"),
+    and summed across every key generated while it's installed.
+    Install one with KeyGen.profiler = PhaseProfiler().
+    """
+    def __init__(self):
+        """ Initalize the counters. """
+        self.total_ns = {}
+        self.calls = {}
+
+    def add(self, stack, elapsed_ns):
+        """ Add one timed call for a stack. """
+        self.total_ns[stack] = self.total_ns.get(stack, 0) + elapsed_ns
+        self.calls[stack] = self.calls.get(stack, 0) + 1
+
+    def parent(self, stack):
+        """ Return the closest recorded stack above 'stack', or None. """
+        for depth in range(len(stack) - 1, 0, -1):
+            if stack[:depth] in self.total_ns:
+                return stack[:depth]
+        return None
+
+    def self_ns(self, stack):
+        """
+        Time spent in a stack's own frame, excluding every recorded
+        stack below it (each counted once, through its closest
+        recorded parent).
+        """
+        children = sum(total for child, total in self.total_ns.items()
+                       if child != stack and self.parent(child) == stack)
+        return self.total_ns[stack] - children
+
+    def measured_ns(self):
+        """ Total time measured: the sum of the outermost stacks. """
+        top = min((len(stack) for stack in self.total_ns), default=0)
+        return sum(total for stack, total in self.total_ns.items()
+                   if len(stack) == top)
+
+    def report(self, out=sys.stdout):
+        """ Print the phase breakdown as an indented tree. """
+        grand = self.measured_ns() or 1
+        print(f"\n {'phase':40s} {'calls':>9s} {'total ms':>10s} "
+              f"{'avg ns':>9s} {'%':>6s}", file=out)
+        for stack in sorted(self.total_ns):
+            name = "  " * (len(stack) - 1) + stack[-1]
+            total = self.total_ns[stack]
+            calls = self.calls[stack]
+            print(f" {name:40s} {calls:9d} {total / 1e6:10.2f} "
+                  f"{total / calls:9.0f} {total / grand * 100:6.1f}", file=out)
+
+    def write_collapsed(self, path):
+        """
+        Write the timings in collapsed stack format ("a;b;c value")
+        for flamegraph.pl / speedscope. Values are self time in usecs.
+        Returns the sum of the self times in nsecs, which has to equal
+        measured_ns() for the flame graph to be right.
+        """
+        written = 0
+        with open(path, "w") as fd_out:
+            for stack in sorted(self.total_ns):
+                self_ns = self.self_ns(stack)
+                written += self_ns
+                usecs = self_ns // 1000
+                if usecs > 0:
+                    fd_out.write("{0:s} {1:d}\n".format(";".join(stack), usecs))
+        return written
 
 class KeyGen:
     """
@@ -28,10 +103,20 @@ class KeyGen:
     The key will be generated once initalized with a challenge.
     The challenge is expected to be a 32 character hex string. The
     key that is generated can be pulled from the value 'final_key'.
+    The key schedule used is picked by challenge month ("YYYY-MM"),
+    see keyschedule.py. Set 'reference' to use the original
+    hand-written March 2021 generator instead.
     """
-    def __init__(self, challenge):
+    # Set to a PhaseProfiler to time every phase of key generation.
+    profiler = None
+
+    def __init__(self, challenge, month=None, reference=False):
         """ initalize and generate our key """
         self.challenge = challenge
+        self.month = month or DEFAULT_MONTH
+        self.reference = reference
+        if reference and self.month != "2021-03":
+            raise ValueError('the reference generator only handles 2021-03')
 
         # Generate a lookup table of chars.
         self.index = string.ascii_uppercase + string.digits
@@ -43,6 +128,10 @@ class KeyGen:
         self.part = []
         self.num = []
 
+        if self.profiler is not None:
+            self._generate_profiled()
+            return
+
         # Check if the challenge string is valid.
         # if not this will throw an exception.
         self.is_challenge_valid()
@@ -54,6 +143,17 @@ class KeyGen:
         # Run the Key Generator.
         self.gen_key()
 
+    def _generate_profiled(self):
+        """ The same steps as __init__, timing each one. """
+        prof = self.profiler
+        for name, phase in (("is_challenge_valid", self.is_challenge_valid),
+                            ("split_string_parts", self.split_string_parts),
+                            ("get_number_parts", self.get_number_parts),
+                            ("gen_key", self.gen_key)):
+            start = perf_counter_ns()
+            phase()
+            prof.add(("KeyGen", name), perf_counter_ns() - start)
+
     def is_challenge_valid(self):
         """
         Validate that the challenge code is a
@@ -89,13 +189,49 @@ class KeyGen:
         self.num.append(int(self.part[3], 16))
 
     def gen_key(self):
-        """ Generates the parts of the full final key and combines them. """
-        self.keys.append(self.gen_key1())
-        self.keys.append(self.gen_key2())
-        self.keys.append(self.gen_key3())
-        self.keys.append(self.gen_key4())
-        self.keys.append(self.gen_key5())
-        self.final_key = self.combine_keys()
+        """ Generates the full final key with the month's key schedule. """
+        if self.reference:
+            self.final_key = self.gen_key_march_2021()
+            return
+
+        engine = get_engine(self.month)
+        if self.profiler is None:
+            self.final_key = engine(self.challenge)
+        else:
+            start = perf_counter_ns()
+            self.final_key = engine(self.challenge)
+            self.profiler.add(("KeyGen", "gen_key", f"engine {self.month}"),
+                              perf_counter_ns() - start)
+        self.keys = self.final_key.split("-")
+
+    def gen_key_march_2021(self):
+        """
+        The original hand-written March 2021 generator. The compiled
+        schedules are checked and benchmarked against this one.
+        """
+        self.keys = []
+        prof = self.profiler
+        if prof is None:
+            self.keys.append(self.gen_key1())
+            self.keys.append(self.gen_key2())
+            self.keys.append(self.gen_key3())
+            self.keys.append(self.gen_key4())
+            self.keys.append(self.gen_key5())
+            return self.combine_keys()
+
+        stack = ("KeyGen", "gen_key", "gen_key_march_2021")
+        whole = perf_counter_ns()
+        for gen in (self.gen_key1, self.gen_key2, self.gen_key3,
+                    self.gen_key4, self.gen_key5):
+            start = perf_counter_ns()
+            self.keys.append(gen())
+            prof.add(stack + (gen.__name__,), perf_counter_ns() - start)
+        start = perf_counter_ns()
+        final_key = self.combine_keys()
+        end = perf_counter_ns()
+        prof.add(stack + ("combine_keys",), end - start)
+        prof.add(stack, end - whole)
+        return final_key
 
     def gen_key1(self):
         """ Generate the 1st chunk of the final key. """
@@ -160,11 +296,27 @@ class KeyGen:
 
 class KeyGenUI(QWidget):
     """
-    This class provides a simple UI for the keygen.
+    This class provides a simple UI for the keygen. Given an inbox
+    directory it also checks every submission dropped there (see
+    inbox.py) and shows the results as they come in.
     """
-    def __init__(self):
+    # Result lines kept in the inbox view. The output file has them all.
+    INBOX_LINES = 1000
+
+    # How often new inbox results are drawn, in milliseconds.
+    INBOX_REFRESH_MS = 100
+
+    def __init__(self, month=None, inbox=None, output=None):
         """ Initalize the UI. """
         super().__init__()
+        self.month = month or DEFAULT_MONTH
+        self.inbox = None
+        if inbox is not None:
+            # pylint: disable=import-outside-toplevel
+            # Reason: The inbox is optional, plain keygen use doesn't
+            #         need the batch engine loaded.
+            from inbox import Inbox
+            self.inbox = Inbox(inbox, output, self.month, parent=self)
         self.init_win()
 
     def cb_btn_gen_clicked(self):
@@ -173,15 +325,55 @@ class KeyGenUI(QWidget):
         Instance and populate the Key textbox with the key.
         """
         try:
-            keygen = KeyGen(self.txt_chall.text())
+            keygen = KeyGen(self.txt_chall.text(), self.month)
             self.txt_key.setText(keygen.final_key)
         except ValueError as err:
             self.txt_key.setText("Error: {0:s}".format(str(err)))
 
+    def cb_inbox_results(self, text, totals):
+        """
+        Queue a batch of inbox results. They're drawn by the refresh
+        timer, so a burst is a few redraws instead of one per batch.
+        """
+        self._inbox_lines.extend(text.splitlines())
+        self._inbox_new += text.count("\n")
+        self._inbox_totals = totals
+        if not self.tmr_inbox.isActive():
+            self.tmr_inbox.start()
+
+    def cb_inbox_refresh(self):
+        """ Draw the results queued since the last refresh. """
+        new = min(self._inbox_new, self.INBOX_LINES)
+        if self.txt_results.blockCount() + new > self.INBOX_LINES:
+            # Trimming the top of the document a line at a time is slow,
+            # replacing the whole view is quick.
+            self.txt_results.setPlainText("\n".join(self._inbox_lines))
+            scroll = self.txt_results.verticalScrollBar()
+            scroll.setValue(scroll.maximum())
+        elif new:
+            self.txt_results.appendPlainText("\n".join(list(self._inbox_lines)[-new:]))
+        self._inbox_new = 0
+        self.lbl_inbox.setText(
+            "{files:,} files, {lines:,} submissions: {OK:,} OK, {NO:,} wrong, "
+            "{--:,} unchecked, {ER:,} bad".format(**self._inbox_totals))
+
+    def cb_inbox_error(self, msg):
+        """ The inbox couldn't be watched. """
+        self.lbl_inbox.setText("Error: {0:s}".format(msg))
+
+    def closeEvent(self, event):
+        """ Stop the inbox worker before the window goes away. """
+        # pylint: disable=invalid-name
+        # Reason: Qt's naming.
+        if self.inbox is not None:
+            self.inbox.stop()
+        super().closeEvent(event)
+
     def init_win(self):
         """ Populate the widgets and show the window. """
         # Set the size and title bar.
-        self.setWindowTitle('March 2021 Challenge KeyGenMe Generator')
+        name = SCHEDULES[self.month]["name"]
+        self.setWindowTitle(f'{name} Challenge KeyGenMe Generator')
         self.setGeometry(300, 300, 425, 125)
 
         # Create the main VBox Layout container
@@ -218,13 +410,76 @@ class KeyGenUI(QWidget):
         # Add the HBox to the main VBox Layout.
         vbox.addLayout(hbox)
 
+        # If there's an inbox, add a view of its results and totals.
+        if self.inbox is not None:
+            self.setGeometry(300, 300, 700, 500)
+            self.lbl_inbox = QLabel("Watching {0:s}".format(self.inbox.worker.inbox))
+            vbox.addWidget(self.lbl_inbox)
+            self.txt_results = QPlainTextEdit()
+            self.txt_results.setReadOnly(True)
+            self.txt_results.setLineWrapMode(QPlainTextEdit.NoWrap)
+            vbox.addWidget(self.txt_results, 1)
+            self._inbox_lines = deque(maxlen=self.INBOX_LINES)
+            self._inbox_new = 0
+            self._inbox_totals = None
+            self.tmr_inbox = QTimer(self)
+            self.tmr_inbox.setSingleShot(True)
+            self.tmr_inbox.setInterval(self.INBOX_REFRESH_MS)
+            self.tmr_inbox.timeout.connect(self.cb_inbox_refresh)
+            self.inbox.results.connect(self.cb_inbox_results)
+            self.inbox.error.connect(self.cb_inbox_error)
+
         # Set the VBox as the window layout and show the window.
         self.setLayout(vbox)
         self.show()
 
 def main():
     """ Main Application Logic. """
-    if len(sys.argv) == 1:
+    parser = argparse.ArgumentParser(
+        description="KeyGenMe key generator. Starts the GUI if no challenge is given.",
+        epilog="Example: %(prog)s 0cbc6611f5540bd0809a388dc95a615b",
+        add_help=False)
+    # -H has always been accepted for help too.
+    parser.add_argument("-h", "-H", "--help", action="help",
+                        help="show this help message and exit")
+    parser.add_argument("challenge", nargs="?", help="32 character hex challenge string")
+    parser.add_argument("-m", "--month", choices=months(), default=DEFAULT_MONTH,
+                        help="challenge month (default: %(default)s)")
+    parser.add_argument("-b", "--batch", metavar="FILE",
+                        help="generate keys for every challenge in FILE (one per line)")
+    parser.add_argument("--reference", action="store_true",
+                        help="use the hand-written March 2021 generator")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a per-phase timing breakdown")
+    parser.add_argument("--collapsed", metavar="FILE",
+                        help="with --profile, write collapsed stacks for flamegraphs")
+    parser.add_argument("--inbox", metavar="DIR",
+                        help="GUI mode: check every submission file dropped in DIR")
+    parser.add_argument("--inbox-output", metavar="FILE", default="inbox_results.txt",
+                        help="where inbox results are appended (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.profile:
+        KeyGen.profiler = PhaseProfiler()
+
+    if args.batch:
+        errors = 0
+        with open(args.batch, "r") as fd_in:
+            for line in fd_in:
+                challenge = line.strip()
+                if not challenge:
+                    continue
+                try:
+                    keygen = KeyGen(challenge, args.month, args.reference)
+                    print("{0:s} {1:s}".format(challenge, keygen.final_key))
+                except (ValueError, ZeroDivisionError) as err:
+                    print("{0:s} Error: {1:s}".format(challenge, str(err)))
+                    errors += 1
+        if _profile_report(args):
+            errors += 1
+        return 1 if errors else 0
+
+    if args.challenge is None:
         # Assume the User wants to run in GUI mode.
         print(" [*] Starting GUI...")
         signal.signal(signal.SIGINT, signal.SIG_DFL)
@@ -232,17 +487,36 @@ def main():
         # pylint: disable=unused-variable
         # Reason: Disable the unused-variable violations. The
         #         'gui' variable is required to start the UI instance.
-        gui = KeyGenUI()
+        try:
+            gui = KeyGenUI(args.month, args.inbox, args.inbox_output)
+        except ValueError as err:
+            print(" [!] {0:s}".format(str(err)))
+            return 1
         sys.exit(app.exec_())
-    elif sys.argv[1] in ("-h", "-H", "--help"):
-        print("\n [*] Usage: {0:s} [CHALLENGE STRING]".format(sys.argv[0]))
-        print(" [*] Example: {0:s} 0cbc6611f5540bd0809a388dc95a615b".format(sys.argv[0]))
-        print("")
-        return 1
 
-    keygen = KeyGen(sys.argv[1])
+    keygen = KeyGen(args.challenge, args.month, args.reference)
     print(" [*] Challenge: {0:s}".format(keygen.challenge))
     print(" [*]  Key Code: {0:s}".format(keygen.final_key))
+    return _profile_report(args)
+
+def _profile_report(args):
+    """
+    Print (and optionally save) the profile if --profile was given.
+    Returns 1 if the collapsed stacks don't add up, else 0.
+    """
+    if KeyGen.profiler is None:
+        return 0
+    KeyGen.profiler.report(sys.stderr)
+    if args.collapsed:
+        written = KeyGen.profiler.write_collapsed(args.collapsed)
+        measured = KeyGen.profiler.measured_ns()
+        print(" [*] Collapsed stacks written to {0:s}".format(args.collapsed),
+              file=sys.stderr)
+        # Every nsec measured should be in exactly one stack's self time.
+        if written != measured:
+            print(" [!] Collapsed self times add up to {0:.2f} ms, but {1:.2f} ms "
+                  "was measured.".format(written / 1e6, measured / 1e6), file=sys.stderr)
+            return 1
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: keyschedule.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A registry of per-month key schedules for the KeyGenMe
+          challenges. Each schedule is described declaratively (which
+          num[i] terms get XOR'd/mod'd/added, which part[i][j]
+          characters are copied and which chunks are reversed) and is
+          compiled once into a specialized Python function, so a new
+          month's challenge is a new spec instead of a new class.
+
+          Run it directly with --bench to compare the compiled March 2021
+          engine against the hand-written one in keygen.py.
+"""
+import sys
+import time
+import string
+import random
+import argparse
+
+# NumPy is optional, it's only needed for the vectorized engines.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The character lookup table every schedule folds values into.
+INDEX = string.ascii_uppercase + string.digits
+
+# Arithmetic operators a schedule may use.
+OPERATORS = ("^", "%", "+")
+
+# A spec is a dict with:
+#   "name":   Human readable name for the UI.
+#   "chunks": A list of chunks, each a dict with:
+#       "terms":   A list of terms, each producing one key character.
+#                  ("chr", i, j) copies part[i][j] upper-cased. Anything
+#                  else is an expression looked up in INDEX, where an
+#                  expression is "n0".."n3" (num[0..3]), an int constant
+#                  or (op, expr, expr) with op in OPERATORS.
+#       "reverse": Optional, reverse the chunk's characters.
+MARCH_2021 = {
+    "name": "March 2021",
+    "chunks": [
+        {"terms": [("^", "n0", "n1"),
+                   ("^", "n0", "n2"),
+                   ("^", "n0", "n3"),
+                   ("^", "n3", "n1"),
+                   ("^", "n3", "n2")]},
+        {"terms": [("^", "n2", "n1"),
+                   ("+", ("^", "n0", "n1"), ("^", "n0", "n1")),
+                   ("+", ("^", "n1", "n2"), ("^", "n0", "n3")),
+                   ("+", ("^", "n1", "n0"), "n0"),
+                   ("+", ("^", "n0", "n2"), "n2")]},
+        {"terms": [("%", "n2", "n1"),
+                   ("%", "n0", "n3"),
+                   ("+", ("%", "n0", "n2"), 42),
+                   ("+", "n3", "n1"),
+                   ("%", "n1", "n3")]},
+        {"terms": [("chr", 0, 3),
+                   ("chr", 1, 1),
+                   ("chr", 2, 3),
+                   ("chr", 3, 3),
+                   ("chr", 3, 7)]},
+        {"terms": [("chr", 0, 7),
+                   ("chr", 1, 3),
+                   ("chr", 1, 3),
+                   ("chr", 2, 1),
+                   ("chr", 3, 3)],
+         "reverse": True}]}
+
+# Registered specs and their compiled engines, keyed by "YYYY-MM".
+SCHEDULES = {}
+ENGINES = {}
+RAW_ENGINES = {}
+VECTOR_ENGINES = {}
+
+# The month used when none is given.
+DEFAULT_MONTH = "2021-03"
+
+class _Compiler:
+    """
+    Turns the terms of a spec into Python source. Sub-expressions that
+    appear more than once (like num[0] ^ num[1] in March 2021) are
+    computed once into a temporary. The same expressions work on plain
+    ints and on NumPy arrays, so one compiler serves every mode.
+    """
+    def __init__(self):
+        """ Initalize the compiler state. """
+        self.used = set()
+        self.counts = {}
+        self.divisors = []
+        self.temps = {}
+        self.lines = []
+
+    def count(self, expr):
+        """ First pass: validate and count every sub-expression. """
+        if isinstance(expr, bool):
+            raise ValueError(f"invalid expression term: {expr!r}")
+        if isinstance(expr, int):
+            return
+        if isinstance(expr, str):
+            if len(expr) != 2 or expr[0] != "n" or expr[1] not in "0123":
+                raise ValueError(f"invalid number reference: {expr!r}")
+            self.used.add(int(expr[1]))
+            return
+        if isinstance(expr, tuple) and len(expr) == 3 and expr[0] in OPERATORS:
+            self.count(expr[1])
+            self.count(expr[2])
+            self.counts[expr] = self.counts.get(expr, 0) + 1
+            if expr[0] == "%" and expr[2] not in self.divisors:
+                self.divisors.append(expr[2])
+            return
+        raise ValueError(f"invalid expression: {expr!r}")
+
+    def emit(self, expr):
+        """ Second pass: return the source for an expression. """
+        if isinstance(expr, (int, str)):
+            return str(expr)
+        if expr in self.temps:
+            return self.temps[expr]
+        source = f"({self.emit(expr[1])} {expr[0]} {self.emit(expr[2])})"
+        if self.counts[expr] > 1:
+            name = f"t{len(self.temps)}"
+            self.lines.append(f"    {name} = {source}")
+            self.temps[expr] = name
+            return name
+        return source
+
+    @staticmethod
+    def is_chr(term):
+        """ Return True for a ("chr", i, j) term, validating it. """
+        if isinstance(term, tuple) and term and term[0] == "chr":
+            if len(term) != 3 or term[1] not in range(4) or term[2] not in range(8):
+                raise ValueError(f"invalid character term: {term!r}")
+            return True
+        return False
+
+    def term(self, term, mode):
+        """ Return the source producing one key character. """
+        if self.is_chr(term):
+            # part[i][j] is just challenge[8 * i + j].
+            pos = 8 * term[1] + term[2]
+            return f"u[:, {pos}]" if mode == "numpy" else f"u[{pos}]"
+        return f"_index[{self.emit(term)} % {len(INDEX)}]"
+
+def generate_source(spec, mode="str", func_name="engine"):
+    """
+    Generate the source of a specialized key function for a spec. Only
+    the num[i] values the spec reads are decoded, and reversed chunks
+    are reversed at compile time (every term is exactly one character,
+    so that's just the term order). The modes are:
+
+      "str":   f(challenge) -> key str. Takes a validated challenge.
+      "raw":   f(n0, n1, n2, n3, u) -> key bytes, from decoded ints and
+               the upper-cased challenge as bytes. No strings involved.
+      "numpy": f(n0, n1, n2, n3, u) -> (keys, bad) over uint64 arrays
+               and an (N, 32) uint8 array of upper-cased challenges.
+               'keys' is an (N, key_len) uint8 array and 'bad' flags rows
+               that would divide by zero (None if the spec never mods).
+    """
+    comp = _Compiler()
+    for chunk in spec["chunks"]:
+        if not chunk["terms"]:
+            raise ValueError("chunks need at least one term")
+        for term in chunk["terms"]:
+            if not comp.is_chr(term):
+                comp.count(term)
+
+    if mode == "str":
+        for idx in sorted(comp.used):
+            comp.lines.append(f"    n{idx} = int(c[{8 * idx}:{8 * idx + 8}], 16)")
+        comp.lines.append("    u = c.upper()")
+
+    chunks = []
+    for chunk in spec["chunks"]:
+        terms = [comp.term(term, mode) for term in chunk["terms"]]
+        if chunk.get("reverse"):
+            terms.reverse()
+        chunks.append(terms)
+
+    if mode == "str":
+        header = f"def {func_name}(c, _index=_INDEX):"
+        body = ["    return (" + " + '-' +\n            ".join(
+            " + ".join(terms) for terms in chunks) + ")"]
+    elif mode == "raw":
+        header = f"def {func_name}(n0, n1, n2, n3, u, _index=_INDEX_BYTES):"
+        body = ["    return bytes((" + ", 45,\n                  ".join(
+            ", ".join(terms) for terms in chunks) + "))"]
+    elif mode == "numpy":
+        header = f"def {func_name}(n0, n1, n2, n3, u, _index=_INDEX_ARRAY, _np=_NP):"
+        width = sum(len(terms) for terms in chunks) + len(chunks) - 1
+        body = [f"    out = _np.empty((u.shape[0], {width}), _np.uint8)"]
+        col = 0
+        for terms in chunks:
+            if col:
+                body.append(f"    out[:, {col}] = 45")
+                col += 1
+            for term in terms:
+                body.append(f"    out[:, {col}] = {term}")
+                col += 1
+        if comp.divisors:
+            checks = " | ".join(f"({comp.emit(div)} == 0)" for div in comp.divisors)
+            body.append(f"    return out, {checks}")
+        else:
+            body.append("    return out, None")
+    else:
+        raise ValueError(f"unknown mode: {mode!r}")
+
+    return "\n".join([header] + comp.lines + body) + "\n"
+
+def compile_spec(spec, month="spec", mode="str"):
+    """ Compile a spec into a key function. """
+    source = generate_source(spec, mode)
+    namespace = {"_INDEX": INDEX,
+                 "_INDEX_BYTES": INDEX.encode("ascii"),
+                 "_INDEX_ARRAY": None,
+                 "_NP": numpy}
+    if numpy is not None:
+        namespace["_INDEX_ARRAY"] = numpy.frombuffer(INDEX.encode("ascii"), numpy.uint8)
+    exec(compile(source, f"<keyschedule {month} {mode}>", "exec"), namespace)  # pylint: disable=exec-used
+    engine = namespace["engine"]
+    engine.source = source
+    engine.spec_name = spec["name"]
+    return engine
+
+def register(month, spec):
+    """ Register (and compile) the key schedule for a challenge month. """
+    ENGINES[month] = compile_spec(spec, month)
+    RAW_ENGINES[month] = compile_spec(spec, month, "raw")
+    if numpy is not None:
+        VECTOR_ENGINES[month] = compile_spec(spec, month, "numpy")
+    SCHEDULES[month] = spec
+
+def get_engine(month=None):
+    """ Return the compiled key function for a challenge month. """
+    month = month or DEFAULT_MONTH
+    try:
+        return ENGINES[month]
+    except KeyError:
+        raise ValueError(f"no key schedule registered for {month}") from None
+
+def get_raw_engine(month=None):
+    """
+    Return the key function for a month that works on decoded ints,
+    see generate_source().
+    """
+    get_engine(month)
+    return RAW_ENGINES[month or DEFAULT_MONTH]
+
+def get_vector_engine(month=None):
+    """
+    Return the NumPy key function for a month, or None if NumPy isn't
+    installed. See generate_source().
+    """
+    get_engine(month)
+    return VECTOR_ENGINES.get(month or DEFAULT_MONTH)
+
+def months():
+    """ Return the registered months, oldest first. """
+    return sorted(SCHEDULES)
+
+register("2021-03", MARCH_2021)
+
+def random_challenge(rng=random):
+    """ Return a random 32 character hex challenge. """
+    return "".join(rng.choice("0123456789abcdef") for _ in range(32))
+
+def bench(count):
+    """
+    Check the compiled March 2021 engine against the hand-written one
+    and time both over 'count' random challenges.
+    """
+    # pylint: disable=import-outside-toplevel
+    # Reason: keygen imports this module.
+    from keygen import KeyGen
+
+    rng = random.Random(0)
+    challenges = [random_challenge(rng) for _ in range(count)]
+    engine = get_engine("2021-03")
+
+    # The hand-written generator mods by num[1], num[2] and num[3].
+    challenges = [chall for chall in challenges
+                  if all(int(chall[idx:idx + 8], 16) for idx in (8, 16, 24))]
+
+    # Hand-written: split, decode and generate through the methods.
+    keygen = KeyGen(challenges[0])
+    start = time.perf_counter()
+    expected = []
+    for chall in challenges:
+        keygen.challenge = chall
+        keygen.part = []
+        keygen.num = []
+        keygen.split_string_parts()
+        keygen.get_number_parts()
+        expected.append(keygen.gen_key_march_2021())
+    hand = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = [engine(chall) for chall in challenges]
+    compiled = time.perf_counter() - start
+
+    if got != expected:
+        print(" [!] Compiled engine does not match the hand-written one!")
+        return 1
+
+    print(f" [*] {len(challenges)} challenges, keys match.")
+    print(f" [*] Hand-written: {hand / len(challenges) * 1e6:7.2f} us/key")
+    print(f" [*] Compiled:     {compiled / len(challenges) * 1e6:7.2f} us/key")
+    print(f" [*] Speedup: {hand / compiled:.2f}x")
+    return 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="KeyGenMe key schedules.")
+    parser.add_argument("--bench", type=int, nargs="?", const=200000,
+                        metavar="COUNT",
+                        help="benchmark compiled vs hand-written March 2021")
+    parser.add_argument("--source", metavar="MONTH",
+                        help="print the generated source for a month")
+    parser.add_argument("--mode", choices=("str", "raw", "numpy"), default="str",
+                        help="engine flavour for --source (default: str)")
+    args = parser.parse_args()
+
+    if args.source:
+        print(generate_source(SCHEDULES[args.source], args.mode))
+        return 0
+    if args.bench:
+        return bench(args.bench)
+
+    for month in months():
+        print(f" [*] {month}: {SCHEDULES[month]['name']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
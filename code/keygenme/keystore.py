@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: keystore.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: Bulk challenge issuance. Generates N cryptographically random
+          challenges, computes their keys in the same pass and writes
+          fixed-width challenge/key records into a memory-mapped store.
+          Verification later maps the store and reads records in place
+          without copying them. Records are written through a sliding
+          mmap window so memory use stays flat no matter how many
+          records are issued.
+
+          After the records comes an index: every record number, sorted
+          by challenge. Lookups bisect it, so finding a challenge reads
+          about log2(N) records instead of scanning the store. The index
+          is built with a counting sort on the first two challenge bytes
+          (counted while issuing) and a sort of each of those buckets,
+          which are small because the challenges are random.
+
+ Usage:   keystore.py issue 10000000 -o march.kgs
+          keystore.py info march.kgs
+          keystore.py lookup march.kgs 0cbc6611f5540bd0809a388dc95a615b
+          keystore.py verify march.kgs 0cbc6611f5540bd0809a388dc95a615b JUKT8-...
+"""
+import os
+import sys
+import mmap
+import time
+import array
+import string
+import struct
+import argparse
+from keyschedule import (DEFAULT_MONTH, get_engine, months)
+
+# Header: magic, version, record size, key width, record count, offset
+# of the first record, month, offset of the index.
+MAGIC = b"KGST"
+VERSION = 2
+HEADER = struct.Struct("<4sHHHQQ7sxQ")
+
+# Index entries are record numbers as uint64.
+INDEX_TYPE = "Q"
+INDEX_WIDTH = 8
+
+# Index buckets: the first 4 hex characters of the challenge.
+BUCKET_CHARS = 4
+
+# Challenges are 32 hex characters.
+CHALLENGE_WIDTH = 32
+
+# Records generated per mmap window. A multiple of the allocation
+# granularity so every window can be mapped at its own offset.
+CHUNK_RECORDS = 65536
+
+class KeyStore:
+    """
+    A read-only view of a key store file. The whole file is mapped and
+    records are handed out as memoryview slices of the mapping, so
+    nothing is copied until the caller asks for it.
+    """
+    def __init__(self, path):
+        """ Map the store and read its header. """
+        self.path = path
+        self._fd = open(path, "rb")
+        self._map = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.record_size, self.key_width, self.count,
+         self.data_offset, month, index_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} key store")
+        self.month = month.decode("ascii")
+        self._view = memoryview(self._map)
+        self._index = self._view[index_offset:
+                                 index_offset + self.count * INDEX_WIDTH].cast(INDEX_TYPE)
+
+    def __len__(self):
+        """ Number of records in the store. """
+        return self.count
+
+    def record(self, idx):
+        """ Return (challenge, key) for a record as memoryviews. """
+        if not 0 <= idx < self.count:
+            raise IndexError("record index out of range")
+        offset = self.data_offset + idx * self.record_size
+        return (self._view[offset:offset + CHALLENGE_WIDTH],
+                self._view[offset + CHALLENGE_WIDTH:
+                           offset + CHALLENGE_WIDTH + self.key_width])
+
+    def _challenge_at(self, idx):
+        """ Return the challenge of a record as bytes. """
+        offset = self.data_offset + idx * self.record_size
+        return self._map[offset:offset + CHALLENGE_WIDTH]
+
+    def find(self, challenge):
+        """
+        Return the record index of a challenge, or None. Bisects the
+        sorted index. Raises ValueError if the challenge isn't 32 hex
+        characters.
+        """
+        needle = _challenge_bytes(challenge)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._challenge_at(self._index[mid]) < needle:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._challenge_at(self._index[low]) == needle:
+            return self._index[low]
+        return None
+
+    def key_for(self, challenge):
+        """ Return the stored key for a challenge, or None. """
+        idx = self.find(challenge)
+        if idx is None:
+            return None
+        return self.record(idx)[1].tobytes().decode("ascii")
+
+    def verify(self, challenge, key):
+        """ Return True if 'key' is the stored key for 'challenge'. """
+        stored = self.key_for(challenge)
+        return stored is not None and stored == key.strip().upper()
+
+    def close(self):
+        """ Unmap and close the store. """
+        if getattr(self, "_index", None) is not None:
+            self._index.release()
+            self._index = None
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        try:
+            self._map.close()
+        except BufferError:
+            # The caller still holds record views. The mapping goes
+            # away once the last of them is released.
+            pass
+        self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _challenge_bytes(challenge):
+    """
+    Return a challenge as the lower-case ASCII bytes it is stored as.
+    Raises ValueError if it isn't 32 hex characters.
+    """
+    if not isinstance(challenge, str) or len(challenge) != CHALLENGE_WIDTH:
+        raise ValueError(f"challenge must be {CHALLENGE_WIDTH} characters long.")
+    if any(char not in string.hexdigits for char in challenge):
+        raise ValueError("Invalid character in challenge string.")
+    return challenge.lower().encode("ascii")
+
+def _record_size(key_width):
+    """ Round a record up to a multiple of 16 bytes. """
+    return (CHALLENGE_WIDTH + key_width + 15) // 16 * 16
+
+def issue(path, count, month=None, progress=None):
+    """
+    Issue 'count' random challenges with their keys into a new store,
+    followed by its index. Challenges that would make the key schedule
+    divide by zero (a num part of 00000000) are redrawn, since KeyGen
+    can't answer them. 'progress' is called with the number of records
+    written so far. Returns the number of records written.
+    """
+    month = month or DEFAULT_MONTH
+    engine = get_engine(month)
+    key_width = len(engine("1" * CHALLENGE_WIDTH))
+    record_size = _record_size(key_width)
+    padding = b"\0" * (record_size - CHALLENGE_WIDTH - key_width)
+
+    # The header gets its own page so every record window can be
+    # mapped at an aligned offset.
+    data_offset = mmap.ALLOCATIONGRANULARITY
+    index_offset = data_offset + count * record_size
+    chunk = CHUNK_RECORDS
+    buckets = [0] * (16 ** BUCKET_CHARS)
+    with open(path, "wb+") as fd_out:
+        fd_out.truncate(index_offset + count * INDEX_WIDTH)
+        fd_out.write(HEADER.pack(MAGIC, VERSION, record_size, key_width, count,
+                                 data_offset, month.encode("ascii"), index_offset))
+
+        written = 0
+        while written < count:
+            todo = min(chunk, count - written)
+            raw = os.urandom(16 * todo).hex()
+            records = []
+            for idx in range(todo):
+                chall = raw[idx * 32:idx * 32 + 32]
+                while True:
+                    try:
+                        key = engine(chall)
+                        break
+                    except ZeroDivisionError:
+                        chall = os.urandom(16).hex()
+                buckets[int(chall[:BUCKET_CHARS], 16)] += 1
+                records.append(chall.encode("ascii") + key.encode("ascii") + padding)
+
+            window = mmap.mmap(fd_out.fileno(), todo * record_size,
+                               offset=data_offset + written * record_size)
+            window[:] = b"".join(records)
+            window.flush()
+            window.close()
+
+            written += todo
+            if progress:
+                progress(written)
+
+        _write_index(fd_out, count, data_offset, record_size, index_offset, buckets)
+    return written
+
+def _write_index(fd_out, count, data_offset, record_size, index_offset, buckets):
+    """
+    Write the index: every record number, sorted by challenge. 'buckets'
+    is the number of challenges per bucket. Record numbers are placed
+    in their bucket's slots, then each bucket is sorted.
+    """
+    if count == 0:
+        return
+    store = mmap.mmap(fd_out.fileno(), 0)
+    view = memoryview(store)
+    index = view[index_offset:index_offset + count * INDEX_WIDTH].cast(INDEX_TYPE)
+
+    # Start of each bucket's slots.
+    starts = []
+    total = 0
+    for size in buckets:
+        starts.append(total)
+        total += size
+    fill = list(starts)
+    for idx in range(count):
+        offset = data_offset + idx * record_size
+        bucket = int(store[offset:offset + BUCKET_CHARS], 16)
+        index[fill[bucket]] = idx
+        fill[bucket] += 1
+
+    def challenge_at(idx):
+        offset = data_offset + idx * record_size
+        return store[offset:offset + CHALLENGE_WIDTH]
+
+    for start, size in zip(starts, buckets):
+        if size > 1:
+            index[start:start + size] = array.array(
+                INDEX_TYPE, sorted(index[start:start + size], key=challenge_at))
+
+    index.release()
+    view.release()
+    store.flush()
+    store.close()
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Bulk challenge issuance and key store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("issue", help="issue N random challenges with keys")
+    cmd.add_argument("count", type=int, help="number of challenges")
+    cmd.add_argument("-o", "--output", required=True, help="store file to write")
+    cmd.add_argument("-m", "--month", choices=months(), default=DEFAULT_MONTH,
+                     help="challenge month (default: %(default)s)")
+
+    cmd = sub.add_parser("info", help="show a store's header")
+    cmd.add_argument("store")
+
+    cmd = sub.add_parser("lookup", help="print the key for a challenge")
+    cmd.add_argument("store")
+    cmd.add_argument("challenge")
+
+    cmd = sub.add_parser("verify", help="check a submitted key")
+    cmd.add_argument("store")
+    cmd.add_argument("challenge")
+    cmd.add_argument("key")
+    args = parser.parse_args()
+
+    if args.command == "issue":
+        start = time.perf_counter()
+
+        def progress(done):
+            rate = done / (time.perf_counter() - start)
+            print(f"\r [*] {done:,}/{args.count:,} records ({rate:,.0f} records/sec)",
+                  end="", file=sys.stderr, flush=True)
+
+        written = issue(args.output, args.count, args.month, progress)
+        elapsed = time.perf_counter() - start
+        print("", file=sys.stderr)
+        print(f" [*] Issued {written:,} challenges to {args.output} in {elapsed:.2f} s "
+              f"({written / elapsed:,.0f} records/sec)")
+        return 0
+
+    with KeyStore(args.store) as store:
+        if args.command != "info":
+            try:
+                _challenge_bytes(args.challenge)
+            except ValueError as err:
+                print(f" [!] {err}")
+                return 1
+
+        if args.command == "info":
+            print(f" [*] Store:   {args.store}")
+            print(f" [*] Month:   {store.month}")
+            print(f" [*] Records: {len(store):,} x {store.record_size} bytes")
+            return 0
+
+        if args.command == "lookup":
+            key = store.key_for(args.challenge)
+            if key is None:
+                print(" [!] Challenge not found.")
+                return 1
+            print(f" [*] Challenge: {args.challenge}")
+            print(f" [*]  Key Code: {key}")
+            return 0
+
+        if store.find(args.challenge) is None:
+            print(" [!] Challenge not found.")
+            return 1
+        if store.verify(args.challenge, args.key):
+            print(" [*] Key is correct.")
+            return 0
+        print(" [!] Key is NOT correct.")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
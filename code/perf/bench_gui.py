@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: bench_gui.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A headless benchmark suite for every GUI in the repo. Runs
+          under the offscreen QPA platform and measures construction
+          time, time to first paint, per-click latency, timer tick cost
+          and memory per instance. Results are written as JSON and
+          compared against a stored baseline; any regression, or a
+          missing baseline, makes the run exit non-zero. Baselines are
+          machine specific, so none is committed: save one with
+          --save-baseline before comparing, or pass --no-compare to
+          only measure.
+"""
+import os
+import io
+import sys
+import json
+import time
+import signal
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from statistics import median
+
+# This has to be set before the QApplication is created.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=no-name-in-module,wrong-import-position
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist. The environment has to be set up before import.
+from PyQt5.QtCore import (Qt, QObject, QEvent)
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton)
+import toys
+
+# Default location of the stored baseline.
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "baseline.json")
+
+# A valid challenge so the KeyGenUI click does real work.
+CHALLENGE = "0cbc6611f5540bd0809a388dc95a615b"
+
+# Metrics smaller than these (in their own units) are treated as noise
+# when comparing against the baseline.
+NOISE_FLOOR = {"construct_ms": 0.5,
+               "first_paint_ms": 1.0,
+               "click_ms": 0.5,
+               "tick_us": 20.0,
+               "rss_kb": 256.0,
+               "py_kb": 16.0}
+
+class _PaintWatcher(QObject):
+    """ Event filter that records when a widget is first painted. """
+    def __init__(self):
+        """ Initalize the class. """
+        super().__init__()
+        self.painted_at = None
+
+    def eventFilter(self, obj, event):
+        """ Record the first paint event. """
+        if event.type() == QEvent.Paint and self.painted_at is None:
+            self.painted_at = time.perf_counter()
+        return False
+
+def _rss_kb():
+    """ Return the resident set size of this process in KB. """
+    try:
+        with open("/proc/self/statm", "r") as fd_in:
+            pages = int(fd_in.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError):
+        # Not Linux, fall back to the peak RSS.
+        # pylint: disable=import-outside-toplevel
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def _dispose(app, widget):
+    """ Close and delete a widget, then flush the deletion. """
+    widget.close()
+    widget.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+def bench_construct(app, name, repeat):
+    """
+    Measure window construction and time to first paint in msecs.
+    Construction stops when __init__ returns (all of these call show()
+    themselves); first paint is when the window gets its Paint event.
+    """
+    construct = []
+    first_paint = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        widget = toys.create(name)
+        built = time.perf_counter()
+
+        watcher = _PaintWatcher()
+        widget.installEventFilter(watcher)
+        while watcher.painted_at is None and time.perf_counter() - start < 5:
+            app.processEvents()
+
+        construct.append((built - start) * 1000)
+        if watcher.painted_at is not None:
+            first_paint.append((watcher.painted_at - start) * 1000)
+        widget.removeEventFilter(watcher)
+        _dispose(app, widget)
+
+    return {"construct_ms": median(construct),
+            "first_paint_ms": median(first_paint) if first_paint else None}
+
+def bench_clicks(app, name, repeat):
+    """
+    Measure the latency of clicking every button in a window. This is
+    the time for QTest to deliver the click plus the events it posts.
+    """
+    widget = toys.create(name)
+    app.processEvents()
+
+    if name == "keygen":
+        widget.txt_chall.setText(CHALLENGE)
+
+    results = {}
+    skip = toys.skip_buttons(name)
+    for btn in widget.findChildren(QPushButton):
+        label = btn.text().replace("&", "")
+        if label in skip or not btn.isEnabled():
+            continue
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            QTest.mouseClick(btn, Qt.LeftButton)
+            app.processEvents()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        # A few windows have more than one button with the same text.
+        key = label
+        count = 2
+        while key in results:
+            key = f"{label} #{count}"
+            count += 1
+        results[key] = median(samples)
+
+    _dispose(app, widget)
+    return {"click_ms": results}
+
+def bench_ticks(app, name, repeat):
+    """
+    Measure the cost of a single timer tick in usecs. Any widget in the
+    window with a '_cb_update_time' slot (the stopwatches) is started
+    and then ticked directly so timer jitter doesn't leak in.
+    """
+    widget = toys.create(name)
+    app.processEvents()
+
+    tickers = [obj for obj in [widget] + widget.findChildren(QWidget)
+               if hasattr(obj, "_cb_update_time")]
+    if not tickers:
+        _dispose(app, widget)
+        return {"tick_us": None}
+
+    samples = []
+    for ticker in tickers:
+        ticker.btn_start.click()
+        # v1 stopwatches own a timer, v2 ones share a TickScheduler's.
+        timer = getattr(ticker, "timer", None) or ticker.scheduler.timer
+        timer.stop()
+        for _ in range(repeat * 100):
+            start = time.perf_counter()
+            ticker._cb_update_time()    # pylint: disable=protected-access
+            app.processEvents()
+            samples.append((time.perf_counter() - start) * 1e6)
+
+    _dispose(app, widget)
+    return {"tick_us": median(samples)}
+
+def bench_memory(app, name, instances):
+    """
+    Measure the memory cost of one instance in KB, both as process RSS
+    and as Python heap allocations tracked by tracemalloc.
+    """
+    # Warm up once so import-time and first-use allocations don't count.
+    _dispose(app, toys.create(name))
+
+    tracemalloc.start()
+    rss_before = _rss_kb()
+    py_before = tracemalloc.get_traced_memory()[0]
+    widgets = [toys.create(name) for _ in range(instances)]
+    app.processEvents()
+    rss_after = _rss_kb()
+    py_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    for widget in widgets:
+        _dispose(app, widget)
+
+    return {"rss_kb": (rss_after - rss_before) / instances,
+            "py_kb": (py_after - py_before) / 1024 / instances}
+
+def run(app, names, repeat, instances):
+    """ Run every benchmark against the named toys. """
+    results = {}
+    for name in names:
+        print(f" [*] Benchmarking {name}...", file=sys.stderr)
+        # Some of the toys print debug output when clicked; keep it
+        # out of our report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = {}
+            result.update(bench_construct(app, name, repeat))
+            result.update(bench_clicks(app, name, repeat))
+            result.update(bench_ticks(app, name, repeat))
+            result.update(bench_memory(app, name, instances))
+        results[name] = result
+    return results
+
+def _flatten(results):
+    """ Flatten results into {"toy.metric[.button]": value}. """
+    flat = {}
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            if isinstance(value, dict):
+                for sub, sub_value in value.items():
+                    flat[(name, metric, sub)] = sub_value
+            elif value is not None:
+                flat[(name, metric, None)] = value
+    return flat
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline. Returns a list of regression
+    messages; a metric regresses if it grew by more than 'tolerance'
+    (a fraction) and by more than that metric's noise floor.
+    """
+    regressions = []
+    current = _flatten(results)
+    for key, base in _flatten(baseline).items():
+        value = current.get(key)
+        if value is None:
+            continue
+        floor = NOISE_FLOOR.get(key[1], 0)
+        if value > base * (1 + tolerance) and value - base > floor:
+            label = ".".join(part for part in key if part)
+            regressions.append(f"{label}: {base:.3f} -> {value:.3f} "
+                               f"(+{(value / base - 1) * 100 if base else 0:.0f}%)")
+    return regressions
+
+def print_report(results):
+    """ Print a human readable table of the results. """
+    print(f"{'toy':12s} {'build ms':>9s} {'paint ms':>9s} {'click ms':>9s} "
+          f"{'tick us':>9s} {'rss KB':>9s} {'py KB':>9s}")
+    for name, res in results.items():
+        clicks = res["click_ms"].values()
+        worst_click = max(clicks) if clicks else None
+        cols = [res["construct_ms"], res["first_paint_ms"], worst_click,
+                res["tick_us"], res["rss_kb"], res["py_kb"]]
+        print(f"{name:12s} " + " ".join("        -" if col is None
+                                         else f"{col:9.2f}" for col in cols))
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Headless GUI benchmarks.")
+    parser.add_argument("toys", nargs="*", metavar="TOY",
+                        help="toys to benchmark: {0:s} (default: all)".format(
+                            ", ".join(toys.TOYS)))
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("-b", "--baseline", default=BASELINE,
+                        help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--no-compare", action="store_true",
+                        help="only measure, don't check against a baseline")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("-r", "--repeat", type=int, default=10,
+                        help="samples per measurement (default: 10)")
+    parser.add_argument("-n", "--instances", type=int, default=20,
+                        help="instances for the memory test (default: 20)")
+    args = parser.parse_args()
+    for name in args.toys:
+        if name not in toys.TOYS:
+            parser.error(f"unknown toy: {name}")
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # pylint: disable=unused-variable
+    # Reason: The QApplication has to stay alive for the whole run.
+    app = QApplication(sys.argv[:1])
+    names = args.toys or list(toys.TOYS)
+    results = run(app, names, args.repeat, args.instances)
+    report = {"meta": {"python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "qpa": os.environ["QT_QPA_PLATFORM"],
+                       "repeat": args.repeat,
+                       "instances": args.instances},
+              "results": results}
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as fd_out:
+            json.dump(report, fd_out, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as fd_out:
+            json.dump(report, fd_out, indent=2)
+        print(f" [*] Baseline saved to {args.baseline}")
+        return 0
+
+    if args.no_compare:
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f" [!] No baseline at {args.baseline}, use --save-baseline to create one"
+              " (or --no-compare to only measure).")
+        return 1
+
+    with open(args.baseline, "r") as fd_in:
+        baseline = json.load(fd_in)["results"]
+    missing = [name for name in names if name not in baseline]
+    if missing:
+        print(f" [!] Not in the baseline: {', '.join(missing)}, use --save-baseline"
+              " to update it.")
+        return 1
+    regressions = compare({name: results[name] for name in names},
+                          {name: baseline[name] for name in names},
+                          args.tolerance)
+    if regressions:
+        print(" [!] Regressions against baseline:")
+        for msg in regressions:
+            print(f"     {msg}")
+        return 1
+
+    print(" [*] No regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
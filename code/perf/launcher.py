@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: launcher.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A single-instance launcher for every GUI in the repo. The first
+          launch starts a QApplication and a QLocalServer. Later launches
+          only import QtCore/QtNetwork, connect with a QLocalSocket, hand
+          over the toys to open and exit. The running process opens the
+          windows, so they all share one interpreter, QApplication, font
+          cache and style. When the last window is closed the server
+          shuts down.
+
+          Only launches made through this script are shared. Running
+          all_in_one_v1.py, keygen.py or any other toy script directly
+          still starts its own process, since those keep their own
+          command line options (keygen.py's --month, --inbox, ...) that
+          a window opened here doesn't take.
+
+ Usage:   launcher.py allinone keygen
+          launcher.py --bench
+"""
+import os
+import sys
+import json
+import time
+import getpass
+import signal
+import argparse
+import subprocess
+from statistics import median
+
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import Qt
+from PyQt5.QtNetwork import (QLocalServer, QLocalSocket)
+import toys
+
+# One server per user so kiosk accounts don't share windows.
+SERVER_NAME = f"pyqt-toys-{getpass.getuser()}"
+
+# How long a client waits for a running instance before starting its own.
+CONNECT_TIMEOUT_MS = 250
+
+# How long a client waits for the running instance to open the windows.
+REPLY_TIMEOUT_MS = 10000
+
+def send_to_running(names, server=SERVER_NAME):
+    """
+    Ask a running instance to open 'names'. Returns its reply (a dict)
+    or None if there is no running instance.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(server)
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+
+    sock.write(json.dumps({"open": names, "pid": os.getpid()}).encode("utf-8") + b"\n")
+    sock.waitForBytesWritten(CONNECT_TIMEOUT_MS)
+    while not sock.canReadLine():
+        if not sock.waitForReadyRead(REPLY_TIMEOUT_MS):
+            return None
+    reply = json.loads(bytes(sock.readLine()).decode("utf-8"))
+    sock.disconnectFromServer()
+    return reply
+
+class Launcher:
+    """
+    Owns the shared QApplication's toy windows and the local server that
+    later launches talk to.
+    """
+    def __init__(self, app, server=SERVER_NAME):
+        """ Initalize the class. """
+        self.app = app
+        self.name = server
+        self.windows = {}
+        self.server = QLocalServer()
+        self.server.newConnection.connect(self._new_connection)
+
+    def listen(self):
+        """
+        Start listening. If the name is taken, the socket is only
+        removed if connecting to it is refused (left behind by a crashed
+        instance). Returns False if a live instance holds it, e.g. one
+        that won a race with this launch.
+        """
+        if self.server.listen(self.name):
+            return True
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.disconnectFromServer()
+            return False
+        if probe.error() not in (QLocalSocket.ConnectionRefusedError,
+                                 QLocalSocket.ServerNotFoundError):
+            # Busy or unreachable, but not stale. Leave it alone.
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def open(self, names):
+        """
+        Open a window for each toy in 'names'. Returns the toys that
+        were opened and any errors.
+        """
+        opened = []
+        errors = []
+        for name in names:
+            if name not in toys.TOYS:
+                errors.append(f"unknown toy: {name}")
+                continue
+            # pylint: disable=broad-except
+            # Reason: A broken toy shouldn't take every other window
+            #         in the shared process down with it.
+            try:
+                win = toys.create(name)
+            except Exception as err:
+                errors.append(f"{name}: {err}")
+                continue
+            key = id(win)
+            self.windows[key] = win
+            win.destroyed.connect(lambda _obj=None, key=key: self.windows.pop(key, None))
+            win.setAttribute(Qt.WA_DeleteOnClose)
+            win.show()
+            if self.app.platformName() != "offscreen":
+                win.raise_()
+                win.activateWindow()
+            opened.append(name)
+        return opened, errors
+
+    def _new_connection(self):
+        """ A later launch connected. Read its request when it arrives. """
+        sock = self.server.nextPendingConnection()
+        sock.readyRead.connect(lambda: self._read_request(sock))
+        sock.disconnected.connect(sock.deleteLater)
+
+    def _read_request(self, sock):
+        """ Open the requested windows and reply once they've painted. """
+        if not sock.canReadLine():
+            return
+        start = time.perf_counter()
+        try:
+            request = json.loads(bytes(sock.readLine()).decode("utf-8"))
+            opened, errors = self.open(request.get("open", []))
+        except ValueError as err:
+            opened, errors = [], [f"bad request: {err}"]
+        # Let the new windows lay out and paint before replying, so the
+        # client's timing covers the whole launch.
+        self.app.processEvents()
+        reply = {"opened": opened, "errors": errors,
+                 "open_ms": (time.perf_counter() - start) * 1000,
+                 "windows": len(self.windows), "pid": os.getpid()}
+        sock.write(json.dumps(reply).encode("utf-8") + b"\n")
+        sock.flush()
+
+def rss_kb(pid):
+    """ Return (rss, pss) in KB for a process, from /proc (Linux only). """
+    rss = pss = None
+    try:
+        with open(f"/proc/{pid}/status", "r") as fd_in:
+            for line in fd_in:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1])
+        with open(f"/proc/{pid}/smaps_rollup", "r") as fd_in:
+            for line in fd_in:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+def _start(args, env):
+    """ Start a launcher process and wait for it to report READY. """
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__)] + args,
+                            stdout=subprocess.PIPE, env=env, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("READY"):
+        proc.kill()
+        raise RuntimeError(f"launcher didn't start: {line!r}")
+    return proc, (time.perf_counter() - start) * 1000
+
+def _stop(procs):
+    """ Terminate benchmark processes. """
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        proc.wait()
+
+def bench(name, windows):
+    """
+    Compare cold launches (a new process per window) against warm ones
+    (handing the window to a running instance), in launch time and in
+    total memory with 'windows' windows open. The client total includes
+    starting the Python interpreter, the server side time doesn't.
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    server = f"{SERVER_NAME}-bench-{os.getpid()}"
+    env["PYQT_TOYS_SERVER"] = server
+
+    # Cold: a fresh interpreter, PyQt5 import and QApplication each time.
+    cold_ms = []
+    procs = []
+    try:
+        for _ in range(windows):
+            proc, elapsed = _start(["--standalone", "--ready", name], env)
+            procs.append(proc)
+            cold_ms.append(elapsed)
+        cold_mem = [rss_kb(proc.pid) for proc in procs]
+    finally:
+        _stop(procs)
+
+    # Warm: one server, every later launch is a thin client.
+    warm_ms = []
+    server_ms = []
+    procs = []
+    try:
+        proc, first_ms = _start(["--server", "--ready", name], env)
+        procs.append(proc)
+        for _ in range(windows - 1):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), name],
+                                 env=env, check=True, capture_output=True, text=True)
+            warm_ms.append((time.perf_counter() - start) * 1000)
+            server_ms.append(float(out.stdout.split(" in ")[1].split()[0]))
+        warm_mem = rss_kb(proc.pid)
+        window_count = send_to_running([], server)["windows"]
+    finally:
+        _stop(procs)
+        # A terminated server doesn't get to clean up its socket.
+        QLocalServer.removeServer(server)
+
+    def _total(mems, idx):
+        values = [mem[idx] for mem in mems]
+        return None if None in values else sum(values)
+
+    print(f" [*] Toy: {name} ({env['QT_QPA_PLATFORM']} QPA)")
+    print(f"     cold launch (new process):     median {median(cold_ms):8.1f} ms")
+    print(f"     first launch (starts server):         {first_ms:8.1f} ms")
+    print(f"     warm launch (client, total):   median {median(warm_ms):8.1f} ms")
+    print(f"     warm launch (server side):     median {median(server_ms):8.1f} ms")
+    print(f" [*] Memory with {windows} windows:")
+    for label, rss, pss in (("cold", _total(cold_mem, 0), _total(cold_mem, 1)),
+                            (f"warm ({window_count} windows)", warm_mem[0], warm_mem[1])):
+        text = "n/a" if rss is None else f"{rss / 1024:8.1f} MB RSS"
+        if pss is not None:
+            text += f"  {pss / 1024:8.1f} MB PSS"
+        print(f"     {label:30s} {text}")
+    return 0
+
+def _print_reply(reply):
+    """ Print a running instance's reply. Returns the exit code. """
+    print(" [*] Opened {0:s} in {1:.1f} ms (pid {2:d}, {3:d} windows)".format(
+        ", ".join(reply["opened"]) or "nothing", reply["open_ms"],
+        reply["pid"], reply["windows"]))
+    for error in reply["errors"]:
+        print(f" [!] {error}", file=sys.stderr)
+    return 1 if reply["errors"] else 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Single-instance launcher for the toys.")
+    parser.add_argument("toys", nargs="*", metavar="TOY",
+                        help="toys to open: {0:s}".format(", ".join(toys.TOYS)))
+    parser.add_argument("--standalone", action="store_true",
+                        help="don't look for or become a running instance")
+    parser.add_argument("--server", action="store_true",
+                        help="become the running instance even with no toys")
+    parser.add_argument("--bench", nargs="?", const="allinone", metavar="TOY",
+                        help="benchmark cold vs warm launches (default toy: allinone)")
+    parser.add_argument("-w", "--windows", type=int, default=10,
+                        help="windows for the --bench memory test (default: 10)")
+    # Used by --bench to know when a launch has finished.
+    parser.add_argument("--ready", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    for name in args.toys + ([args.bench] if args.bench else []):
+        if name not in toys.TOYS:
+            parser.error(f"unknown toy: {name}")
+
+    if args.bench:
+        return bench(args.bench, max(args.windows, 2))
+    if not args.toys and not args.server:
+        parser.error("at least one toy is required")
+
+    server = os.environ.get("PYQT_TOYS_SERVER", SERVER_NAME)
+    if not args.standalone and not args.server:
+        reply = send_to_running(args.toys, server)
+        if reply is not None:
+            return _print_reply(reply)
+
+    # Nothing running (or we were told not to look). Pay for the full
+    # PyQt5 import and become the instance everyone else talks to.
+    # pylint: disable=import-outside-toplevel
+    # Reason: Clients never need QtWidgets, skipping it is what makes
+    #         them cheap.
+    from PyQt5.QtWidgets import QApplication
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    app = QApplication(sys.argv[:1])
+    launcher = Launcher(app, server)
+    if not args.standalone and not launcher.listen():
+        # Another launch started an instance since we looked, hand the
+        # toys to it instead.
+        reply = send_to_running(args.toys, server) if args.toys else None
+        if reply is not None:
+            return _print_reply(reply)
+        print(f" [!] Couldn't listen on {server}: "
+              f"{launcher.server.errorString()}", file=sys.stderr)
+
+    for name in toys.TOYS:
+        toys.load_module(name)
+    opened, errors = launcher.open(args.toys)
+    for error in errors:
+        print(f" [!] {error}", file=sys.stderr)
+    if not opened and not args.server:
+        return 1
+
+    if args.server:
+        # Stay up for clients even with no windows open.
+        app.setQuitOnLastWindowClosed(False)
+    if args.ready:
+        app.processEvents()
+        print("READY", flush=True)
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
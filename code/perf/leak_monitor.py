@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: leak_monitor.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A memory and object leak monitor for toys that run all night
+          (the AllInOne game night kiosk). Every sample records the RSS,
+          the memory traced by tracemalloc and its top growing
+          allocation sites, live QObjects by class and QTimer counts
+          (all and active). Any of these that keeps growing across the
+          recent samples is flagged.
+
+          QObjects are found two ways: Python wrappers the garbage
+          collector knows about (this catches parentless objects like
+          the Stopwatch's QTimer()), and everything parented under the
+          application's top level widgets (this catches objects only
+          held by C++, like layouts). Parentless objects created and
+          held only by C++ can't be seen.
+
+          "run" starts a toy with the monitor attached. "soak" runs a
+          toy offscreen and simulates hours of kiosk use in minutes:
+          random clicks on every safe button, with the toy's active
+          timers fired in between as if the time had passed.
+
+ Usage:   leak_monitor.py run allinone --interval 300 --log kiosk.jsonl
+          leak_monitor.py soak allinone --hours 8
+"""
+import os
+import gc
+import math
+import sys
+import json
+import time
+import random
+import signal
+import argparse
+import linecache
+import tracemalloc
+import contextlib
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5 import sip
+from PyQt5.QtCore import (Qt, QObject, QTimer, QPoint, QEvent, pyqtSignal,
+                          qInstallMessageHandler)
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtWidgets import (QApplication, QAbstractButton)
+import toys
+
+# Smallest net growth that can be flagged, per metric. Anything not
+# listed (QObject and timer counts) is exact, so one is enough.
+GROWTH_FLOOR = {"rss_kb": 2048,
+                "py_kb": 256}
+
+def rss_kb():
+    """ Return the resident set size of this process in KB. """
+    try:
+        with open("/proc/self/statm", "r") as fd_in:
+            pages = int(fd_in.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        # Not Linux, fall back to the peak RSS.
+        # pylint: disable=import-outside-toplevel
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def live_qobjects(app):
+    """ Return every live QObject that can be found, keyed by C++ address. """
+    found = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, QObject) and not sip.isdeleted(obj):
+            found[sip.unwrapinstance(obj)] = obj
+    for top in app.topLevelWidgets() + [app]:
+        for obj in [top] + top.findChildren(QObject):
+            found.setdefault(sip.unwrapinstance(obj), obj)
+    return found
+
+def is_growing(values, floor):
+    """
+    True if a series grew by at least 'floor', never went down, and
+    went up in at least half of its steps. The allocator grows the RSS
+    in steps and then sits on a plateau; a leak keeps climbing.
+    """
+    if len(values) < 3 or values[-1] - values[0] < floor:
+        return False
+    steps = list(zip(values, values[1:]))
+    if any(after < before for before, after in steps):
+        return False
+    return sum(after > before for before, after in steps) * 2 >= len(steps)
+
+class LeakMonitor(QObject):
+    """
+    Samples memory and object counts every 'interval' seconds (or on
+    sample()) and flags anything that grew steadily over the last
+    'window' samples. The first 'warmup' samples are ignored, they
+    include first-use caches like fonts and style sheets.
+    """
+    # Emitted with each sample (dict).
+    sampled = pyqtSignal(object)
+
+    # Emitted with a list of (metric, first, last) for anything growing.
+    growth_flagged = pyqtSignal(list)
+
+    def __init__(self, app, interval=None, window=6, warmup=2, top=5,
+                 trace=True, log=None, parent=None):
+        """ Initalize the class. """
+        super().__init__(parent)
+        self.app = app
+        self.window = window
+        self.warmup = warmup
+        self.top = top
+        self.samples = []
+        self.flags = []
+        self.log = open(log, "a") if log else None
+        self.start = time.monotonic()
+        self._baseline = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        if interval:
+            self.timer.start(int(interval * 1000))
+
+    def _top_allocators(self):
+        """
+        Return the tracemalloc allocation sites that grew most since
+        the end of the warmup, as (file name, line, KB) tuples.
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")))
+        if self._baseline is None or len(self.samples) <= self.warmup:
+            self._baseline = snapshot
+            return []
+        result = []
+        for stat in snapshot.compare_to(self._baseline, "lineno")[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            result.append((frame.filename, frame.lineno, stat.size_diff // 1024))
+        return result
+
+    def sample(self, clock=None):
+        """
+        Take a sample now. 'clock' is the time to record it at in
+        seconds (the soak test's simulated time), default the real time
+        since the monitor started. Returns the sample.
+        """
+        gc.collect()
+        by_class = {}
+        timers = active = 0
+        for obj in live_qobjects(self.app).values():
+            name = type(obj).__name__
+            by_class[name] = by_class.get(name, 0) + 1
+            if isinstance(obj, QTimer) and obj is not self.timer:
+                timers += 1
+                active += obj.isActive()
+        # Don't count the monitor itself.
+        by_class[type(self).__name__] -= 1
+        by_class["QTimer"] -= 1
+
+        sample = {"t": time.monotonic() - self.start if clock is None else clock,
+                  "rss_kb": rss_kb(),
+                  "py_kb": (tracemalloc.get_traced_memory()[0] // 1024
+                            if tracemalloc.is_tracing() else 0),
+                  "qobjects": sum(by_class.values()),
+                  "timers": timers,
+                  "timers_active": active,
+                  "by_class": {name: count for name, count in by_class.items() if count},
+                  "top": self._top_allocators() if tracemalloc.is_tracing() else []}
+        self.samples.append(sample)
+        if self.log is not None:
+            self.log.write(json.dumps(sample) + "\n")
+            self.log.flush()
+        self.sampled.emit(sample)
+
+        flags = self.check()
+        if flags:
+            self.flags.append((sample["t"], flags))
+            self.growth_flagged.emit(flags)
+        return sample
+
+    def check(self):
+        """
+        Return (metric, first, last) for every metric that grew steadily
+        over the last 'window' samples after the warmup.
+        """
+        recent = self.samples[self.warmup:][-self.window:]
+        if len(recent) < self.window:
+            return []
+        flags = []
+        series = {name: [each[name] for each in recent]
+                  for name in ("rss_kb", "py_kb", "qobjects", "timers")}
+        for name in recent[-1]["by_class"]:
+            series[f"QObject {name}"] = [each["by_class"].get(name, 0) for each in recent]
+        for name, values in series.items():
+            if is_growing(values, GROWTH_FLOOR.get(name, 1)):
+                flags.append((name, values[0], values[-1]))
+        return flags
+
+    def close(self):
+        """ Stop sampling. """
+        self.timer.stop()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+def _fmt_time(seconds):
+    """ Format seconds as H:MM. """
+    return f"{int(seconds // 3600)}:{int(seconds % 3600 // 60):02d}"
+
+def print_sample(sample):
+    """ Print a one line summary of a sample. """
+    print(f" [*] {_fmt_time(sample['t'])}  RSS {sample['rss_kb']:,} KB  "
+          f"Python {sample['py_kb']:,} KB  QObjects {sample['qobjects']:,}  "
+          f"QTimers {sample['timers']} ({sample['timers_active']} active)", flush=True)
+
+def print_flags(flags):
+    """ Print what's growing. """
+    for name, first, last in flags:
+        print(f" [!] Growing: {name} {first:,} -> {last:,}")
+
+def print_report(monitor):
+    """ Print the final verdict with the top allocation sites. """
+    last = monitor.samples[-1]
+    if last["top"]:
+        print(" [*] Top growing allocation sites since the warmup:")
+        for filename, lineno, size_kb in last["top"]:
+            where = f"{os.path.basename(filename)}:{lineno}"
+            code = linecache.getline(filename, lineno).strip()
+            print(f"     {size_kb:8,} KB  {where:28s} {code}")
+    flags = monitor.check()
+    if not flags:
+        if monitor.flags:
+            print(f" [*] Growth flagged in {len(monitor.flags)} of {len(monitor.samples)} "
+                  "samples, but it levelled off.")
+        else:
+            print(" [*] No steady growth found.")
+        return 0
+    print(f" [!] Still growing over the last {monitor.window} samples:")
+    print_flags(flags)
+    return 1
+
+def toy_timers(root):
+    """
+    Return a toy's QTimers: its children, plus parentless ones held in
+    a 'timer' attribute (like Stopwatch.timer) by the window or any of
+    its children.
+    """
+    timers = {sip.unwrapinstance(timer): timer for timer in root.findChildren(QTimer)}
+    for obj in [root] + root.findChildren(QObject):
+        timer = getattr(obj, "timer", None)
+        if isinstance(timer, QTimer):
+            timers.setdefault(sip.unwrapinstance(timer), timer)
+    return list(timers.values())
+
+def _click(app, button):
+    """ Click a button the way a mouse would. """
+    centre = button.rect().center()
+    for etype, held in ((QEvent.MouseButtonPress, Qt.LeftButton),
+                        (QEvent.MouseButtonRelease, Qt.NoButton)):
+        app.sendEvent(button, QMouseEvent(etype, QPoint(centre), Qt.LeftButton,
+                                          Qt.MouseButtons(held), Qt.NoModifier))
+
+def _quiet_offscreen(_mode, _context, message):
+    """
+    Qt message handler for the soak test. The offscreen platform warns
+    on every window size change, which drowns out the report.
+    """
+    if "propagateSizeHints" not in message:
+        print(message, file=sys.stderr)
+
+def soak(app, toy, hours, clicks_per_min, ticks, sample_min, seed, log):
+    """
+    Simulate 'hours' of kiosk use as fast as possible: a random click
+    every 60 / clicks_per_min simulated seconds, with every active
+    timer of the toy fired 'ticks' times in between, and a sample every
+    'sample_min' simulated minutes. Returns the exit code.
+    """
+    rng = random.Random(seed)
+    qInstallMessageHandler(_quiet_offscreen)
+    root = toys.create(toy)
+    app.processEvents()
+    skip = toys.skip_buttons(toy)
+    buttons = [btn for btn in root.findChildren(QAbstractButton)
+               if btn.text().replace("&", "") not in skip]
+    # The first simulated hour fills caches (glyphs, style sheets) and
+    # the allocator's arenas, that isn't a leak.
+    monitor = LeakMonitor(app, warmup=max(2, math.ceil(60 / sample_min)), log=log)
+    monitor.growth_flagged.connect(print_flags)
+
+    step = 60 / clicks_per_min
+    clicks = int(hours * 3600 / step)
+    per_sample = max(1, int(sample_min * 60 / step))
+    print(f" [*] Soaking {toy}: {hours} h of use, {clicks:,} clicks, "
+          f"a sample every {sample_min} simulated min")
+    start = time.perf_counter()
+    monitor.sample(clock=0)
+    print_sample(monitor.samples[-1])
+    # Some toys print on every click, that's not what's being measured.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for click in range(1, clicks + 1):
+            _click(app, rng.choice(buttons))
+            for timer in toy_timers(root):
+                if timer.isActive():
+                    for _ in range(ticks):
+                        timer.timeout.emit()
+            app.processEvents()
+            if click % per_sample == 0:
+                with contextlib.redirect_stdout(sys.__stdout__):
+                    print_sample(monitor.sample(clock=click * step))
+    elapsed = time.perf_counter() - start
+    print(f" [*] Simulated {hours} h in {elapsed / 60:.1f} min ({hours * 3600 / elapsed:,.0f}x)")
+    code = print_report(monitor)
+    monitor.close()
+    root.close()
+    return code
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Memory and object leak monitor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="start a toy with the monitor attached")
+    run.add_argument("--interval", type=float, default=300,
+                     help="seconds between samples (default: %(default)s)")
+    run.add_argument("--no-tracemalloc", action="store_true",
+                     help="don't trace Python allocations (saves CPU)")
+
+    cmd_soak = sub.add_parser("soak", help="simulate hours of use offscreen")
+    cmd_soak.add_argument("--hours", type=float, default=8,
+                          help="simulated hours of use (default: %(default)s)")
+    cmd_soak.add_argument("--clicks", type=float, default=20,
+                          help="clicks per simulated minute (default: %(default)s)")
+    cmd_soak.add_argument("--ticks", type=int, default=5,
+                          help="timer ticks fired per click (default: %(default)s)")
+    cmd_soak.add_argument("--sample", type=float, default=15,
+                          help="simulated minutes between samples (default: %(default)s)")
+    cmd_soak.add_argument("--seed", type=int, default=1, help="click sequence seed")
+
+    for each in (run, cmd_soak):
+        each.add_argument("toy", nargs="?", default="allinone", choices=list(toys.TOYS))
+        each.add_argument("--log", metavar="FILE", help="append every sample to FILE as JSON")
+    args = parser.parse_args()
+
+    if args.command == "soak":
+        # This has to be set before the QApplication is created.
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    app = QApplication(sys.argv[:1])
+
+    if args.command == "soak":
+        return soak(app, args.toy, args.hours, args.clicks, args.ticks,
+                    args.sample, args.seed, args.log)
+
+    # pylint: disable=unused-variable
+    # Reason: Disable the unused-variable violations. The
+    #         'gui' variable is required to start the UI instance.
+    gui = toys.create(args.toy)
+    monitor = LeakMonitor(app, interval=args.interval, trace=not args.no_tracemalloc,
+                          log=args.log)
+    monitor.sampled.connect(print_sample)
+    monitor.growth_flagged.connect(print_flags)
+    code = app.exec_()
+    monitor.close()
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
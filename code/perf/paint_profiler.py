@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: paint_profiler.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: An opt-in paint and layout profiler for the toy widgets. It
+          records how long each widget spends in its paint events, how
+          many layout requests each one gets and how often text has to
+          be re-measured, then reports the top offenders and can export
+          a Chrome trace (open it in chrome://tracing or Perfetto).
+
+          Nothing here touches the toys themselves. The profiler only
+          exists while a ProfilingApplication is running.
+"""
+import os
+import sys
+import json
+import signal
+import argparse
+from time import perf_counter_ns
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import (QObject, QEvent, QElapsedTimer)
+from PyQt5.QtWidgets import (QApplication, QLabel, QAbstractButton)
+import toys
+
+# Events we time, and the trace category each one is filed under.
+WATCHED_EVENTS = {QEvent.Paint: "paint",
+                  QEvent.LayoutRequest: "layout",
+                  QEvent.Resize: "resize",
+                  QEvent.FontChange: "font",
+                  QEvent.StyleChange: "style"}
+
+# Widget classes whose size hint depends on their text.
+TEXT_WIDGETS = (QLabel, QAbstractButton)
+
+class WidgetStats:
+    """ Counters for a single widget. """
+    __slots__ = ("widget", "cls", "paint_ns", "paints", "layout_ns",
+                 "layouts", "resizes", "remeasures")
+
+    def __init__(self, widget):
+        """ Initalize the counters. """
+        # Keeping the wrapper alive stops its id() being reused.
+        self.widget = widget
+        self.cls = type(widget).__name__
+        self.paint_ns = 0
+        self.paints = 0
+        self.layout_ns = 0
+        self.layouts = 0
+        self.resizes = 0
+        self.remeasures = 0
+
+class PaintProfiler:
+    """
+    Collects per-widget paint/layout statistics and a timeline of
+    events. Events are fed to it by ProfilingApplication.notify(); text
+    changes are caught by wrapping setText() on the text widgets while
+    the profiler is installed.
+
+    A "text re-measurement" is counted when a QLabel or button gets new
+    text, or when a font/style change hits one. Each of those throws
+    away the cached text layout and size hint, which Qt then has to
+    compute again from the font metrics on the next layout pass.
+    """
+    def __init__(self, timeline=True):
+        """ Initalize the profiler. """
+        self.stats = {}
+        self.events = []
+        self.timeline = timeline
+        self._origin = perf_counter_ns()
+        self._originals = []
+
+    def install(self):
+        """ Start counting setText() calls on the text widgets. """
+        for cls in TEXT_WIDGETS:
+            original = cls.__dict__["setText"]
+            self._originals.append((cls, original))
+            cls.setText = self._wrap_set_text(original)
+
+    def uninstall(self):
+        """ Put the original setText() methods back. """
+        for cls, original in self._originals:
+            cls.setText = original
+        self._originals = []
+
+    def _wrap_set_text(self, original):
+        """ Return a setText() that counts real text changes. """
+        profiler = self
+
+        def set_text(widget, text):
+            """ Count the change and call the original setText(). """
+            if widget.text() != text:
+                profiler.text_changed(widget, text)
+            return original(widget, text)
+        return set_text
+
+    def _stats_for(self, widget):
+        """ Return (creating if needed) the stats for a widget. """
+        key = id(widget)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = WidgetStats(widget)
+        return key, stats
+
+    def name_of(self, stats):
+        """
+        Return a readable name for a widget, like 'Stopwatch.lbl_time'.
+        Attribute names are used where the owner keeps a reference,
+        otherwise the class name and its index among its siblings.
+        Names are worked out when reporting because most widgets are
+        created before they get reparented into a layout.
+        """
+        try:
+            return self._widget_name(stats.widget)
+        except RuntimeError:
+            # The C++ side has already been deleted.
+            return f"<deleted {stats.cls}>"
+
+    def _widget_name(self, widget):
+        """ Build the dotted name of a live widget. """
+        parent = widget.parentWidget()
+        if parent is None:
+            return type(widget).__name__
+
+        label = None
+        for owner in (parent, parent.parentWidget()):
+            if owner is None:
+                continue
+            for attr, value in vars(owner).items():
+                if value is widget:
+                    label = attr
+                    break
+            if label:
+                break
+        if label is None:
+            siblings = [child for child in parent.children()
+                        if type(child) is type(widget)]
+            label = f"{type(widget).__name__}[{siblings.index(widget)}]"
+        return f"{self._widget_name(parent)}.{label}"
+
+    def record(self, widget, event_type, start_ns, end_ns):
+        """ Record one handled event for a widget. """
+        key, stats = self._stats_for(widget)
+        duration = end_ns - start_ns
+        if event_type == QEvent.Paint:
+            stats.paints += 1
+            stats.paint_ns += duration
+        elif event_type == QEvent.LayoutRequest:
+            stats.layouts += 1
+            stats.layout_ns += duration
+        elif event_type == QEvent.Resize:
+            # The widget's layout re-positions its children while
+            # handling the resize, so this counts as layout time.
+            stats.resizes += 1
+            stats.layout_ns += duration
+        elif isinstance(widget, TEXT_WIDGETS):
+            # Font or style change on a text widget.
+            stats.remeasures += 1
+
+        if self.timeline:
+            self.events.append({"name": key,
+                                "cat": WATCHED_EVENTS[event_type],
+                                "ph": "X",
+                                "ts": (start_ns - self._origin) / 1000,
+                                "dur": duration / 1000,
+                                "pid": os.getpid(),
+                                "tid": 1})
+
+    def text_changed(self, widget, text):
+        """ Record a text change that forces a re-measurement. """
+        key, stats = self._stats_for(widget)
+        stats.remeasures += 1
+        if self.timeline:
+            self.events.append({"name": key,
+                                "cat": "text",
+                                "ph": "i",
+                                "s": "t",
+                                "ts": (perf_counter_ns() - self._origin) / 1000,
+                                "pid": os.getpid(),
+                                "tid": 1,
+                                "args": {"text": text}})
+
+    def top(self, key, count=10):
+        """ Return the top 'count' (name, stats) pairs sorted by 'key'. """
+        ranked = sorted(self.stats.values(),
+                        key=lambda stats: getattr(stats, key), reverse=True)
+        return [(self.name_of(stats), stats) for stats in ranked[:count]
+                if getattr(stats, key)]
+
+    def report(self, count=10, out=sys.stdout):
+        """ Print the top offenders for each metric. """
+        print("\n [*] Top paint time:", file=out)
+        print(f"     {'widget':48s} {'paints':>7s} {'total ms':>9s} {'avg us':>8s}", file=out)
+        for name, stats in self.top("paint_ns", count):
+            print(f"     {name[-48:]:48s} {stats.paints:7d} "
+                  f"{stats.paint_ns / 1e6:9.2f} "
+                  f"{stats.paint_ns / stats.paints / 1000:8.1f}", file=out)
+
+        print("\n [*] Top layout requests:", file=out)
+        print(f"     {'widget':48s} {'count':>7s} {'resizes':>8s} {'total ms':>9s}", file=out)
+        for name, stats in self.top("layouts", count):
+            print(f"     {name[-48:]:48s} {stats.layouts:7d} "
+                  f"{stats.resizes:8d} {stats.layout_ns / 1e6:9.2f}", file=out)
+
+        print("\n [*] Top text re-measurements:", file=out)
+        print(f"     {'widget':48s} {'count':>7s}", file=out)
+        for name, stats in self.top("remeasures", count):
+            print(f"     {name[-48:]:48s} {stats.remeasures:7d}", file=out)
+
+    def write_trace(self, path):
+        """ Write the timeline out in Chrome trace event format. """
+        meta = [{"name": "process_name", "ph": "M", "pid": os.getpid(),
+                 "args": {"name": "GUI thread"}}]
+        names = {key: self.name_of(stats) for key, stats in self.stats.items()}
+        events = [dict(event, name=names[event["name"]]) for event in self.events]
+        with open(path, "w") as fd_out:
+            json.dump({"traceEvents": meta + events,
+                       "displayTimeUnit": "ms"}, fd_out)
+
+class ProfilingApplication(QApplication):
+    """
+    A QApplication that times the paint/layout events delivered to
+    every widget. Use it in place of QApplication to opt in.
+    """
+    def __init__(self, argv, profiler):
+        """ Initalize the application with a profiler to feed. """
+        super().__init__(argv)
+        self.profiler = profiler
+
+    def notify(self, receiver, event):
+        """ Time watched events as they are delivered. """
+        event_type = event.type()
+        if event_type not in WATCHED_EVENTS or not receiver.isWidgetType():
+            return super().notify(receiver, event)
+
+        start = perf_counter_ns()
+        result = super().notify(receiver, event)
+        self.profiler.record(receiver, event_type, start, perf_counter_ns())
+        return result
+
+class _ResizeCounter(QObject):
+    """ Counts the resize events a widget receives. """
+    def __init__(self):
+        """ Initalize the counter. """
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        """ Count resizes, let everything through. """
+        if event.type() == QEvent.Resize:
+            self.count += 1
+        return False
+
+def resize_storm(app, widget, count):
+    """
+    Resize a window back and forth 'count' times, letting it lay out
+    and repaint after each step. This is what a kiosk does when the
+    display mode flips or a window gets dragged around. The sizes go
+    from the window's minimum size up to 1.5x and back, since anything
+    smaller is clamped to the minimum and would do nothing. Returns the
+    number of resize events the window got.
+    """
+    width = widget.width()
+    height = widget.height()
+    base = widget.minimumSizeHint().expandedTo(widget.minimumSize())
+    counter = _ResizeCounter()
+    widget.installEventFilter(counter)
+    for step in range(count):
+        # A triangle wave: 1.0x to 1.5x over 10 steps, then back down.
+        phase = step % 20
+        scale = 1.0 + 0.05 * (phase if phase <= 10 else 20 - phase)
+        widget.resize(int(base.width() * scale), int(base.height() * scale))
+        app.processEvents()
+        widget.repaint()
+    widget.removeEventFilter(counter)
+    widget.resize(width, height)
+    app.processEvents()
+    return counter.count
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Paint/layout profiler for the toys.")
+    parser.add_argument("toy", choices=list(toys.TOYS), help="toy to profile")
+    parser.add_argument("--resizes", type=int, default=100,
+                        help="resize steps to drive when offscreen (default: 100)")
+    parser.add_argument("--interactive", action="store_true",
+                        help="profile a live session until the window is closed")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace format timeline here")
+    parser.add_argument("--top", type=int, default=10,
+                        help="offenders to list per metric (default: 10)")
+    args = parser.parse_args()
+
+    if not args.interactive:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    profiler = PaintProfiler(timeline=args.trace is not None)
+    app = ProfilingApplication(sys.argv[:1], profiler)
+    profiler.install()
+
+    widget = toys.create(args.toy)
+    if args.interactive:
+        app.exec_()
+    else:
+        clock = QElapsedTimer()
+        clock.start()
+        resized = resize_storm(app, widget, args.resizes)
+        print(f" [*] Drove {args.resizes} resizes in {clock.elapsed()} ms "
+              f"({resized} resize events)")
+        if not resized:
+            print(" [!] The window never resized, nothing was measured.")
+            return 1
+
+    profiler.uninstall()
+    profiler.report(args.top)
+
+    if args.trace:
+        profiler.write_trace(args.trace)
+        print(f"\n [*] Trace written to {args.trace}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
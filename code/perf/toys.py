@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: toys.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A registry of every GUI in the repo and a helper to load them.
+          The example programs live in directories like "01-dice" that
+          aren't importable as packages, so the perf tools load them by
+          file path through here instead.
+"""
+import os
+import sys
+import importlib.util
+
+# The "code" directory that holds all of the example programs.
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Format: "toy_name": [path relative to CODE_DIR, main widget class,
+#                      buttons automated tools should never click,
+#                      widget attributes whose text depends on time or chance]
+# The skipped buttons start long running work: Boom! sleeps on the GUI
+# thread for 10 seconds (that's the whole point), Boom? and Boom~ start
+# jobs that would still be running while later clicks are measured.
+TOYS = {"dice": ["toys/01-dice/dice_v1.py", "Dice", [], ["lbl_dice"]],
+        "scoreboard": ["toys/02-scoreboard/scoreboard_v1.py", "Scoreboard", [], []],
+        "scoreboard_v2": ["toys/02-scoreboard/scoreboard_v2.py", "Scoreboard", [], []],
+        "stopwatch": ["toys/03-stopwatch/stopwatch_v1.py", "Stopwatch", [], ["lbl_time"]],
+        "stopwatch_v2": ["toys/03-stopwatch/stopwatch_v2.py", "Stopwatch", [], ["lbl_time"]],
+        "allinone": ["toys/04-all-in-one/all_in_one_v1.py", "AllInOne", [],
+                     ["lbl_dice", "lbl_time"]],
+        "boom": ["blocking/boom.py", "Boom", ["Boom!"], []],
+        "boom_fixed": ["blocking/boom_fixed.py", "Boom", ["Boom?"], []],
+        "boom_sliced": ["blocking/boom_sliced.py", "Boom", ["Boom~"], ["lbl_stats"]],
+        "keygen": ["keygenme/keygen.py", "KeyGenUI", [], []]}
+
+def toy_path(name):
+    """ Return the absolute path to a toy's script. """
+    return os.path.join(CODE_DIR, TOYS[name][0])
+
+def load_module(name):
+    """
+    Import a toy's script by path and return the module. Modules are
+    cached in sys.modules as 'toy_<name>' so each is only loaded once.
+    """
+    mod_name = f"toy_{name}"
+    if mod_name in sys.modules:
+        return sys.modules[mod_name]
+
+    path = toy_path(name)
+
+    # Let the script import its siblings the same way it would if it
+    # was run directly.
+    script_dir = os.path.dirname(path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def skip_buttons(name):
+    """ Return the text of the buttons automated tools shouldn't click. """
+    return TOYS[name][2]
+
+def volatile_attrs(name):
+    """
+    Return the names of the widget attributes (on the toy or any widget
+    in it) whose text depends on time or chance, not just on input.
+    """
+    return TOYS[name][3]
+
+def toy_class(name):
+    """ Return the main widget class for a toy. """
+    return getattr(load_module(name), TOYS[name][1])
+
+def create(name):
+    """
+    Create an instance of a toy's main window. A QApplication must
+    already exist.
+    """
+    return toy_class(name)()
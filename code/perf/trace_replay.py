@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: trace_replay.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: Record and replay user interaction traces for load testing the
+          GUIs. The recorder captures mouse/key input and the signals it
+          causes (button clicks, line edit edits) with timestamps into a
+          compact binary trace. The replayer injects the input back into
+          a fresh window under the offscreen platform, either at the
+          recorded pace (1x) or as fast as possible, and reports how long
+          each event took to handle. The trace ends with the text of
+          every line edit, label and button, and the replay checks its
+          window ends up the same (leaving out text that depends on time
+          or chance, see toys.py).
+
+ Usage:   trace_replay.py record allinone -o night.qtr   (live session)
+          trace_replay.py synth allinone -n 5000 -o storm.qtr
+          trace_replay.py replay storm.qtr --speed max
+"""
+import os
+import io
+import sys
+import time
+import random
+import signal
+import struct
+import argparse
+import contextlib
+from statistics import mean, median
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import (Qt, QObject, QEvent, QPoint)
+from PyQt5.QtGui import (QMouseEvent, QKeyEvent)
+from PyQt5.QtWidgets import (QApplication, QAbstractButton, QLabel,
+                             QLineEdit, QWidget)
+import toys
+
+# File header: magic, format version.
+MAGIC = b"QTRC"
+VERSION = 3
+
+# Record kinds.
+REC_WIDGET = 0        # Defines a widget id -> path mapping.
+REC_MOUSE_PRESS = 1
+REC_MOUSE_RELEASE = 2
+REC_KEY_PRESS = 3
+REC_KEY_RELEASE = 4
+REC_CLICKED = 5       # QAbstractButton.clicked was emitted.
+REC_TEXT_EDITED = 6   # QLineEdit.textEdited was emitted.
+REC_STATE = 7         # A widget's text when recording stopped.
+REC_IDLE = 8          # Only time passing, for gaps too long for one delta.
+
+# Every record starts with: kind, usecs since the previous record and
+# the widget id it applies to.
+HEAD = struct.Struct("<BIH")
+# The longest delta a record can hold (about 71 minutes).
+MAX_DELTA = (1 << 32) - 1
+# Mouse payload: button, buttons held, modifiers, x, y.
+MOUSE = struct.Struct("<HHIhh")
+# Key payload: key, modifiers, then a length prefixed UTF-8 text.
+KEY = struct.Struct("<iI")
+# Length prefix for strings.
+STRLEN = struct.Struct("<H")
+
+MOUSE_EVENTS = {QEvent.MouseButtonPress: REC_MOUSE_PRESS,
+                QEvent.MouseButtonRelease: REC_MOUSE_RELEASE}
+KEY_EVENTS = {QEvent.KeyPress: REC_KEY_PRESS,
+              QEvent.KeyRelease: REC_KEY_RELEASE}
+INPUT_KINDS = (REC_MOUSE_PRESS, REC_MOUSE_RELEASE, REC_KEY_PRESS, REC_KEY_RELEASE)
+KIND_NAMES = {REC_MOUSE_PRESS: "mouse press",
+              REC_MOUSE_RELEASE: "mouse release",
+              REC_KEY_PRESS: "key press",
+              REC_KEY_RELEASE: "key release",
+              REC_CLICKED: "clicked",
+              REC_TEXT_EDITED: "textEdited"}
+
+# Widgets whose text is saved as the final state.
+STATE_WIDGETS = (QLineEdit, QLabel, QAbstractButton)
+
+def widget_path(root, obj):
+    """
+    Return the path of 'obj' under 'root' as a string of child indexes
+    like '2/0/1', or None if it isn't a descendant. The same toy always
+    builds the same tree, so paths are stable between runs.
+    """
+    parts = []
+    while obj is not root:
+        parent = obj.parent()
+        if parent is None:
+            return None
+        parts.append(str(parent.children().index(obj)))
+        obj = parent
+    return "/".join(reversed(parts))
+
+def resolve_path(root, path):
+    """ Return the object at a path produced by widget_path(). """
+    obj = root
+    if path:
+        for part in path.split("/"):
+            obj = obj.children()[int(part)]
+    return obj
+
+def describe(widget):
+    """ Return a short readable name for a widget. """
+    text = ""
+    if isinstance(widget, QLineEdit):
+        text = widget.placeholderText()
+    elif hasattr(widget, "text"):
+        text = widget.text().replace("&", "")
+    label = type(widget).__name__
+    return f"{label}({text!r})" if text and len(text) < 16 else label
+
+def final_state(toy, root):
+    """
+    Return {widget path: text} for every line edit, label and button
+    under 'root', leaving out the toy's volatile widgets.
+    """
+    volatile = set()
+    for obj in [root] + root.findChildren(QWidget):
+        for attr in toys.volatile_attrs(toy):
+            widget = getattr(obj, attr, None)
+            if isinstance(widget, QWidget):
+                volatile.add(widget)
+    state = {}
+    for widget in root.findChildren(STATE_WIDGETS):
+        if widget not in volatile:
+            state[widget_path(root, widget)] = widget.text()
+    return state
+
+class TraceWriter:
+    """ Streams records into a binary trace file. """
+    def __init__(self, path, toy):
+        """ Open the file and write the header. """
+        self.fd_out = open(path, "wb")
+        self.fd_out.write(MAGIC + bytes([VERSION]))
+        self._write_str(toy)
+        self.toy = toy
+        self._ids = {}
+        self._last = None
+        self.count = 0
+
+    def _write_str(self, text):
+        """ Write a length prefixed UTF-8 string. """
+        data = text.encode("utf-8")
+        self.fd_out.write(STRLEN.pack(len(data)) + data)
+
+    def widget_id(self, path):
+        """ Return the id for a widget path, defining it if it's new. """
+        wid = self._ids.get(path)
+        if wid is None:
+            wid = self._ids[path] = len(self._ids)
+            self.fd_out.write(HEAD.pack(REC_WIDGET, 0, wid))
+            self._write_str(path)
+        return wid
+
+    def write(self, stamp_us, kind, path, payload=b"", text=None):
+        """ Write one record stamped at 'stamp_us'. """
+        wid = self.widget_id(path)
+        delta = 0 if self._last is None else max(0, int(stamp_us - self._last))
+        self._last = stamp_us
+        while delta > MAX_DELTA:
+            self.fd_out.write(HEAD.pack(REC_IDLE, MAX_DELTA, 0))
+            delta -= MAX_DELTA
+        self.fd_out.write(HEAD.pack(kind, delta, wid) + payload)
+        if text is not None:
+            self._write_str(text)
+        self.count += 1
+
+    def close(self):
+        """ Flush and close the file. """
+        self.fd_out.close()
+
+def read_trace(path):
+    """
+    Read a trace file. Returns (toy_name, records) where each record is
+    a tuple (time_us, kind, widget_path, payload_tuple, text).
+    """
+    with open(path, "rb") as fd_in:
+        data = fd_in.read()
+    # Version 1 is the same without the final state, version 2 without
+    # idle records.
+    if data[:4] != MAGIC or data[4] not in (1, 2, VERSION):
+        raise ValueError(f"{path} is not a version {VERSION} trace file")
+
+    def read_str(offset):
+        (length,) = STRLEN.unpack_from(data, offset)
+        offset += STRLEN.size
+        return data[offset:offset + length].decode("utf-8"), offset + length
+
+    toy, offset = read_str(5)
+    paths = {}
+    records = []
+    now = 0
+    while offset < len(data):
+        kind, delta, wid = HEAD.unpack_from(data, offset)
+        offset += HEAD.size
+        if kind == REC_WIDGET:
+            paths[wid], offset = read_str(offset)
+            continue
+
+        now += delta
+        if kind == REC_IDLE:
+            continue
+        payload = ()
+        text = None
+        if kind in (REC_MOUSE_PRESS, REC_MOUSE_RELEASE):
+            payload = MOUSE.unpack_from(data, offset)
+            offset += MOUSE.size
+        elif kind in (REC_KEY_PRESS, REC_KEY_RELEASE):
+            payload = KEY.unpack_from(data, offset)
+            offset += KEY.size
+            text, offset = read_str(offset)
+        elif kind in (REC_TEXT_EDITED, REC_STATE):
+            text, offset = read_str(offset)
+        records.append((now, kind, paths[wid], payload, text))
+    return toy, records
+
+class Recorder(QObject):
+    """
+    Records input events and signals for everything under a root widget.
+    Install it with install(); it's an application-wide event filter so
+    it sees events for popups and dialogs owned by the root too.
+    """
+    def __init__(self, app, root, writer, clock=None):
+        """
+        Initalize the recorder. 'clock' returns the current time in
+        usecs; it defaults to the real clock.
+        """
+        super().__init__()
+        self.app = app
+        self.root = root
+        self.writer = writer
+        self.clock = clock or (lambda: time.perf_counter_ns() // 1000)
+
+    def install(self):
+        """ Start recording. """
+        self.app.installEventFilter(self)
+        for btn in self.root.findChildren(QAbstractButton):
+            btn.clicked.connect(self._signal_recorder(btn, REC_CLICKED))
+        for edit in self.root.findChildren(QLineEdit):
+            edit.textEdited.connect(self._signal_recorder(edit, REC_TEXT_EDITED))
+
+    def uninstall(self):
+        """ Stop recording and write the final state. """
+        self.app.removeEventFilter(self)
+        now = self.clock()
+        for path, text in final_state(self.writer.toy, self.root).items():
+            self.writer.write(now, REC_STATE, path, text=text)
+
+    def _signal_recorder(self, widget, kind):
+        """ Return a slot that records a signal from 'widget'. """
+        path = widget_path(self.root, widget)
+
+        def record(*args):
+            text = args[0] if kind == REC_TEXT_EDITED else None
+            self.writer.write(self.clock(), kind, path, text=text)
+        return record
+
+    def eventFilter(self, obj, event):
+        """ Record input events on their first delivery. """
+        etype = event.type()
+        if etype in MOUSE_EVENTS and obj.isWidgetType():
+            # Mouse events bubble up to the parents if ignored. Only the
+            # first (deepest) receiver has no child under the cursor.
+            if obj.childAt(event.pos()) is None:
+                path = widget_path(self.root, obj)
+                if path is not None:
+                    payload = MOUSE.pack(int(event.button()), int(event.buttons()),
+                                         int(event.modifiers()),
+                                         event.pos().x(), event.pos().y())
+                    self.writer.write(self.clock(), MOUSE_EVENTS[etype], path, payload)
+        elif etype in KEY_EVENTS and obj.isWidgetType():
+            # Key events go to the focus widget first, then bubble.
+            if obj is (self.app.focusWidget() or obj.window()):
+                path = widget_path(self.root, obj)
+                if path is not None:
+                    payload = KEY.pack(event.key(), int(event.modifiers()))
+                    self.writer.write(self.clock(), KEY_EVENTS[etype], path,
+                                      payload, text=event.text())
+        return False
+
+def inject(app, widget, kind, payload, text):
+    """ Deliver one recorded input event to a widget synchronously. """
+    if kind in (REC_MOUSE_PRESS, REC_MOUSE_RELEASE):
+        button, buttons, modifiers, pos_x, pos_y = payload
+        etype = (QEvent.MouseButtonPress if kind == REC_MOUSE_PRESS
+                 else QEvent.MouseButtonRelease)
+        event = QMouseEvent(etype, QPoint(pos_x, pos_y), Qt.MouseButton(button),
+                            Qt.MouseButtons(buttons), Qt.KeyboardModifiers(modifiers))
+    else:
+        key, modifiers = payload
+        etype = QEvent.KeyPress if kind == REC_KEY_PRESS else QEvent.KeyRelease
+        event = QKeyEvent(etype, key, Qt.KeyboardModifiers(modifiers), text)
+    app.sendEvent(widget, event)
+
+def replay(app, path, speed):
+    """
+    Replay a trace into a new window. 'speed' is a multiplier for the
+    recorded pace, or 0 to go as fast as possible. Returns a dict of
+    per-event-type latency samples (msecs), the signal counts and the
+    recorded and replayed final state.
+    """
+    toy, records = read_trace(path)
+    root = toys.create(toy)
+    app.processEvents()
+
+    # Count the signals the replay produces so we can check it did the
+    # same thing as the recording.
+    emitted = {REC_CLICKED: 0, REC_TEXT_EDITED: 0}
+
+    def counter(kind):
+        def count(*_):
+            emitted[kind] += 1
+        return count
+    for btn in root.findChildren(QAbstractButton):
+        btn.clicked.connect(counter(REC_CLICKED))
+    for edit in root.findChildren(QLineEdit):
+        edit.textEdited.connect(counter(REC_TEXT_EDITED))
+
+    expected = {REC_CLICKED: 0, REC_TEXT_EDITED: 0}
+    state = {}
+    latency = {}
+    widgets = {}
+    start = time.perf_counter()
+    for stamp_us, kind, wpath, payload, text in records:
+        if kind == REC_STATE:
+            state[wpath] = text
+            continue
+        if kind not in INPUT_KINDS:
+            expected[kind] += 1
+            continue
+
+        if speed:
+            # Keep the event loop (and any running timers) going until
+            # it's time for this event.
+            due = start + stamp_us / 1e6 / speed
+            while time.perf_counter() < due:
+                app.processEvents()
+                time.sleep(min(0.001, max(0, due - time.perf_counter())))
+
+        # Name widgets the first time they're used so a button that
+        # changes its text (Start/Pause) stays in one bucket.
+        if wpath not in widgets:
+            widget = resolve_path(root, wpath)
+            widgets[wpath] = (widget, describe(widget))
+        widget, name = widgets[wpath]
+
+        begin = time.perf_counter()
+        inject(app, widget, kind, payload, text)
+        # Include the follow up work (repaints etc.) the event posted.
+        app.processEvents()
+        elapsed = (time.perf_counter() - begin) * 1000
+        latency.setdefault((KIND_NAMES[kind], name), []).append(elapsed)
+
+    wall = time.perf_counter() - start
+    replayed = final_state(toy, root)
+    names = {wpath: describe(resolve_path(root, wpath)) for wpath in state}
+    root.close()
+    return {"toy": toy, "wall": wall, "latency": latency,
+            "expected": expected, "emitted": emitted,
+            "state": state, "replayed_state": replayed, "names": names}
+
+def print_replay(result):
+    """
+    Print a latency report for a replay. Returns True if the replay
+    matched the recording.
+    """
+    samples = [value for values in result["latency"].values() for value in values]
+    print(f" [*] Replayed {len(samples)} input events into {result['toy']} "
+          f"in {result['wall']:.2f} s ({len(samples) / result['wall']:.0f} events/s)")
+    print(f"\n     {'event':14s} {'widget':28s} {'count':>6s} {'mean ms':>8s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'max ms':>8s}")
+    for (kind, name), values in sorted(result["latency"].items(),
+                                       key=lambda item: -max(item[1])):
+        values = sorted(values)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"     {kind:14s} {name[:28]:28s} {len(values):6d} {mean(values):8.3f} "
+              f"{median(values):8.3f} {p95:8.3f} {values[-1]:8.3f}")
+
+    print("")
+    matched = True
+    for kind in (REC_CLICKED, REC_TEXT_EDITED):
+        want = result["expected"][kind]
+        got = result["emitted"][kind]
+        status = "ok" if want == got else "MISMATCH"
+        matched = matched and want == got
+        print(f" [*] {KIND_NAMES[kind]:10s} signals: recorded {want}, replayed {got} [{status}]")
+
+    state = result["state"]
+    if not state:
+        print(" [!] The trace has no final state to check.")
+        return matched
+    differ = [path for path in sorted(state)
+              if result["replayed_state"].get(path) != state[path]]
+    status = "ok" if not differ else "MISMATCH"
+    print(f" [*] final state: {len(state) - len(differ)} of {len(state)} widgets match [{status}]")
+    for path in differ:
+        want = state[path]
+        got = result["replayed_state"].get(path)
+        print(f" [!]     {result['names'][path]}: recorded {want[:40]!r}, replayed "
+              f"{got[:40] if got is not None else None!r}")
+    return matched and not differ
+
+def synthesize(app, toy, count, rate, path, seed):
+    """
+    Build a "clicked everything at once" trace without a human: random
+    clicks on every safe button and random typing into line edits,
+    'rate' actions per second, recorded through the normal recorder.
+    """
+    rng = random.Random(seed)
+    root = toys.create(toy)
+    app.processEvents()
+
+    skip = toys.skip_buttons(toy)
+    buttons = [btn for btn in root.findChildren(QAbstractButton)
+               if btn.text().replace("&", "") not in skip]
+    edits = [edit for edit in root.findChildren(QLineEdit) if not edit.isReadOnly()]
+
+    # Fake clock so the trace has the requested pace, not our own.
+    clock = {"now": 0}
+    writer = TraceWriter(path, toy)
+    recorder = Recorder(app, root, writer, clock=lambda: clock["now"])
+    recorder.install()
+
+    step = int(1e6 / rate)
+    for _ in range(count):
+        clock["now"] += step
+        target = rng.choice(buttons + edits)
+        if isinstance(target, QLineEdit):
+            # Select all and delete (as keys, so the replay does it
+            # too), type a fresh challenge and hit return.
+            target.setFocus()
+            for key, modifiers, text in ((Qt.Key_A, Qt.ControlModifier, "\x01"),
+                                         (Qt.Key_Delete, Qt.NoModifier, "")):
+                for etype in (QEvent.KeyPress, QEvent.KeyRelease):
+                    app.sendEvent(target, QKeyEvent(etype, key, modifiers, text))
+            chars = "".join(rng.choice("0123456789abcdef") for _ in range(32))
+            for char in chars:
+                for etype in (QEvent.KeyPress, QEvent.KeyRelease):
+                    app.sendEvent(target, QKeyEvent(etype, ord(char.upper()),
+                                                    Qt.NoModifier, char))
+            for etype in (QEvent.KeyPress, QEvent.KeyRelease):
+                app.sendEvent(target, QKeyEvent(etype, Qt.Key_Return, Qt.NoModifier, "\r"))
+        else:
+            centre = target.rect().center()
+            for etype, buttons_held in ((QEvent.MouseButtonPress, Qt.LeftButton),
+                                        (QEvent.MouseButtonRelease, Qt.NoButton)):
+                app.sendEvent(target, QMouseEvent(etype, centre, Qt.LeftButton,
+                                                  Qt.MouseButtons(buttons_held),
+                                                  Qt.NoModifier))
+        app.processEvents()
+
+    recorder.uninstall()
+    writer.close()
+    root.close()
+    return writer.count
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Record/replay GUI interaction traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="record a live session until the window closes")
+    rec.add_argument("toy", choices=list(toys.TOYS))
+    rec.add_argument("-o", "--output", required=True, help="trace file to write")
+
+    syn = sub.add_parser("synth", help="generate a random click storm trace")
+    syn.add_argument("toy", choices=list(toys.TOYS))
+    syn.add_argument("-o", "--output", required=True, help="trace file to write")
+    syn.add_argument("-n", "--count", type=int, default=1000,
+                     help="number of actions (default: 1000)")
+    syn.add_argument("--rate", type=float, default=20,
+                     help="actions per second (default: 20)")
+    syn.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+
+    rep = sub.add_parser("replay", help="replay a trace offscreen and report latency")
+    rep.add_argument("trace", help="trace file to replay")
+    rep.add_argument("--speed", default="1",
+                     help="pace multiplier, or 'max' for as fast as possible (default: 1)")
+    args = parser.parse_args()
+
+    if args.command != "record":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    app = QApplication(sys.argv[:1])
+
+    if args.command == "record":
+        root = toys.create(args.toy)
+        writer = TraceWriter(args.output, args.toy)
+        recorder = Recorder(app, root, writer)
+        recorder.install()
+        app.exec_()
+        recorder.uninstall()
+        writer.close()
+        print(f" [*] Wrote {writer.count} records to {args.output}")
+    elif args.command == "synth":
+        # Some of the toys print debug output when clicked; keep it
+        # out of our report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            count = synthesize(app, args.toy, args.count, args.rate,
+                               args.output, args.seed)
+        print(f" [*] Wrote {count} records to {args.output} "
+              f"({os.path.getsize(args.output)} bytes)")
+    else:
+        speed = 0 if args.speed == "max" else float(args.speed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = replay(app, args.trace, speed)
+        return 0 if print_replay(result) else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
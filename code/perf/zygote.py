@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: zygote.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A pre-forked ("zygote") launcher for the GUIs in the repo. The
+          daemon imports PyQt5 and every toy module once, then waits on
+          a unix socket. Each launch request is answered with a fork();
+          the child takes over the client's stdin/stdout/stderr, working
+          directory, environment and arguments and runs the toy's own
+          main(). The child skips the interpreter start and all of the
+          imports, so only QApplication and the window are left to do.
+
+          The daemon never creates a QApplication or any Qt threads, so
+          forking it is safe. Unlike launcher.py each toy still gets its
+          own process, so a toy that blocks (Boom!) or crashes only
+          takes itself down.
+
+ Usage:   zygote.py serve &
+          zygote.py launch dice
+          zygote.py bench
+"""
+import os
+import sys
+import gc
+import json
+import time
+import socket
+import signal
+import argparse
+import selectors
+import importlib
+import traceback
+import subprocess
+from statistics import median
+
+import toys
+
+# One daemon per user.
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"),
+                           f"pyqt-toys-zygote-{os.getuid()}.sock")
+
+# Seconds a client gets to send its whole request, and its maximum size.
+REQUEST_TIMEOUT = 5
+MAX_REQUEST = 1 << 20
+
+def _preload():
+    """ Import PyQt5 and every toy so the children inherit them. """
+    for module in ("PyQt5.QtCore", "PyQt5.QtGui", "PyQt5.QtWidgets"):
+        importlib.import_module(module)
+    for name in toys.TOYS:
+        toys.load_module(name)
+    # Move everything imported so far out of the collector's reach. The
+    # children then don't write to (and copy) those pages on every gc.
+    gc.freeze()
+
+def _report_ready(start):
+    """
+    Print "READY <ms>" once the toy's window is up, with the ms since
+    'start'. This wraps exec_() so it works for any toy's main()
+    without changing it.
+    """
+    # pylint: disable=import-outside-toplevel,no-name-in-module
+    # Reason: Only used when benchmarking.
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    exec_ = QApplication.exec_
+
+    def ready():
+        QApplication.processEvents()
+        print(f"READY {(time.perf_counter() - start) * 1000:.1f}", flush=True)
+
+    def exec_and_report(*_args):
+        QTimer.singleShot(0, ready)
+        return exec_()
+    QApplication.exec_ = exec_and_report
+
+def _run_toy(name, argv):
+    """ Run a toy's main() as if it was the script. Returns the exit code. """
+    sys.argv = [toys.toy_path(name)] + argv
+    if os.environ.get("ZYGOTE_REPORT_READY"):
+        _report_ready(time.perf_counter())
+    try:
+        return toys.load_module(name).main() or 0
+    except SystemExit as err:
+        # The same exit status Python itself would give: None (a plain
+        # sys.exit()) is 0, anything that isn't an int is printed and 1.
+        if err.code is None:
+            return 0
+        if isinstance(err.code, int):
+            return err.code
+        print(err.code, file=sys.stderr)
+        return 1
+
+def _child(sel, listener, conn, request, fds):
+    """ Runs in the forked child. Never returns. """
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        sel.close()
+        listener.close()
+        conn.close()
+        # Detach from the daemon's terminal session so Ctrl+C there
+        # doesn't take every launched toy down with it.
+        os.setsid()
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        code = _run_toy(request["toy"], request["argv"])
+    # pylint: disable=broad-except
+    # Reason: Anything escaping here would unwind into the daemon's
+    #         loop inside the child. Report it and exit instead.
+    except Exception:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+def serve(path=SOCKET_PATH):
+    """ Run the zygote daemon until it's killed. """
+    _preload()
+    if os.path.exists(path):
+        os.unlink(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(16)
+
+    # Children are reaped when SIGCHLD wakes the selector up.
+    wake_r, wake_w = socket.socketpair()
+    wake_r.setblocking(False)
+    wake_w.setblocking(False)
+    signal.set_wakeup_fd(wake_w.fileno())
+    signal.signal(signal.SIGCHLD, lambda *args: None)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+
+    sel = selectors.DefaultSelector()
+    sel.register(listener, selectors.EVENT_READ)
+    sel.register(wake_r, selectors.EVENT_READ)
+    waiting = {}  # child pid -> client connection wanting its exit code
+    print(f" [*] Zygote {os.getpid()} ready on {path}", file=sys.stderr)
+    try:
+        while True:
+            for key, _ in sel.select():
+                if key.fileobj is wake_r:
+                    _reap(wake_r, waiting)
+                    continue
+                conn, _ = listener.accept()
+                pid = _launch(sel, listener, conn)
+                if pid is not None:
+                    waiting[pid] = conn
+    finally:
+        os.unlink(path)
+
+def _read_request(conn):
+    """
+    Read one newline terminated JSON request and the client's three
+    stdio fds from 'conn'. Raises ValueError for a malformed request and
+    OSError (socket.timeout included) if the client stalls or goes away.
+    Any fds received are closed on error.
+    """
+    conn.settimeout(REQUEST_TIMEOUT)
+    msg = b""
+    fds = []
+    try:
+        while not msg.endswith(b"\n"):
+            chunk, new_fds, _, _ = socket.recv_fds(conn, MAX_REQUEST, 3)
+            fds += new_fds
+            if not chunk:
+                raise ValueError("connection closed mid request")
+            msg += chunk
+            if len(msg) > MAX_REQUEST:
+                raise ValueError("request too long")
+        if len(fds) != 3:
+            raise ValueError(f"expected 3 fds, got {len(fds)}")
+        request = json.loads(msg.decode("utf-8"))
+        if not isinstance(request, dict):
+            raise ValueError("request isn't a JSON object")
+    except (ValueError, OSError):
+        for fd in fds:
+            os.close(fd)
+        raise
+    # The connection stays open for the exit code, which must not time out.
+    conn.settimeout(None)
+    return request, fds
+
+def _launch(sel, listener, conn):
+    """
+    Read one request and fork a child for it. Returns the pid, or None
+    if the request was refused. A bad or stalled client only loses its
+    own connection.
+    """
+    try:
+        request, fds = _read_request(conn)
+    except (ValueError, OSError) as err:
+        print(f" [!] Bad launch request: {err!r}", file=sys.stderr)
+        conn.close()
+        return None
+    if request.get("toy") not in toys.TOYS:
+        try:
+            conn.sendall(json.dumps({"error": "unknown toy"}).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        conn.close()
+        for fd in fds:
+            os.close(fd)
+        return None
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        _child(sel, listener, conn, request, fds)
+    for fd in fds:
+        os.close(fd)
+    try:
+        conn.sendall(json.dumps({"pid": pid}).encode("utf-8") + b"\n")
+    except OSError:
+        # The client is gone, the toy runs on without it.
+        pass
+    return pid
+
+def _reap(wake_r, waiting):
+    """ Collect exited children and tell their clients the exit code. """
+    try:
+        while wake_r.recv(512):
+            pass
+    except BlockingIOError:
+        pass
+    while True:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        conn = waiting.pop(pid, None)
+        if conn is not None:
+            code = os.waitstatus_to_exitcode(status)
+            if code < 0:
+                # Killed by a signal, report it the way a shell would.
+                code = 128 - code
+            try:
+                conn.sendall(json.dumps({"exit": code}).encode("utf-8") + b"\n")
+            except OSError:
+                pass
+            conn.close()
+
+def launch(name, argv, path=SOCKET_PATH, wait=True):
+    """
+    Ask the zygote to run a toy with our stdio. Returns the toy's exit
+    code (or 0 straight away if 'wait' is False), or None if there is
+    no zygote running.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    request = {"toy": name, "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    msg = json.dumps(request).encode("utf-8") + b"\n"
+    sent = socket.send_fds(sock, [msg], [0, 1, 2])
+    sock.sendall(msg[sent:])
+    with sock, sock.makefile("r") as replies:
+        reply = json.loads(replies.readline())
+        if "error" in reply:
+            print(f" [!] {reply['error']}", file=sys.stderr)
+            return 1
+        if not wait:
+            return 0
+        # Pass Ctrl+C etc. on to the toy while we wait for it.
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, lambda signum, _frame: os.kill(reply["pid"], signum))
+        line = replies.readline()
+    return json.loads(line)["exit"] if line else 1
+
+def _time_to_window(cmd, env):
+    """
+    Start 'cmd' and wait for it to report READY. Returns the process,
+    the wall clock ms until then and the ms the toy itself reported
+    (imports, QApplication and window, without interpreter start up).
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            env=env, text=True)
+    for line in proc.stdout:
+        if line.startswith("READY"):
+            return proc, (time.perf_counter() - start) * 1000, float(line.split()[1])
+    proc.kill()
+    raise RuntimeError(f"{' '.join(cmd)} didn't start")
+
+def bench(names, repeat):
+    """ Time to first window for every entry point, cold vs from the zygote. """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["ZYGOTE_REPORT_READY"] = "1"
+    path = f"{SOCKET_PATH}.bench-{os.getpid()}"
+    script = os.path.abspath(__file__)
+
+    daemon = subprocess.Popen([sys.executable, script, "serve", "--socket", path],
+                              env=env, stderr=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(path):
+            if daemon.poll() is not None:
+                raise RuntimeError("zygote didn't start")
+            time.sleep(0.01)
+
+        print(f" [*] Time to first window, median of {repeat} ({env['QT_QPA_PLATFORM']} QPA)")
+        print(f"     {'':12s} {'--- wall clock ms ---':>30s}  {'--- in process ms ---':>30s}")
+        print(f"     {'toy':12s} {'cold':>9s} {'zygote':>10s} {'speedup':>8s}  "
+              f"{'cold':>9s} {'zygote':>10s} {'speedup':>8s}")
+        for name in names:
+            results = {}
+            for mode, cmd in (("cold", [sys.executable, script, "run", name]),
+                              ("zygote", [sys.executable, script, "launch",
+                                          "--socket", path, name])):
+                wall = []
+                inside = []
+                for _ in range(repeat):
+                    proc, elapsed, reported = _time_to_window(cmd, env)
+                    wall.append(elapsed)
+                    inside.append(reported)
+                    proc.send_signal(signal.SIGTERM)
+                    proc.wait()
+                results[mode] = (median(wall), median(inside))
+            line = f"     {name:12s}"
+            for idx in (0, 1):
+                cold, warm = results["cold"][idx], results["zygote"][idx]
+                line += f" {cold:9.1f} {warm:10.1f} {cold / warm:7.1f}x "
+            print(line.rstrip())
+    finally:
+        daemon.terminate()
+        daemon.wait()
+        if os.path.exists(path):
+            os.unlink(path)
+    return 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Pre-forked launcher for the toys.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    toy_help = "one of: {0:s}".format(", ".join(toys.TOYS))
+
+    cmd = sub.add_parser("serve", help="run the zygote daemon")
+    cmd.add_argument("--socket", default=SOCKET_PATH, help="unix socket path")
+
+    cmd = sub.add_parser("launch", help="run a toy from the zygote")
+    cmd.add_argument("toy", help=toy_help)
+    cmd.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the toy")
+    cmd.add_argument("--socket", default=SOCKET_PATH, help="unix socket path")
+    cmd.add_argument("--no-wait", action="store_true",
+                     help="return once the toy has started")
+
+    cmd = sub.add_parser("run", help="run a toy in this process (no zygote)")
+    cmd.add_argument("toy", help=toy_help)
+    cmd.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the toy")
+
+    cmd = sub.add_parser("bench", help="time to first window, cold vs zygote")
+    cmd.add_argument("toys", nargs="*", metavar="TOY", help=f"{toy_help} (default: all)")
+    cmd.add_argument("-r", "--repeat", type=int, default=5,
+                     help="launches per measurement (default: 5)")
+    args = parser.parse_args()
+    for name in getattr(args, "toys", []) + [getattr(args, "toy", None)]:
+        if name is not None and name not in toys.TOYS:
+            parser.error(f"unknown toy: {name}")
+
+    if args.command == "serve":
+        return serve(args.socket)
+    if args.command == "bench":
+        return bench(args.toys or list(toys.TOYS), args.repeat)
+    if args.command == "launch":
+        code = launch(args.toy, args.args, args.socket, not args.no_wait)
+        if code is not None:
+            return code
+        print(" [!] No zygote running, starting the toy directly.", file=sys.stderr)
+    return _run_toy(args.toy, args.args)
+
+if __name__ == "__main__":
+    sys.exit(main())
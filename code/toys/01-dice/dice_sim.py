@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: dice_sim.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: Seeded, reproducible dice rolling for audits and big
+          simulations. Live play in dice_v1.py still uses the securely
+          seeded QRandomGenerator; this is for when a roll sequence has
+          to be replayed or split across cores.
+
+          Rolls come from NumPy's counter-based Philox generator. Every
+          dice type has its own roll sequence per seed, cut into fixed
+          size blocks, and each block has its own stream spawned from
+          SeedSequence(seed). Blocks are independent, so they can be
+          rolled in any order by any number of processes and the result
+          is the same bit for bit. A digest of the whole sequence is
+          kept as the audit record, and any single roll can be replayed
+          by its index.
+
+ Usage:   dice_sim.py simulate --seed 2021 --dice D20 --rolls 1e9 -j 8
+          dice_sim.py replay --seed 2021 --dice D20 --index 123456789
+"""
+import os
+import sys
+import time
+import hashlib
+import argparse
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor)
+import numpy
+from dice_v1 import Dice
+
+# Rolls per block. Part of the audit record: replaying a digest needs
+# the same block size.
+BLOCK_ROLLS = 1 << 22
+
+# Rolls SeededRoller pre-rolls the first time a dice type is used. It
+# doubles each time they run out, up to BLOCK_ROLLS.
+LIVE_ROLLS = 256
+
+def block_stream(seed, dice, block):
+    """ Return the Generator for one block of a roll sequence. """
+    seq = numpy.random.SeedSequence(seed, spawn_key=(list(Dice.DICE).index(dice), block))
+    return numpy.random.Generator(numpy.random.Philox(seq))
+
+def face_values(dice):
+    """
+    Return an array mapping each raw roll to the face shown, the same
+    way Dice._cb_clicked_roll does (D10B shows tens).
+    """
+    low, high = Dice.DICE[dice]
+    faces = numpy.arange(high, dtype=numpy.int64)
+    if dice == "D10B (00-90)":
+        faces = (faces % 10) * 10
+    faces[:low] = -1
+    return faces
+
+def roll_block(seed, dice, block, rolls=BLOCK_ROLLS):
+    """ Roll one block. Returns the raw rolls as a uint8 array. """
+    low, high = Dice.DICE[dice]
+    return block_stream(seed, dice, block).integers(low, high, size=rolls,
+                                                    dtype=numpy.uint8)
+
+def _simulate_block(args):
+    """ Pool worker: roll a block, return (block, histogram, digest). """
+    seed, dice, block, rolls = args
+    values = roll_block(seed, dice, block, rolls)
+    counts = numpy.bincount(values, minlength=Dice.DICE[dice][1])
+    return block, counts, hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+
+def simulate(seed, dice, rolls, workers=None, executor="process", block_rolls=BLOCK_ROLLS):
+    """
+    Roll 'rolls' dice for a seed across a pool. Returns (histogram of
+    faces shown, hex digest of the whole sequence). The result depends
+    only on seed, dice, rolls and block size, never on the workers.
+    """
+    blocks = (rolls + block_rolls - 1) // block_rolls
+    jobs = [(seed, dice, block, min(block_rolls, rolls - block * block_rolls))
+            for block in range(blocks)]
+
+    total = numpy.zeros(Dice.DICE[dice][1], dtype=numpy.int64)
+    digests = [None] * blocks
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        # chunksize keeps the per-task overhead down for huge runs.
+        chunk = max(1, blocks // ((workers or os.cpu_count() or 1) * 4))
+        kwargs = {"chunksize": chunk} if executor == "process" else {}
+        for block, counts, digest in pool.map(_simulate_block, jobs, **kwargs):
+            total += counts
+            digests[block] = digest
+
+    # Fold the raw histogram into the faces the GUI shows.
+    faces = face_values(dice)
+    shown = {}
+    for raw, count in enumerate(total):
+        if faces[raw] >= 0:
+            shown[int(faces[raw])] = shown.get(int(faces[raw]), 0) + int(count)
+
+    # Blocks are folded in order, so the digest covers the exact sequence.
+    audit = hashlib.blake2b(digest_size=16)
+    audit.update(f"{seed}:{dice}:{rolls}:{block_rolls}".encode("ascii"))
+    for digest in digests:
+        audit.update(digest)
+    return shown, audit.hexdigest()
+
+def replay(seed, dice, index, count=1, block_rolls=BLOCK_ROLLS):
+    """ Return the faces shown for rolls index .. index+count-1. """
+    faces = face_values(dice)
+    result = []
+    while count > 0:
+        block, offset = divmod(index, block_rolls)
+        values = roll_block(seed, dice, block, block_rolls)[offset:offset + count]
+        result.extend(int(faces[value]) for value in values)
+        index += len(values)
+        count -= len(values)
+    return result
+
+class SeededRoller:
+    """
+    A seeded roller for live play (dice_v1.py --seed). The Nth roll of
+    a dice type in a session is roll N of that dice's sequence, so it
+    can be checked later with 'dice_sim.py replay'.
+
+    NumPy gives a block's rolls as a prefix of any larger request, but
+    not across separate smaller requests. So rather than rolling a whole
+    block on the first click, a short prefix of it is rolled and rolled
+    again twice as long whenever it runs out.
+    """
+    def __init__(self, seed):
+        """ Initalize the class. """
+        self.seed = seed
+        # Format: "dice_name": rolls so far
+        self.counts = {}
+        # Format: "dice_name": (block number, rolls of that block so far)
+        self._blocks = {}
+
+    def roll(self, dice):
+        """ Return the next raw roll for a dice type, in its DICE range. """
+        index = self.counts.get(dice, 0)
+        self.counts[dice] = index + 1
+        block, offset = divmod(index, BLOCK_ROLLS)
+        cached, rolls = self._blocks.get(dice, (None, ()))
+        if cached != block or offset >= len(rolls):
+            size = LIVE_ROLLS if cached != block else 2 * len(rolls)
+            while size <= offset:
+                size *= 2
+            rolls = roll_block(self.seed, dice, block, min(size, BLOCK_ROLLS))
+            self._blocks[dice] = (block, rolls)
+        return int(rolls[offset])
+
+def _parse_count(text):
+    """ Parse a count like 1e9 or 1000000. """
+    return int(float(text))
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Seeded, reproducible dice simulation.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmd = sub.add_parser("simulate", help="roll many dice over a process pool")
+    cmd.add_argument("--rolls", type=_parse_count, default=10 ** 8,
+                     help="number of rolls, e.g. 1e9 (default: 1e8)")
+    cmd.add_argument("-j", "--workers", type=int, help="pool size (default: CPUs)")
+    cmd.add_argument("--threads", action="store_true",
+                     help="use a thread pool instead of processes")
+
+    cmd_replay = sub.add_parser("replay", help="show specific rolls of a sequence")
+    cmd_replay.add_argument("--index", type=_parse_count, required=True,
+                            help="index of the first roll (from 0)")
+    cmd_replay.add_argument("-n", "--count", type=int, default=1, help="rolls to show")
+
+    for each in (cmd, cmd_replay):
+        each.add_argument("--seed", type=int, required=True, help="sequence seed")
+        each.add_argument("--dice", choices=list(Dice.DICE), default="D20",
+                          help="dice type (default: %(default)s)")
+        each.add_argument("--block", type=_parse_count, default=BLOCK_ROLLS,
+                          help="rolls per block (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        rolls = replay(args.seed, args.dice, args.index, args.count, args.block)
+        for offset, face in enumerate(rolls):
+            print(f" [*] Roll #{args.index + offset}: {face}")
+        return 0
+
+    start = time.perf_counter()
+    shown, digest = simulate(args.seed, args.dice, args.rolls, args.workers,
+                             "thread" if args.threads else "process", args.block)
+    elapsed = time.perf_counter() - start
+    print(f" [*] {args.rolls:,} x {args.dice} rolls, seed {args.seed}, "
+          f"{args.block:,} rolls per block")
+    print(f" [*] {elapsed:.2f} s ({args.rolls / elapsed / 1e6:,.1f} M rolls/s)")
+    expected = args.rolls / len(shown)
+    for face, count in sorted(shown.items()):
+        print(f"     {face:4d}: {count:14,d}  ({(count - expected) / expected * 100:+.4f}%)")
+    print(f" [*] Sequence digest: {digest}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
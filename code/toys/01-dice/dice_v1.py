@@ -11,6 +11,7 @@
 """
 import sys
 import signal
+import argparse
 from PyQt5.QtCore import (Qt, QRandomGenerator)
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout,
                              QComboBox, QLabel, QPushButton)
@@ -30,15 +31,28 @@ class Dice(QWidget):
             "D20": [1, 21],
             "D100": [1, 101]}
 
-    def __init__(self):
-        """ Initalize the class. """
+    def __init__(self, seed=None):
+        """
+        Initalize the class. Rolls are securely random unless a 'seed'
+        is given, then they come from a reproducible stream (see
+        dice_sim.py) for audits.
+        """
         super().__init__()
+        self.roller = None
+        if seed is not None:
+            # pylint: disable=import-outside-toplevel
+            # Reason: Seeded mode needs NumPy, live play doesn't.
+            from dice_sim import SeededRoller
+            self.roller = SeededRoller(seed)
         self._init_win()
 
     def _init_win(self):
         """ Initialize the window. """
         # Set the size and title bar.
-        self.setWindowTitle('Dice Roller')
+        if self.roller is None:
+            self.setWindowTitle('Dice Roller')
+        else:
+            self.setWindowTitle(f'Dice Roller (seed {self.roller.seed})')
         self.setGeometry(300, 300, 300, 400)
 
         # Add the VBox as the main layout
@@ -74,10 +88,15 @@ class Dice(QWidget):
         # Get the user select dice type
         dice = self.combo_box.currentText()
 
-        # Use QT's QRandomGenerator to give us a cryptographically
-        # secure dice roller... becuase why not! XD
-        roll = QRandomGenerator.securelySeeded().bounded(self.DICE[dice][0],
-                                                         self.DICE[dice][1])
+        if self.roller is None:
+            # Use QT's QRandomGenerator to give us a cryptographically
+            # secure dice roller... becuase why not! XD
+            roll = QRandomGenerator.securelySeeded().bounded(self.DICE[dice][0],
+                                                             self.DICE[dice][1])
+        else:
+            # Seeded mode: the Nth roll of this dice type, replayable
+            # with dice_sim.py.
+            roll = self.roller.roll(dice)
 
         # Handle the special D10B Dice
         if dice == "D10B (00-90)":
@@ -85,8 +104,16 @@ class Dice(QWidget):
         else:
             self.lbl_dice.setText(f"{roll}")
 
+        if self.roller is not None:
+            print(f" [*] {dice} roll #{self.roller.counts[dice] - 1}: {self.lbl_dice.text()}")
+
 def main():
     """ Main program logic """
+    parser = argparse.ArgumentParser(description="A simple dice roller.")
+    parser.add_argument("--seed", type=int,
+                        help="reproducible rolls for audits (default: secure random)")
+    args = parser.parse_args()
+
     # Make it so we can exit with Ctrl+C from terminal.
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
@@ -96,7 +123,7 @@ def main():
     # pylint: disable=unused-variable
     # Reason: Disable the unused-variable violations. The
     #         'gui' variable is required to start the UI instance.
-    gui = Dice()
+    gui = Dice(args.seed)
     return app.exec_()
 
 if __name__ == "__main__":
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: scoreboard_v2.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A scoreboard program that scales to N teams. Instead of building
+          a widget tree per team (like scoreboard_v1.py) all of the teams
+          live in a single model and are painted by a delegate in a
+          QListView, so only the rows on screen cost anything to draw.
+          The ranking is kept sorted incrementally as scores change.
+"""
+import sys
+import signal
+import random
+import argparse
+from bisect import bisect_left
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QRect,
+                          QSize, QTimer, QElapsedTimer)
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout,
+                             QHBoxLayout, QListView, QPushButton,
+                             QStyle, QStyledItemDelegate)
+
+class TeamModel(QAbstractListModel):
+    """
+    A list model holding every team in the tournament. Rows are always
+    in ranked order (highest score first, then team name). The sorted
+    order is stored as a list of (-score, name, team_id) keys so a score
+    change is a bisect + a single row move instead of a full re-sort.
+    """
+    # Custom roles the delegate pulls its values from.
+    ScoreRole = Qt.UserRole + 1
+    RankRole = Qt.UserRole + 2
+    TeamRole = Qt.UserRole + 3
+
+    # If a batch touches more teams than this fraction of the board
+    # it is cheaper to re-sort everything once than move row by row.
+    RESORT_FRACTION = 0.25
+
+    def __init__(self, names, parent=None):
+        """ Initalize the model with a list of team names. """
+        super().__init__(parent)
+        self._names = list(names)
+        self._scores = [0] * len(self._names)
+        self._keys = sorted((0, name, idx) for idx, name in enumerate(self._names))
+
+    def rowCount(self, parent=QModelIndex()):
+        """ Number of teams (this is a flat list). """
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """ Return the data for a row in ranked order. """
+        if not index.isValid():
+            return None
+        neg_score, name, team = self._keys[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == self.ScoreRole:
+            return -neg_score
+        if role == self.RankRole:
+            # Standard competition ranking (1224). Every team that has
+            # a strictly higher score sorts before (neg_score,).
+            return bisect_left(self._keys, (neg_score,)) + 1
+        if role == self.TeamRole:
+            return team
+        return None
+
+    def team_count(self):
+        """ Return the number of teams. """
+        return len(self._names)
+
+    def team_name(self, team):
+        """ Return the name of a team by id. """
+        return self._names[team]
+
+    def score(self, team):
+        """ Return the score of a team by id. """
+        return self._scores[team]
+
+    def row_of(self, team):
+        """ Return the current row (rank order) of a team by id. """
+        return bisect_left(self._keys, self._key(team))
+
+    def add_points(self, team, points):
+        """ Add (or remove with a negative value) points from a team. """
+        self.set_score(team, self._scores[team] + points)
+
+    def set_score(self, team, score):
+        """
+        Set a team's score and move its row to the new ranked position.
+        This is O(log n) to find the rows plus the list insert/delete.
+        """
+        if score == self._scores[team]:
+            return
+
+        old_key = self._key(team)
+        old_row = bisect_left(self._keys, old_key)
+        new_key = (-score, old_key[1], team)
+
+        # Work out where the row ends up once it's been removed from
+        # its old position.
+        new_row = bisect_left(self._keys, new_key)
+        if new_row > old_row:
+            new_row -= 1
+
+        if new_row != old_row:
+            # Qt wants the destination expressed as the row *before*
+            # the move, so moving down is off by one.
+            dest = new_row + 1 if new_row > old_row else new_row
+            self.beginMoveRows(QModelIndex(), old_row, old_row,
+                               QModelIndex(), dest)
+            del self._keys[old_row]
+            self._keys.insert(new_row, new_key)
+            self._scores[team] = score
+            self.endMoveRows()
+        else:
+            self._keys[old_row] = new_key
+            self._scores[team] = score
+
+        # Ranks of everything between the two positions shift, and so
+        # do the ranks of teams tied with the lower of the two scores.
+        first = min(old_row, new_row)
+        last = self._last_row_with_score(min(score, -old_key[0]))
+        last = max(last, old_row, new_row)
+        self.dataChanged.emit(self.index(first), self.index(last),
+                              [self.ScoreRole, self.RankRole])
+
+    def apply_updates(self, updates):
+        """
+        Apply a batch of (team_id, points) updates. Small batches are
+        moved row by row, large ones trigger a single re-sort.
+        """
+        if len(updates) < len(self._names) * self.RESORT_FRACTION:
+            for team, points in updates:
+                self.add_points(team, points)
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_teams = [self._keys[idx.row()][2] for idx in old_persistent]
+        for team, points in updates:
+            self._scores[team] += points
+        self._keys = sorted(self._key(team) for team in range(len(self._names)))
+        self.changePersistentIndexList(
+            old_persistent, [self.index(self.row_of(team)) for team in old_teams])
+        self.layoutChanged.emit()
+
+    def _key(self, team):
+        """ Return the sort key for a team. """
+        return (-self._scores[team], self._names[team], team)
+
+    def _last_row_with_score(self, score):
+        """ Return the last row holding the given score. """
+        # (-score + 1,) sorts after every key with exactly that score.
+        return bisect_left(self._keys, (-score + 1,)) - 1
+
+class TeamDelegate(QStyledItemDelegate):
+    """
+    Paints a whole scoreboard row (rank, team name and score) directly
+    with QPainter. Fonts and sizes are created once and shared by every
+    row, and a fixed size hint lets the view skip measuring rows.
+    """
+    ROW_HEIGHT = 48
+
+    def __init__(self, parent=None):
+        """ Initalize the delegate and its shared fonts. """
+        super().__init__(parent)
+        self.font_rank = QFont()
+        self.font_rank.setPointSize(16)
+        self.font_name = QFont()
+        self.font_name.setPointSize(20)
+        self.font_score = QFont()
+        self.font_score.setPointSize(24)
+        self.font_score.setBold(True)
+        self.color_alt = QColor(240, 240, 240)
+
+    def sizeHint(self, option, index):
+        """ Every row is the same height. """
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        """ Paint one team row. """
+        painter.save()
+        rect = option.rect
+
+        # Background: selection highlight or alternating stripes.
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, option.palette.highlight())
+            painter.setPen(option.palette.highlightedText().color())
+        else:
+            if index.row() % 2:
+                painter.fillRect(rect, self.color_alt)
+            painter.setPen(option.palette.text().color())
+
+        rank_rect = QRect(rect.left() + 8, rect.top(), 70, rect.height())
+        score_rect = QRect(rect.right() - 160, rect.top(), 150, rect.height())
+        name_rect = QRect(rank_rect.right() + 8, rect.top(),
+                          score_rect.left() - rank_rect.right() - 16,
+                          rect.height())
+
+        painter.setFont(self.font_rank)
+        painter.drawText(rank_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         f"#{index.data(TeamModel.RankRole)}")
+        painter.setFont(self.font_name)
+        painter.drawText(name_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         index.data(Qt.DisplayRole))
+        painter.setFont(self.font_score)
+        painter.drawText(score_rect, Qt.AlignVCenter | Qt.AlignRight,
+                         str(index.data(TeamModel.ScoreRole)))
+        painter.restore()
+
+class Scoreboard(QWidget):
+    """
+    This class provides a UI for an N-team Scoreboard.
+    """
+    def __init__(self, teams=2, live_rate=0):
+        """
+        Initalize the class. 'teams' is either a number of teams or a
+        list of team names. If 'live_rate' is non-zero a simulated live
+        feed applies that many score updates per second.
+        """
+        super().__init__()
+        if isinstance(teams, int):
+            teams = [f"Team {idx + 1:03d}" for idx in range(teams)]
+        self.model = TeamModel(teams, self)
+        self.live_rate = live_rate
+        self._init_win()
+
+    def _init_win(self):
+        """ Initialize the window. """
+        # Set the size and title bar.
+        self.setWindowTitle('Scoreboard')
+        self.setGeometry(300, 300, 600, 700)
+
+        # Add the VBox as the main layout
+        self.vbox = QVBoxLayout()
+        self.setLayout(self.vbox)
+
+        # Create the list view. Uniform item sizes let the view do its
+        # layout arithmetically instead of asking every row.
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(TeamDelegate(self.view))
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QListView.SingleSelection)
+        self.vbox.addWidget(self.view, 1)
+
+        # Create the increment decrement buttons for the selected team.
+        hbox = QHBoxLayout()
+        self.btn_dec = QPushButton("-")
+        self.btn_inc = QPushButton("+")
+        self.btn_dec.setStyleSheet("QPushButton{font-size: 36pt; background-color: red}")
+        self.btn_inc.setStyleSheet("QPushButton{font-size: 36pt; background-color: green}")
+        self.btn_dec.clicked.connect(self._cb_btn_dec_clicked)
+        self.btn_inc.clicked.connect(self._cb_btn_inc_clicked)
+        hbox.addWidget(self.btn_dec)
+        hbox.addWidget(self.btn_inc)
+        self.vbox.addLayout(hbox)
+
+        # Start with the top team selected.
+        self.view.setCurrentIndex(self.model.index(0))
+
+        # Optional simulated live feed of score updates.
+        self.feed_timer = QTimer(self)
+        self.feed_timer.timeout.connect(self._cb_feed_tick)
+        self.feed_clock = QElapsedTimer()
+        self._feed_due = 0.0
+        if self.live_rate:
+            self.feed_clock.start()
+            self.feed_timer.start(50)
+
+        # Finally show the window.
+        self.show()
+
+    def _current_team(self):
+        """ Return the team id of the selected row, or None. """
+        index = self.view.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(TeamModel.TeamRole)
+
+    def _cb_btn_inc_clicked(self):
+        """ Callback function to increment the selected team's score. """
+        team = self._current_team()
+        if team is not None:
+            self.model.add_points(team, 1)
+            self.view.scrollTo(self.view.currentIndex())
+
+    def _cb_btn_dec_clicked(self):
+        """ Callback function to decrement the selected team's score. """
+        team = self._current_team()
+        if team is not None:
+            self.model.add_points(team, -1)
+            self.view.scrollTo(self.view.currentIndex())
+
+    def _cb_feed_tick(self):
+        """ Apply the simulated live score updates due since the last tick. """
+        # Updates are owed for the time that actually passed, and the
+        # fraction is carried over, so rates below one per tick (20/s)
+        # and late ticks still come out at 'live_rate' per second.
+        self._feed_due += self.live_rate * self.feed_clock.restart() / 1000
+        count = int(self._feed_due)
+        if not count:
+            return
+        self._feed_due -= count
+        teams = self.model.team_count()
+        self.model.apply_updates([(random.randrange(teams), random.randint(1, 3))
+                                  for _ in range(count)])
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="An N-team scoreboard.")
+    parser.add_argument("teams", nargs="?", type=int, default=2,
+                        help="number of teams (default: 2)")
+    parser.add_argument("--live", type=int, default=0, metavar="RATE",
+                        help="simulate RATE score updates per second")
+    args = parser.parse_args()
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Standard QT boilerplate to launch our UI
+    app = QApplication(sys.argv)
+
+    # pylint: disable=unused-variable
+    # Reason: Disable the unused-variable violations. The
+    #         'gui' variable is required to start the UI instance.
+    gui = Scoreboard(args.teams, args.live)
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: stopwatch_v2.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A stopwatch that scales to hundreds of instances (one per heat,
+          per lane). In stopwatch_v1.py every Stopwatch owns a QTimer
+          firing every 10 ms, so N stopwatches mean N timers and N
+          wakeups per tick. Here every Stopwatch subscribes to one shared
+          TickScheduler instead. Only stopwatches that are running and
+          visible are subscribed, and ones scrolled out of view are
+          parked until they're painted again, so a tick costs O(running
+          on screen) and the timer stops entirely when nothing is
+          running.
+
+ Usage:   stopwatch_v2.py
+          stopwatch_v2.py --bench 1000
+"""
+import sys
+import time
+import signal
+import argparse
+from PyQt5 import sip
+from PyQt5.QtCore import (Qt, QObject, QDateTime, QEvent, QTimer)
+from PyQt5.QtWidgets import (QApplication, QWidget, QHBoxLayout,
+                             QLabel, QPushButton)
+
+class TickScheduler(QObject):
+    """
+    A single coalesced tick shared by every subscriber. The time is
+    read once per tick and handed to every callback, and the timer only
+    runs while something is subscribed.
+
+    Subscribers can name a widget. When they subscribe, and every
+    SWEEP_MS after that, the ones whose widget is entirely off screen
+    (e.g. scrolled away) are moved to a parked list that costs nothing
+    per tick. A parked subscriber comes back as soon as its widget gets
+    a paint event.
+    """
+    _instance = None
+
+    # Tick interval in milliseconds. The display has 10 ms resolution.
+    INTERVAL = 10
+
+    # How often (in milliseconds) subscribers are checked for being
+    # off screen.
+    SWEEP_MS = 250
+
+    def __init__(self, interval=INTERVAL, parent=None):
+        """ Initalize the class. """
+        super().__init__(parent)
+        # Format: key: (callback, widget or None)
+        self._subscribers = {}
+        self._parked = {}
+        # Format: id(widget): key, for parked widgets.
+        self._parked_widgets = {}
+        self.ticks = 0
+        self.calls = 0
+        self._last_sweep = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self._tick)
+
+    @classmethod
+    def instance(cls):
+        """
+        Return the shared scheduler, creating it on first use. It's
+        owned by the application, and forgotten once it's deleted so a
+        later call makes a new one.
+        """
+        if cls._instance is None:
+            cls._instance = cls(parent=QApplication.instance())
+            cls._instance.destroyed.connect(cls._forget_instance)
+        return cls._instance
+
+    @classmethod
+    def _forget_instance(cls, _obj=None):
+        """ The shared scheduler was deleted. """
+        cls._instance = None
+
+    def subscribe(self, key, callback, widget=None):
+        """
+        Call callback(now_ms) on every tick until unsubscribed. If
+        'widget' is given the callback is skipped while it's off screen.
+        """
+        self._unpark(key)
+        if widget is not None and widget.visibleRegion().isEmpty():
+            self._park(key, callback, widget)
+            return
+        self._subscribers[key] = (callback, widget)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def unsubscribe(self, key):
+        """
+        Stop ticking 'key'. Unknown keys are ignored, and so is the call
+        if the scheduler is already gone (stopwatches hidden or deleted
+        while the application shuts down).
+        """
+        if sip.isdeleted(self):
+            return
+        self._subscribers.pop(key, None)
+        self._unpark(key)
+        if not self._subscribers:
+            self.timer.stop()
+
+    def active(self):
+        """ Number of subscribers being ticked (not parked). """
+        return len(self._subscribers)
+
+    def _tick(self):
+        """ Call every subscriber with the current time. """
+        self.ticks += 1
+        now = QDateTime.currentMSecsSinceEpoch()
+        # Copy, a callback may unsubscribe itself.
+        subscribers = list(self._subscribers.values())
+        for callback, _ in subscribers:
+            callback(now)
+        self.calls += len(subscribers)
+        if now - self._last_sweep >= self.SWEEP_MS:
+            self._last_sweep = now
+            self._sweep()
+
+    def _sweep(self):
+        """ Park every subscriber whose widget can't be seen. """
+        for key, (callback, widget) in list(self._subscribers.items()):
+            if widget is not None and widget.visibleRegion().isEmpty():
+                del self._subscribers[key]
+                self._park(key, callback, widget)
+        if not self._subscribers:
+            self.timer.stop()
+
+    def _park(self, key, callback, widget):
+        """ Stop ticking 'key' until its widget is painted. """
+        self._parked[key] = (callback, widget)
+        self._parked_widgets[id(widget)] = key
+        widget.installEventFilter(self)
+
+    def _unpark(self, key):
+        """ Take 'key' off the parked list, returning its entry. """
+        entry = self._parked.pop(key, None)
+        if entry is not None:
+            del self._parked_widgets[id(entry[1])]
+            entry[1].removeEventFilter(self)
+        return entry
+
+    def eventFilter(self, obj, event):
+        """ A parked widget is being painted, so it's back on screen. """
+        # pylint: disable=invalid-name
+        # Reason: Qt's naming.
+        if event.type() == QEvent.Paint:
+            key = self._parked_widgets.get(id(obj))
+            if key is not None:
+                callback, widget = self._unpark(key)
+                self.subscribe(key, callback, widget)
+        return False
+
+class Stopwatch(QWidget):
+    """ This class provides a simple stopwatch widget. """
+    def __init__(self, parent=None, scheduler=None):
+        """ Class Initalizer function. """
+        super().__init__(parent)
+        self.scheduler = scheduler or TickScheduler.instance()
+        self.start_ms = None
+        self.running = False
+
+        # Set the size and title bar.
+        self.setWindowTitle('Stopwatch')
+        self.setGeometry(300, 300, 500, 150)
+
+        # Add the Layout
+        hbox = QHBoxLayout()
+        self.setLayout(hbox)
+
+        # Create a QLabel for displaying time duration
+        self.lbl_time = QLabel("00:00:00.00")
+        self.lbl_time.setStyleSheet("QLabel{font-size: 50pt;}")
+        self.lbl_time.setAlignment(Qt.AlignCenter)
+        # A label whose size can't change doesn't ask every layout above
+        # it to recalculate on each setText(). With hundreds of
+        # stopwatches in one window that relayout is most of the cost.
+        self.lbl_time.ensurePolished()
+        self.lbl_time.setFixedSize(self.lbl_time.sizeHint())
+
+        # Create a Stop and Reset button
+        self.btn_start = QPushButton("Start")
+        btn_reset = QPushButton("Reset")
+
+        # Add styles to the Stop and Reset button
+        self.btn_start.setStyleSheet("QPushButton{font-size: 50pt;}")
+        btn_reset.setStyleSheet("QPushButton{font-size: 50pt; background-color: red}")
+
+        # Connect the buttons callbacks
+        self.btn_start.clicked.connect(self._cb_start_stop)
+        btn_reset.clicked.connect(self._cb_reset)
+
+        # Pack the widgets into the layout
+        hbox.addWidget(btn_reset)
+        hbox.addWidget(self.lbl_time, 1)
+        hbox.addWidget(self.btn_start)
+
+        # Make sure the scheduler lets go of us, even if we're deleted
+        # along with a parent without ever being hidden.
+        scheduler = self.scheduler
+        key = id(self)
+        self.destroyed.connect(lambda _obj=None: scheduler.unsubscribe(key))
+
+        # Finally show the window.
+        self.show()
+
+    def _update_subscription(self):
+        """ Only running stopwatches that can be seen get ticks. """
+        if self.running and self.isVisible():
+            self.scheduler.subscribe(id(self), self._cb_update_time, self.lbl_time)
+        else:
+            self.scheduler.unsubscribe(id(self))
+
+    def showEvent(self, event):
+        """ Start getting ticks again (if running) once shown. """
+        # pylint: disable=invalid-name
+        # Reason: Qt's naming.
+        super().showEvent(event)
+        self._update_subscription()
+        if self.running:
+            self._cb_update_time()
+
+    def hideEvent(self, event):
+        """ Hidden stopwatches don't need ticks. """
+        # pylint: disable=invalid-name
+        # Reason: Qt's naming.
+        super().hideEvent(event)
+        self._update_subscription()
+
+    def _cb_update_time(self, now=None):
+        """ A function to update the label with the current time of run. """
+        if now is None:
+            now = QDateTime.currentMSecsSinceEpoch()
+        elapsed = max(now - self.start_ms, 0) // 10
+        elapsed, centis = divmod(elapsed, 100)
+        elapsed, seconds = divmod(elapsed, 60)
+        hours, minutes = divmod(elapsed, 60)
+        self.lbl_time.setText(f"{hours % 24:02d}:{minutes:02d}:{seconds:02d}.{centis:02d}")
+
+    def _cb_start_stop(self):
+        """ Start/pause the stopwatch. """
+        if self.start_ms is None:
+            self.start_ms = QDateTime.currentMSecsSinceEpoch()
+            self.lbl_time.setText("00:00:00.00")
+            self.running = True
+            self.btn_start.setText("Pause")
+        elif not self.running:
+            self.running = True
+            self.btn_start.setText("Pause")
+        else:
+            self.btn_start.setText("Resume")
+            self.running = False
+            self._cb_update_time()
+        self._update_subscription()
+
+    def _cb_reset(self):
+        """ Reset the timer. """
+        if not self.running:
+            self.btn_start.setText("Start")
+            self.start_ms = None
+            self.lbl_time.setText("00:00:00.00")
+        else:
+            self.start_ms = QDateTime.currentMSecsSinceEpoch()
+
+def bench(app, count, seconds):
+    """
+    Run 'count' stopwatches with stopwatch_v1.py's design (a QTimer
+    each) and with the shared TickScheduler, and compare the CPU used
+    and how often the event loop wakes up.
+    """
+    # pylint: disable=import-outside-toplevel,no-name-in-module
+    # Reason: Only the benchmark needs these.
+    from PyQt5.QtCore import QAbstractEventDispatcher, QEvent
+    from PyQt5.QtWidgets import QScrollArea, QVBoxLayout
+    import stopwatch_v1
+
+    class _TimerEventCounter(QObject):
+        """ Counts every timer event the application delivers. """
+        count = 0
+
+        def eventFilter(self, obj, event):
+            """ Count timer events. """
+            # pylint: disable=invalid-name
+            # Reason: Qt's naming.
+            if event.type() == QEvent.Timer:
+                self.count += 1
+            return False
+
+    print(f" [*] {count} running stopwatches for {seconds:.0f} s each (in a scroll area)")
+    print(f"     {'design':22s} {'CPU %':>7s} {'wakeups/s':>10s} {'timer events/s':>15s} "
+          f"{'label updates/s':>16s}")
+    scheduler = TickScheduler.instance()
+    for name, factory in (("v1 (QTimer each)", stopwatch_v1.Stopwatch),
+                          ("v2 (TickScheduler)", Stopwatch)):
+        area = QScrollArea()
+        area.resize(1280, 720)
+        area.setWidgetResizable(True)
+        inner = QWidget()
+        vbox = QVBoxLayout(inner)
+        watches = []
+        for _ in range(count):
+            watch = factory()
+            vbox.addWidget(watch)
+            watches.append(watch)
+        area.setWidget(inner)
+        area.show()
+        app.processEvents()
+        for watch in watches:
+            watch.btn_start.click()
+
+        counter = _TimerEventCounter()
+        app.installEventFilter(counter)
+        wakeups = [0]
+        dispatcher = QAbstractEventDispatcher.instance()
+
+        def awake():
+            wakeups[0] += 1
+        dispatcher.awake.connect(awake)
+
+        QTimer.singleShot(500, app.quit)
+        app.exec_()
+        counter.count = 0
+        wakeups[0] = 0
+        calls = scheduler.calls
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        QTimer.singleShot(int(seconds * 1000), app.quit)
+        app.exec_()
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+
+        dispatcher.awake.disconnect(awake)
+        app.removeEventFilter(counter)
+        # Every v1 timer event is a label update.
+        updates = scheduler.calls - calls if factory is Stopwatch else counter.count
+        print(f"     {name:22s} {cpu / wall * 100:7.1f} {wakeups[0] / wall:10.0f} "
+              f"{counter.count / wall:15.0f} {updates / wall:16.0f}")
+        if factory is Stopwatch:
+            print(f"     ({scheduler.active()} of {count} on screen and ticking)")
+
+        for watch in watches:
+            watch.btn_start.click()
+        area.close()
+        area.deleteLater()
+        app.processEvents()
+    return 0
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="A stopwatch sharing one tick timer.")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="compare N running stopwatches against stopwatch_v1.py")
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="how long each design runs in --bench (default: 5)")
+    args = parser.parse_args()
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Standard QT boilerplate to launch our UI
+    app = QApplication(sys.argv)
+
+    if args.bench:
+        return bench(app, args.bench, args.seconds)
+
+    # pylint: disable=unused-variable
+    # Reason: Disable the unused-variable violations. The
+    #         'gui' variable is required to start the UI instance.
+    gui = Stopwatch()
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ Program: digit_display.py
+
+ Date: 10/18/2026
+
+ Author: Travis Phillips
+
+ Purpose: A fixed-cell display widget for big numbers like the ones in
+          the toys (dice roll, score, stopwatch time). A QLabel lays out
+          its text again from scratch on every setText(), which at 100pt
+          and 100 updates a second adds up. This widget renders each
+          glyph once into a QPixmap cache and draws numbers by blitting
+          cells, repainting only the cells that changed.
+
+          Run it directly with --bench to compare against a QLabel.
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+# pylint: disable=no-name-in-module
+# Reason: Pylint can't find these Q* namespaces in the PyQT5 module.
+#         They do exist.
+from PyQt5.QtCore import (Qt, QEvent, QRect, QSize)
+from PyQt5.QtGui import (QFont, QFontMetrics, QPainter, QPixmap)
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout,
+                             QLabel, QPushButton)
+
+class DigitDisplay(QWidget):
+    """
+    Shows a short string of digits in fixed width cells. Each glyph is
+    pre-rendered at the current size (background included) so a cell
+    update is a single pixmap blit. The glyph cache is rebuilt when the
+    font size, the widget size or the device pixel ratio changes.
+    """
+    # Characters pre-rendered up front. Anything else is rendered the
+    # first time it's used.
+    GLYPHS = "0123456789:.- "
+
+    def __init__(self, text="0", cells=None, point_size=100, parent=None):
+        """
+        Initalize the widget. 'cells' is the number of character cells
+        to reserve (defaults to the length of the initial text) and
+        'point_size' is the largest font size to use; the glyphs shrink
+        to fit if the widget is too small for them.
+        """
+        super().__init__(parent)
+        self._text = ""
+        self._cells = []
+        self._cell_count = cells or len(text)
+        self._point_size = point_size
+        self._font = QFont(self.font())
+
+        # Glyph cache and the settings it was rendered for.
+        self._glyphs = {}
+        self._cache_key = None
+        self._cell_size = QSize()
+        self._origin_x = 0
+        self._origin_y = 0
+
+        # We paint every pixel ourselves.
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setText(text)
+
+    def text(self):
+        """ Return the current text (like QLabel.text()). """
+        return self._text
+
+    def setText(self, text):   # pylint: disable=invalid-name
+        """
+        Set the text, right aligned in the cells. Only cells whose
+        character changed are scheduled for a repaint.
+        """
+        text = str(text)
+        if text == self._text:
+            return
+        self._text = text
+
+        if len(text) > self._cell_count:
+            # Need more cells, which changes the layout of all of them.
+            self._cell_count = len(text)
+            self._cells = list(text)
+            self._cache_key = None
+            self.updateGeometry()
+            self.update()
+            return
+
+        cells = list(text.rjust(self._cell_count))
+        if len(self._cells) != len(cells):
+            self._cells = cells
+            self.update()
+            return
+
+        for idx, char in enumerate(cells):
+            if self._cells[idx] != char:
+                self._cells[idx] = char
+                if self._cache_key is not None:
+                    self.update(self._cell_rect(idx))
+        if self._cache_key is None:
+            self.update()
+
+    def setPointSize(self, point_size):   # pylint: disable=invalid-name
+        """ Set the largest font size the glyphs are drawn at. """
+        self._point_size = point_size
+        self._cache_key = None
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self):
+        """ The size of all the cells at the full point size. """
+        font = QFont(self.font())
+        font.setPointSize(self._point_size)
+        cell = self._measure(font)
+        return QSize(cell.width() * self._cell_count, cell.height())
+
+    def minimumSizeHint(self):
+        """ Allow shrinking down to a quarter size. """
+        hint = self.sizeHint()
+        return QSize(hint.width() // 4, hint.height() // 4)
+
+    def changeEvent(self, event):
+        """ Drop the glyph cache if the font, palette or screen changed. """
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange,
+                            QEvent.StyleChange):
+            self._cache_key = None
+            self.update()
+        super().changeEvent(event)
+
+    def resizeEvent(self, event):
+        """ Glyphs are sized to the widget, so re-render on resize. """
+        self._cache_key = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        """ Blit the cells that intersect the dirty region. """
+        self._ensure_glyphs()
+        painter = QPainter(self)
+        dirty = event.rect()
+
+        # Anything outside the cells is plain background.
+        cells = QRect(self._origin_x, self._origin_y,
+                      self._cell_size.width() * self._cell_count,
+                      self._cell_size.height())
+        if not cells.contains(dirty):
+            painter.fillRect(dirty, self.palette().window())
+
+        for idx, char in enumerate(self._cells):
+            rect = self._cell_rect(idx)
+            if rect.intersects(dirty):
+                painter.drawPixmap(rect.topLeft(), self._glyph(char))
+        painter.end()
+
+    def _cell_rect(self, idx):
+        """ Return the rectangle of a cell in widget coordinates. """
+        return QRect(self._origin_x + idx * self._cell_size.width(),
+                     self._origin_y, self._cell_size.width(),
+                     self._cell_size.height())
+
+    @staticmethod
+    def _measure(font):
+        """ Return the size of one cell for a font. """
+        metrics = QFontMetrics(font)
+        width = max(metrics.horizontalAdvance(char) for char in DigitDisplay.GLYPHS)
+        return QSize(width, metrics.height())
+
+    def _ensure_glyphs(self):
+        """ (Re)build the glyph cache if anything it depends on changed. """
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self._point_size,
+               self._cell_count)
+        if key == self._cache_key:
+            return
+
+        # Find the biggest font size (up to the requested one) where
+        # all of the cells fit inside the widget.
+        font = QFont(self.font())
+        point_size = self._point_size
+        while True:
+            font.setPointSize(point_size)
+            cell = self._measure(font)
+            if point_size <= 4 or (cell.width() * self._cell_count <= self.width()
+                                   and cell.height() <= self.height()):
+                break
+            point_size = max(4, int(point_size * 0.9))
+
+        self._font = font
+        self._cell_size = cell
+        self._origin_x = (self.width() - cell.width() * self._cell_count) // 2
+        self._origin_y = (self.height() - cell.height()) // 2
+        self._glyphs = {}
+        self._cache_key = key
+        for char in self.GLYPHS:
+            self._glyph(char)
+
+    def _glyph(self, char):
+        """ Return the pixmap for a character, rendering it if needed. """
+        pixmap = self._glyphs.get(char)
+        if pixmap is not None:
+            return pixmap
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self._cell_size.width() * ratio),
+                         int(self._cell_size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.palette().window().color())
+        painter = QPainter(pixmap)
+        painter.setFont(self._font)
+        painter.setPen(self.palette().windowText().color())
+        painter.drawText(QRect(0, 0, self._cell_size.width(),
+                               self._cell_size.height()),
+                         Qt.AlignCenter, char)
+        painter.end()
+
+        self._glyphs[char] = pixmap
+        return pixmap
+
+def _stopwatch_text(tick):
+    """ Return stopwatch style text for a tick count (1 tick = 10 ms). """
+    secs, hundredths = divmod(tick, 100)
+    mins, secs = divmod(secs, 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}.{hundredths:02d}"
+
+def bench(app, updates):
+    """
+    Compare the cost of a stopwatch style update (setText + paint) for
+    a 50pt QLabel and a DigitDisplay of the same size.
+    """
+    label = QLabel(_stopwatch_text(0))
+    label.setStyleSheet("QLabel{font-size: 50pt;}")
+    label.setAlignment(Qt.AlignCenter)
+    display = DigitDisplay(_stopwatch_text(0), point_size=50)
+
+    results = {}
+    for name, widget in (("QLabel", label), ("DigitDisplay", display)):
+        widget.resize(600, 150)
+        widget.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        for tick in range(1, updates + 1):
+            widget.setText(_stopwatch_text(tick))
+            # Flush the paint the update just scheduled.
+            app.processEvents()
+        results[name] = (time.perf_counter() - start) / updates * 1e6
+        widget.close()
+
+    for name, usecs in results.items():
+        print(f" [*] {name:12s} {usecs:8.1f} us per update")
+    print(f" [*] Speedup: {results['QLabel'] / results['DigitDisplay']:.2f}x")
+
+def main():
+    """ Main program logic """
+    parser = argparse.ArgumentParser(description="Pre-rendered digit display.")
+    parser.add_argument("--bench", type=int, nargs="?", const=5000,
+                        metavar="UPDATES",
+                        help="benchmark against a QLabel (offscreen)")
+    args = parser.parse_args()
+
+    if args.bench:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # Make it so we can exit with Ctrl+C from terminal.
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Standard QT boilerplate to launch our UI
+    app = QApplication(sys.argv[:1])
+
+    if args.bench:
+        bench(app, args.bench)
+        return 0
+
+    # A little demo: a counter like the one in boom.py.
+    win = QWidget()
+    win.setWindowTitle('Digit Display')
+    win.setGeometry(300, 300, 300, 400)
+    vbox = QVBoxLayout()
+    win.setLayout(vbox)
+    display = DigitDisplay("0", cells=3)
+    btn_inc = QPushButton("Add one")
+    btn_inc.clicked.connect(lambda: display.setText(str(int(display.text()) + 1)))
+    vbox.addWidget(display, 1)
+    vbox.addWidget(btn_inc)
+    win.show()
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())